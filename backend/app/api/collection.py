@@ -0,0 +1,164 @@
+"""
+コレクション（回覧板・イベント・備蓄品・議事録・会計）の REST API の共通部分。
+
+一覧の取得（GET /{コレクション}）は絞り込みの条件がコレクションごとに違うので各ルーターで定義し、
+ページ分けと返すフィールドの選択は paginate() にまとめています。
+それ以外の操作は add_item_routes() で各ルーターに追加します。
+
+    GET    /{id}         1件取得（fields= で返すフィールドを選べる）
+    POST   /             1件追加（201）
+    PATCH  /{id}         指定したフィールドだけ更新
+    DELETE /{id}         1件削除（204）
+    POST   /bulk         まとめて追加（1回の書き込みで保存）
+    PATCH  /bulk         まとめて更新（[{"id": 1, ...}, ...]）
+    POST   /bulk-delete  まとめて削除（{"ids": [1, 2, ...]}）
+
+一覧はIDの順に返し、limit を指定するとその件数ずつ返します。続きがある場合は
+レスポンスヘッダー X-Next-Cursor の値を cursor に指定すると次のページを取得できます。
+入力の検証には一括取り込み（bulk_io）と同じスキーマを使います。
+"""
+
+from pathlib import Path
+
+from fastapi import APIRouter, Body, HTTPException, Query, Response
+from app.storage import bulk_io, func
+
+# 一覧で1回に返す件数の上限
+MAX_LIMIT = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CURSOR_QUERY = Query(None, description="この ID より後の項目から返す（前のページの X-Next-Cursor）")
+LIMIT_QUERY = Query(None, ge=1, le=MAX_LIMIT, description="返す件数（省略するとすべて）")
+FIELDS_QUERY = Query(None, description="返すフィールド（カンマ区切り。id は常に含む）")
+
+
+def select_fields(item: dict, fields: str | None) -> dict:
+    """fields（カンマ区切り）で指定したフィールドと id だけを残します。"""
+    if not fields:
+        return item
+    names = {name.strip() for name in fields.split(",")}
+    return {key: value for key, value in item.items() if key == "id" or key in names}
+
+
+def paginate(
+    items: list[dict],
+    response: Response,
+    cursor: int | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+) -> list[dict]:
+    """
+    項目をIDの順に並べ、cursor より後の limit 件を返します。
+    続きがある場合は X-Next-Cursor ヘッダーに次の cursor を設定します。
+    """
+    items = sorted(items, key=lambda item: item.get("id", 0))
+    if cursor is not None:
+        items = [item for item in items if item.get("id", 0) > cursor]
+    if limit is not None and len(items) > limit:
+        items = items[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(items[-1]["id"])
+    return [select_fields(item, fields) for item in items]
+
+
+def date_range(start, end, with_time: bool = False) -> tuple | None:
+    """
+    日付の範囲（両端を含む）を find_items の範囲条件にします。どちらも None なら None。
+    with_time の場合は、日時で保存しているフィールド（"2025-05-10T10:00:00" など）向けに
+    終了日の終わりまでを含めます。
+    """
+    if start is None and end is None:
+        return None
+    high = end.isoformat() if end is not None else None
+    if high is not None and with_time:
+        high += "T23:59:59.999999"
+    return (start.isoformat() if start is not None else None, high)
+
+
+def _validate(schema: str, data, partial: bool = False) -> dict:
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=422, detail="項目は JSON のオブジェクトで指定してください。")
+    try:
+        return bulk_io.validate_row(schema, data, partial=partial)
+    except bulk_io.RowError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _validate_all(schema: str, rows: list, partial: bool = False) -> list[dict]:
+    # どれか1件でも不正なら何も保存せず、すべてのエラーを行番号（0始まり）付きで返す
+    items, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            item = _validate(schema, row, partial)
+        except HTTPException as e:
+            errors.append({"index": index, "error": e.detail})
+            continue
+        if partial:
+            if not isinstance(row.get("id"), int):
+                errors.append({"index": index, "error": "id を指定してください。"})
+                continue
+            item["id"] = row["id"]
+        items.append(item)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    return items
+
+
+def get_or_404(file_path: Path, item_id: int) -> dict:
+    found = func.find_items(file_path, equals={"id": item_id})
+    if not found:
+        raise HTTPException(status_code=404, detail="指定された項目が見つかりません。")
+    return found[0]
+
+
+def add_item_routes(router: APIRouter, file_path: Path, schema: str) -> None:
+    """1件ごとの取得・追加・更新・削除と、まとめての追加・更新・削除を router に追加します。"""
+
+    # /bulk は /{item_id} より先に登録する（PATCH /bulk が /{item_id} に一致しないように）
+    @router.post("/bulk", status_code=201)
+    def create_items(rows: list = Body(...)):
+        items = _validate_all(schema, rows)
+        created = func.add_items(file_path, items)
+        return {"created": created, "ids": [item["id"] for item in items]}
+
+    @router.patch("/bulk")
+    def update_items(rows: list = Body(...)):
+        items = _validate_all(schema, rows, partial=True)
+        missing = []
+        with func.transaction(file_path):
+            for item in items:
+                item_id = item.pop("id")
+                if not func.update_item(file_path, item_id, **item):
+                    missing.append(item_id)
+        return {"updated": len(items) - len(missing), "missing": missing}
+
+    @router.post("/bulk-delete")
+    def delete_items(ids: list[int] = Body(..., embed=True)):
+        missing = []
+        with func.transaction(file_path):
+            for item_id in ids:
+                if not func.delete_item(file_path, item_id):
+                    missing.append(item_id)
+        return {"deleted": len(ids) - len(missing), "missing": missing}
+
+    @router.get("/{item_id}")
+    def get_item(item_id: int, fields: str | None = FIELDS_QUERY):
+        return select_fields(get_or_404(file_path, item_id), fields)
+
+    @router.post("", status_code=201)
+    def create_item(data: dict = Body(...)):
+        item = _validate(schema, data)
+        func.add_item(file_path, item)
+        return item
+
+    @router.patch("/{item_id}")
+    def update_item(item_id: int, data: dict = Body(...)):
+        fields = _validate(schema, data, partial=True)
+        if not func.update_item(file_path, item_id, **fields):
+            raise HTTPException(status_code=404, detail="指定された項目が見つかりません。")
+        return get_or_404(file_path, item_id)
+
+    @router.delete("/{item_id}", status_code=204)
+    def delete_item(item_id: int):
+        if not func.delete_item(file_path, item_id):
+            raise HTTPException(status_code=404, detail="指定された項目が見つかりません。")
+        return Response(status_code=204)
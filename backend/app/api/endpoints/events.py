@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Query, Response
+from app.api.collection import CURSOR_QUERY, FIELDS_QUERY, LIMIT_QUERY, add_item_routes, paginate
+from app.storage import EVENT_FILE, event_index, func
+
+router = APIRouter()
+
+
+def _parse_bound(value: str | None, name: str) -> datetime | None:
+    """
+    クエリの日付/日時を datetime に変換します。
+    FullCalendar はタイムゾーン付きで送ってくるので、保存形式に合わせて外します。
+    """
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} の形式が正しくありません。")
+
+
+# イベント一覧。start/end を指定するとその期間（start 以上 end 未満）にかかるイベントだけを返す
+@router.get("")
+def list_events(
+    response: Response,
+    start: str | None = Query(None, description="期間の開始（ISO 8601）"),
+    end: str | None = Query(None, description="期間の終了（ISO 8601, この日時は含まない）"),
+    cursor: int | None = CURSOR_QUERY,
+    limit: int | None = LIMIT_QUERY,
+    fields: str | None = FIELDS_QUERY,
+):
+    range_start = _parse_bound(start, "start")
+    range_end = _parse_bound(end, "end")
+    if range_start is None and range_end is None:
+        return paginate(func.load_data(EVENT_FILE), response, cursor, limit, fields)
+
+    index = event_index.get_index(EVENT_FILE)
+    matched = index.overlapping(
+        range_start or datetime.min,
+        (range_end - timedelta(microseconds=1)) if range_end else datetime.max,
+    )
+    return paginate([ev for ev, _, _ in matched], response, cursor, limit, fields)
+
+
+add_item_routes(router, EVENT_FILE, "event")
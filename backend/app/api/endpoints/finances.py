@@ -0,0 +1,36 @@
+from datetime import date
+from typing import Literal
+from fastapi import APIRouter, Query, Response
+from app.api.collection import (
+    CURSOR_QUERY,
+    FIELDS_QUERY,
+    LIMIT_QUERY,
+    add_item_routes,
+    date_range,
+    paginate,
+)
+from app.storage import FINANCES_FILE, func
+
+router = APIRouter()
+
+
+# 会計の一覧。種別（収入/支出）と日付の範囲で絞り込める
+@router.get("")
+def list_finances(
+    response: Response,
+    kind: Literal["収入", "支出"] | None = Query(None, description="種別"),
+    date_from: date | None = Query(None, description="この日以降"),
+    date_to: date | None = Query(None, description="この日以前"),
+    cursor: int | None = CURSOR_QUERY,
+    limit: int | None = LIMIT_QUERY,
+    fields: str | None = FIELDS_QUERY,
+):
+    equals = {"種別": kind} if kind is not None else {}
+    ranges = {}
+    if (span := date_range(date_from, date_to)) is not None:
+        ranges["日付"] = span
+    items = func.find_items(FINANCES_FILE, equals, ranges)
+    return paginate(items, response, cursor, limit, fields)
+
+
+add_item_routes(router, FINANCES_FILE, "finances")
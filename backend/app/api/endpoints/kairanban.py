@@ -0,0 +1,40 @@
+from datetime import date
+from fastapi import APIRouter, Query, Response
+from app.api.collection import (
+    CURSOR_QUERY,
+    FIELDS_QUERY,
+    LIMIT_QUERY,
+    add_item_routes,
+    date_range,
+    paginate,
+)
+from app.storage import KAIRANBAN_FILE, func
+
+router = APIRouter()
+
+
+# 回覧板の一覧。確認済みかどうか・作成者・日付の範囲で絞り込める
+@router.get("")
+def list_kairanban(
+    response: Response,
+    checked: bool | None = Query(None, description="確認済みかどうか"),
+    editor: str | None = Query(None, description="作成者"),
+    date_from: date | None = Query(None, description="この日以降"),
+    date_to: date | None = Query(None, description="この日以前"),
+    cursor: int | None = CURSOR_QUERY,
+    limit: int | None = LIMIT_QUERY,
+    fields: str | None = FIELDS_QUERY,
+):
+    equals = {}
+    if checked is not None:
+        equals["checked"] = checked
+    if editor is not None:
+        equals["editor"] = editor
+    ranges = {}
+    if (span := date_range(date_from, date_to, with_time=True)) is not None:
+        ranges["date"] = span
+    items = func.find_items(KAIRANBAN_FILE, equals, ranges)
+    return paginate(items, response, cursor, limit, fields)
+
+
+add_item_routes(router, KAIRANBAN_FILE, "kairanban")
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Query, Response
+from app.api.collection import CURSOR_QUERY, FIELDS_QUERY, LIMIT_QUERY, add_item_routes, paginate
+from app.storage import MINUTES_FILE, func
+
+router = APIRouter()
+
+
+# 議事録の一覧。q を指定するとタイトルか内容にその文字列を含むものだけを返す
+@router.get("")
+def list_minutes(
+    response: Response,
+    q: str | None = Query(None, description="タイトルか内容に含まれる文字列"),
+    cursor: int | None = CURSOR_QUERY,
+    limit: int | None = LIMIT_QUERY,
+    fields: str | None = FIELDS_QUERY,
+):
+    items = func.load_data(MINUTES_FILE)
+    if q:
+        items = [
+            item
+            for item in items
+            if q in str(item.get("タイトル", "")) or q in str(item.get("内容", ""))
+        ]
+    return paginate(items, response, cursor, limit, fields)
+
+
+add_item_routes(router, MINUTES_FILE, "minutes")
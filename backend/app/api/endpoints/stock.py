@@ -0,0 +1,35 @@
+from datetime import date
+from fastapi import APIRouter, Query, Response
+from app.api.collection import (
+    CURSOR_QUERY,
+    FIELDS_QUERY,
+    LIMIT_QUERY,
+    add_item_routes,
+    date_range,
+    paginate,
+)
+from app.storage import STOCK_FILE, func
+
+router = APIRouter()
+
+
+# 備蓄品の一覧。格納場所と消費期限の範囲で絞り込める
+@router.get("")
+def list_stock(
+    response: Response,
+    location: str | None = Query(None, description="格納場所"),
+    expires_from: date | None = Query(None, description="消費期限がこの日以降"),
+    expires_to: date | None = Query(None, description="消費期限がこの日以前"),
+    cursor: int | None = CURSOR_QUERY,
+    limit: int | None = LIMIT_QUERY,
+    fields: str | None = FIELDS_QUERY,
+):
+    equals = {"格納場所": location} if location is not None else {}
+    ranges = {}
+    if (span := date_range(expires_from, expires_to)) is not None:
+        ranges["消費期限"] = span
+    items = func.find_items(STOCK_FILE, equals, ranges)
+    return paginate(items, response, cursor, limit, fields)
+
+
+add_item_routes(router, STOCK_FILE, "stock_data")
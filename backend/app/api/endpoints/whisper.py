@@ -1,84 +1,217 @@
-import os
-import shutil
-import uuid
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from openai import OpenAI
-import whisper
-from dotenv import load_dotenv # ◀️ 1. この行を追加！
-
-# --- .env ファイルをロード ---
-load_dotenv() # ◀️ 2. この行を追加！
+import asyncio
+import json
+import time
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.services import chunked, decoder, live, model_loader, pipeline, result_cache, summarizer
+from app.services.jobs import manager, QueueFull, FINISHED
 
 router = APIRouter()
 
-# whisper load
+# イベントの配信で新しいイベントを確認する間隔（秒）
+EVENT_POLL_INTERVAL = 0.1
+# イベントが無い間も接続を保つため、この秒数ごとに ping を送る
+EVENT_KEEPALIVE_SECONDS = 15
+
+
+async def _submit(audio_file: UploadFile):
+    """アップロードを受け取って文字起こし・要約のジョブを登録します。"""
+    if not summarizer.is_configured():
+        raise HTTPException(status_code=500, detail="サーバーのAIモデルが正しく設定されていません。")
+    # 一時フォルダには保存せず、メモリ上（大きい場合のみ一時ファイル）に受け取ってそのままデコードする
+    source, digest = await run_in_threadpool(decoder.spool, audio_file.file)
+    # 同じ音声・同じ設定で処理済みなら、前回の結果を完了済みのジョブとして返す
+    key = result_cache.make_key(digest, pipeline.settings_key())
+    cached = await run_in_threadpool(result_cache.get, key)
+    if cached is not None:
+        source.close()
+        return manager.add_finished(cached)
+
+    def runner(source, on_stage, on_event):
+        return result_cache.put(key, pipeline.run(source, on_stage, on_event))
+
+    try:
+        return manager.submit(source, runner)
+    except QueueFull as e:
+        source.close()
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+def _get_job(job_id: str):
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="指定されたジョブが見つかりません。")
+    return job
+
+
+#モデルの読み込み状況。読み込みが終わるまでは 503 を返す
+@router.get("/ready")
+async def ready():
+    if chunked.TRANSCRIBE_MODE == "chunked":
+        info = chunked.status()
+    else:
+        info = model_loader.status()
+    return JSONResponse(info, status_code=200 if info["state"] == "ready" else 503)
+
+
+#音声を受け付けてジョブIDをすぐに返す。処理はバックグラウンドのワーカーで行う
+@router.post("/jobs", status_code=202)
+async def create_job(audio_file: UploadFile = File(...)):
+    job = await _submit(audio_file)
+    return job.to_dict()
+
+
+#ジョブの状態（status, stage, progress）
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    return _get_job(job_id).to_dict()
+
+
+#完了したジョブの結果（full_text, summary）
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = _get_job(job_id)
+    if job.status == "done":
+        return job.result
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=f"処理中にエラーが発生しました：{job.error}")
+    raise HTTPException(status_code=409, detail=f"ジョブはまだ完了していません（{job.status}）。")
+
+
+def _final_event(job) -> dict:
+    if job.status == "done":
+        return {"type": "done", **job.result}
+    if job.status == "failed":
+        return {"type": "failed", "error": str(job.error)}
+    return {"type": "cancelled"}
+
+
+async def _job_events(job, offset: int):
+    """ジョブのイベントを offset 番目から JSON Lines で送り、終了したら最後に結果を送ります。"""
+    last_sent = time.monotonic()
+    while True:
+        # 終了を先に確認してから読むことで、終了直前のイベントも取りこぼさない
+        finished = job.status in FINISHED
+        events, offset = job.events_since(offset)
+        for event in events:
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+        if finished:
+            yield json.dumps(_final_event(job), ensure_ascii=False) + "\n"
+            return
+        if events:
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent > EVENT_KEEPALIVE_SECONDS:
+            yield json.dumps({"type": "ping"}) + "\n"
+            last_sent = time.monotonic()
+        await asyncio.sleep(EVENT_POLL_INTERVAL)
 
-try:
-    whisper_model =whisper.load_model("medium")
-except  Exception as e: # エラー発生時にエラーの内容をe変数に格納
-    print(f"Whispermodelのロードに失敗しました。:{e}")
-    whisper_model = None
 
-try:
-    # 🔽 "OPENAI_API_KEY" という名前の環境変数を読み込む
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-except Exception as e:
-    print(f"OpenAIクライアントの初期化に失敗しました。:{e}")
-    client = None
+#ジョブの途中経過（JSON Lines）。文字起こしのセグメントと要約のトークンを届いた順に返す
+#offset を指定すると、その番号のイベントから送る（再接続用）
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, offset: int = 0):
+    job = _get_job(job_id)
+    return StreamingResponse(
+        _job_events(job, max(0, offset)),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+#ジョブのキャンセル
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    _get_job(job_id)
+    return manager.cancel(job_id).to_dict()
+
 
 #APIエンドポイントの定義
+#ジョブを登録して完了まで待つ（以前と同じく結果をそのまま返す）
 @router.post("/process-audio/")
 async def process_audio_and_summarize(audio_file: UploadFile = File(...)):
-    if not whisper_model or not client:
+    job = await _submit(audio_file)
+    # 処理はワーカースレッドで行うので、待っている間もイベントループは止まらない
+    try:
+        await asyncio.wrap_future(job.future)
+    except asyncio.CancelledError:
+        # 待機中に DELETE /jobs/{id} でキャンセルされた場合だけ握りつぶす
+        if not job.future.cancelled():
+            raise
+
+    if job.status == "done":
+        return job.result
+    if job.status == "cancelled":
+        raise HTTPException(status_code=409, detail="処理はキャンセルされました。")
+    if isinstance(job.error, (pipeline.EmptyTranscriptError, decoder.AudioDecodeError)):
+        raise HTTPException(status_code=400, detail=str(job.error))
+    if isinstance(job.error, model_loader.ModelNotReady):
+        raise HTTPException(status_code=503, detail=str(job.error))
+    raise HTTPException(status_code=500, detail=f"処理中にエラーが発生しました：{job.error}")
+
+
+# --- ライブモード（録音しながら文字起こし） ---
+def _get_live(session_id: str):
+    session = live.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="指定された録音セッションが見つかりません。")
+    return session
+
+
+#録音セッションを作る
+@router.post("/live", status_code=201)
+async def create_live_session():
+    if not summarizer.is_configured():
         raise HTTPException(status_code=500, detail="サーバーのAIモデルが正しく設定されていません。")
-    
-    # temp_audiotという名前のフォルダを作成し、そこにユニークIDを使用したファイル名で保存
-    temp_dir = "./temp_audio"
-    os.makedirs(temp_dir, exist_ok=True)
-    file_path = os.path.join(temp_dir,f"{uuid.uuid4()}.m4a")
-    
     try:
-        # file_path で指定されたファイルを書き込み用に開いて、そのファイルをプログラムの中では buffer という名前で扱う。audio_fileの中身をbufferに書き込み
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file,buffer)
-        
-        #音声ファイルを文字列に変換。verboseは途中経過の出力、fp16は計算方法の設定
-        result = whisper_model.transcribe(file_path,verbose=True,fp16=False,language="ja")
-        #辞書型で出力された結果を格納
-        original_text = result["text"]
-    
-        if not original_text:
-            raise HTTPException(status_code=400,detail="音声からテキストを抽出出来ませんでした。")
-        
-        correction_response = client.chat.completions.create(
-            model="gpt-4o",  # ★★★ ここにカンマを追加したよ！ ★★★
-            messages=[
-                {"role": "system", "content": "あなたは文章の専門家です。"},
-                {"role": "user", "content": f"以下の文章で日本語としておかしい部分を修正し、自然で読みやすい文章にしてください。:\n\n{original_text}"}
-            ],
-            temperature=0.2,
-        )
-        #correction_response内のchoicesの0番目を指定。message内にはrole（役割）とcontent(本文)が格納されてる。そのcontentを取り出して変数に格納。
-        corrected_text = correction_response.choices[0].message.content
-        
-        summary_response = client.chat.completions.create(
-            model = "gpt-4o",
-            messages=[
-                {"role":"system","content": "あなたは文章要約の専門家です。"},
-                {"role": "user", "content": f"以下の文章を日本語で簡潔に箇条書きで要約してください:\n\n{corrected_text}"}
-            ],
-            temperature=0.0,
+        session = live.create()
+    except live.TooManySessions as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return session.to_dict()
+
+
+#録音中の音声を追加する。本文は 16kHz モノラルの 16bit PCM（リトルエンディアン）
+@router.post("/live/{session_id}/chunks")
+async def add_live_chunk(session_id: str, request: Request, seq: int):
+    session = _get_live(session_id)
+    pcm = await request.body()
+    if len(pcm) > live.MAX_CHUNK_BYTES:
+        raise HTTPException(status_code=413, detail="一度に送れる音声は60秒までです。")
+    if len(pcm) % 2:
+        raise HTTPException(status_code=400, detail="16bit PCM の長さではありません。")
+    try:
+        accepted = await run_in_threadpool(session.add_chunk, seq, pcm)
+    except live.LiveSessionClosed as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"accepted": accepted, "last_seq": session.last_seq}
+
+
+#ここまでの文字起こし。offset 番目以降のセグメントを返す
+@router.get("/live/{session_id}")
+async def get_live_session(session_id: str, offset: int = 0):
+    return _get_live(session_id).to_dict(max(0, offset))
+
+
+#録音を終了して要約のジョブを登録する（進捗は /jobs/{id}/events で受け取る）
+#再送された場合は、最初に登録したジョブを返す
+@router.post("/live/{session_id}/finish", status_code=202)
+async def finish_live_session(session_id: str):
+    session = _get_live(session_id)
+    try:
+        job = session.finish_and_submit(
+            lambda: manager.submit(
+                None,
+                lambda _, on_stage, on_event: live.run_summary(session, on_stage, on_event),
+            )
         )
-        summary_text = summary_response.choices[0].message.content
-        
-        return{
-            "full_text":corrected_text,
-            "summary": summary_text
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"処理中にエラーが発生しました：{str(e)}")
-    
-    finally:
-        if os.path.exists(file_path):
-            os.remove(file_path)
\ No newline at end of file
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_dict()
+
+
+#録音セッションを破棄する
+@router.delete("/live/{session_id}")
+async def discard_live_session(session_id: str):
+    _get_live(session_id)
+    live.discard(session_id)
+    return {"session_id": session_id, "discarded": True}
@@ -1,14 +1,45 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.api.endpoints import whisper
+from app.api.endpoints import events, finances, kairanban, minutes, stock, whisper
+from app.middleware import HTTPCacheMiddleware
+from app.services import chunked, live, model_loader
+from app.services.jobs import manager as job_manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Whisperモデルの読み込みをバックグラウンドで開始（起動はすぐに完了する）
+    if model_loader.WHISPER_PRELOAD:
+        if chunked.TRANSCRIBE_MODE == "chunked":
+            chunked.start_warm_up()
+        else:
+            model_loader.start_loading()
+    yield
+    # 終了時は処理待ちのジョブを取り消す
+    job_manager.shutdown()
+    live.shutdown()
+    chunked.shutdown()
+
 
 app = FastAPI(
-    title="町内会API", description="Streamlitと連携するバックエンドAPI", version="0.1.0"
+    title="町内会API",
+    description="Streamlitと連携するバックエンドAPI",
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
+# データの API の条件付き GET（ETag / 304）と、大きな JSON の圧縮
+app.add_middleware(HTTPCacheMiddleware)
+
 # APIルーター登録
 # app.include_router(residents.router, prefix="/residents", tags=["Residents"])
 #機能ごとに分けたファイルをアプリ本体に登録
 app.include_router(whisper.router, prefix="/whisper", tags=["Whisper"])
+app.include_router(events.router, prefix="/events", tags=["Events"])
+app.include_router(kairanban.router, prefix="/kairanban", tags=["Kairanban"])
+app.include_router(stock.router, prefix="/stock", tags=["Stock"])
+app.include_router(minutes.router, prefix="/minutes", tags=["Minutes"])
+app.include_router(finances.router, prefix="/finances", tags=["Finances"])
 
 
 #トップページにアクセスした際にメッセージを表示する。
@@ -0,0 +1,139 @@
+"""
+データの API（/kairanban, /events など）の条件付き GET と、JSON の圧縮。
+
+Streamlit のページは表示のたびに同じ一覧を取得し直しますが、データはほとんど変わりません。
+そこで、コレクションのバージョン（func.data_version）と URL から強い ETag を作り、
+If-None-Match が一致すれば処理を実行せずに 304 を返します（本文を作らず、送りもしません）。
+ETag はコレクションが変わったときだけ変わるので、クライアントは前回の本文を使い続けられます。
+
+また、MIN_COMPRESS_BYTES 以上の JSON は Accept-Encoding に応じて brotli（brotli が
+インストールされている場合）または gzip で圧縮します。圧縮した場合は ETag に "-br" / "-gzip" を付けます
+（強い ETag は本文のバイト列ごとに別の値にするため）。
+文字起こしの途中経過（JSON Lines のストリーム）などの JSON 以外は、そのまま通します。
+"""
+
+import gzip
+import hashlib
+
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.storage import (
+    EVENT_FILE,
+    FINANCES_FILE,
+    KAIRANBAN_FILE,
+    MINUTES_FILE,
+    STOCK_FILE,
+    func,
+)
+
+try:
+    import brotli
+except ImportError:  # brotli が無ければ gzip だけを使う
+    brotli = None
+
+# パスの先頭 -> コレクションのファイル
+COLLECTIONS = {
+    "/kairanban": KAIRANBAN_FILE,
+    "/events": EVENT_FILE,
+    "/stock": STOCK_FILE,
+    "/minutes": MINUTES_FILE,
+    "/finances": FINANCES_FILE,
+}
+# キャッシュしてよいが、使う前に必ず ETag で確認させる
+CACHE_CONTROL = "no-cache"
+# これより小さい本文は圧縮しない（圧縮しても小さくならず、時間だけかかるため）
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# 圧縮した本文の ETag に付ける印
+ENCODING_SUFFIXES = {"br": "-br", "gzip": "-gzip"}
+
+
+def _collection_file(path: str):
+    for prefix, file_path in COLLECTIONS.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return file_path
+    return None
+
+
+def make_etag(request: Request, file_path) -> str:
+    """コレクションのバージョンと URL（クエリを含む）から強い ETag を作ります。"""
+    key = f"{func.data_version(file_path)!r}|{request.url.path}?{request.url.query}"
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def _matched_tag(if_none_match: str | None, etag: str) -> str | None:
+    """If-None-Match のうち etag に一致するもの（圧縮の印が付いたものを含む）を返します。"""
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        base = tag
+        for suffix in ENCODING_SUFFIXES.values():
+            if base.endswith(suffix + '"'):
+                base = base[: -len(suffix) - 1] + '"'
+        if base == etag:
+            return tag
+    return None
+
+
+def _choose_encoding(accept_encoding: str) -> str | None:
+    accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class HTTPCacheMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        file_path = None
+        if request.method in ("GET", "HEAD"):
+            file_path = _collection_file(request.url.path)
+        etag = make_etag(request, file_path) if file_path is not None else None
+        matched = _matched_tag(request.headers.get("if-none-match"), etag) if etag else None
+        if matched is not None:
+            return Response(
+                status_code=304,
+                headers={
+                    "ETag": matched,
+                    "Cache-Control": CACHE_CONTROL,
+                    "Vary": "Accept-Encoding",
+                },
+            )
+
+        response = await call_next(request)
+        content_type = response.headers.get("content-type", "")
+        if not content_type.startswith("application/json"):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        # 同じ名前のヘッダー（Set-Cookie など）が複数あってもすべて残すよう、raw のまま書き換える
+        headers = MutableHeaders(raw=list(response.headers.raw))
+        if etag is not None and response.status_code == 200:
+            headers["etag"] = etag
+            headers["cache-control"] = CACHE_CONTROL
+        if len(body) >= MIN_COMPRESS_BYTES and "content-encoding" not in headers:
+            headers.add_vary_header("Accept-Encoding")
+            encoding = _choose_encoding(request.headers.get("accept-encoding", ""))
+            if encoding is not None:
+                body = _compress(body, encoding)
+                headers["content-encoding"] = encoding
+                if "etag" in headers:
+                    headers["etag"] = etag[:-1] + ENCODING_SUFFIXES[encoding] + '"'
+        headers["content-length"] = str(len(body))
+        compressed = Response(content=body, status_code=response.status_code)
+        compressed.raw_headers = headers.raw
+        return compressed
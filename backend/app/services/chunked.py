@@ -0,0 +1,232 @@
+"""
+長い録音の並列文字起こし。
+
+音声を無音の位置で区切り、プロセスプールで区間ごとに並列に文字起こしして、
+区間の開始時刻を足したタイムスタンプで元の順番につなぎ直します。
+各ワーカープロセスは起動時に1回だけモデルを読み込みます。
+
+環境変数:
+    WHISPER_TRANSCRIBE_MODE : chunked にすると文字起こしをこのモジュールで行う（既定は single）
+    WHISPER_CHUNK_WORKERS   : ワーカープロセス数（既定は使用可能なCPUコア数）
+    WHISPER_CHUNK_SECONDS   : 1区間の最大の長さ（秒, 既定は 300）
+
+注意: ワーカーごとにモデルを読み込むため、メモリはおおよそ「モデルサイズ × ワーカー数」必要です。
+"""
+
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from app.services import decoder, engines, model_loader
+
+TRANSCRIBE_MODE = os.getenv("WHISPER_TRANSCRIBE_MODE", "single")
+
+SAMPLE_RATE = decoder.SAMPLE_RATE
+FRAME_SECONDS = 0.02  # 無音検出のフレーム長
+SMOOTH_SECONDS = 0.3  # 単語の間ではなく息継ぎ程度の無音を探すための平滑化幅
+MIN_CHUNK_SECONDS = 30
+MAX_CHUNK_SECONDS = float(os.getenv("WHISPER_CHUNK_SECONDS", 300))
+SEARCH_SECONDS = 10  # 区切りの目標位置から前後この秒数の中で一番静かな所を探す
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Windows / macOS
+        return os.cpu_count() or 1
+
+
+CHUNK_WORKERS = int(os.getenv("WHISPER_CHUNK_WORKERS", 0)) or available_cores()
+
+
+def load_audio(file_path: str) -> np.ndarray:
+    """音声ファイルを 16kHz モノラルの float32 配列として読み込みます。"""
+    return decoder.decode(file_path)
+
+
+def find_split_points(audio: np.ndarray, chunk_seconds: float) -> list[int]:
+    """
+    おおよそ chunk_seconds ごとに、その付近で最も静かな位置（サンプル番号）を返します。
+    """
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    n_frames = len(audio) // frame
+    step = int(chunk_seconds / FRAME_SECONDS)
+    search = int(SEARCH_SECONDS / FRAME_SECONDS)
+    if n_frames <= step + search:
+        return []
+
+    # フレームごとの音量（RMS）を平滑化したもの
+    frames = audio[: n_frames * frame].reshape(n_frames, frame)
+    energy = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    width = max(1, int(SMOOTH_SECONDS / FRAME_SECONDS))
+    smooth = np.convolve(energy, np.ones(width) / width, mode="same")
+
+    points = []
+    pos = 0
+    while pos + step + search < n_frames:
+        lo = pos + step - search
+        hi = pos + step + search
+        cut = lo + int(np.argmin(smooth[lo:hi]))
+        points.append(cut * frame)
+        pos = cut
+    return points
+
+
+def split_at_silence(audio: np.ndarray, chunk_seconds: float) -> list[tuple[float, np.ndarray]]:
+    """音声をおおよそ chunk_seconds ごとに無音の位置で区切り、(開始秒, 区間の配列) のリストを返します。"""
+    bounds = [0, *find_split_points(audio, chunk_seconds), len(audio)]
+    return [
+        (start / SAMPLE_RATE, audio[start:end])
+        for start, end in zip(bounds, bounds[1:])
+        if end > start
+    ]
+
+
+def split_audio(audio: np.ndarray, workers: int) -> list[tuple[float, np.ndarray]]:
+    """
+    並列処理用に音声を区切ります。
+    区間の長さは、全ワーカーに仕事が行き渡るように録音の長さとワーカー数から決めます。
+    """
+    duration = len(audio) / SAMPLE_RATE
+    chunk_seconds = min(MAX_CHUNK_SECONDS, max(MIN_CHUNK_SECONDS, duration / workers))
+    return split_at_silence(audio, chunk_seconds)
+
+
+# --- ワーカープロセス側 ---
+_worker_engine: engines.Engine | None = None
+
+
+def _init_worker(engine_name: str, model_name: str, device: str | None, threads: int) -> None:
+    global _worker_engine
+    # ワーカー同士でコアを取り合わないよう、1プロセスあたりのスレッド数を制限する
+    _worker_engine = engines.load_engine(engine_name, model_name, device, threads)
+
+
+def _transcribe_chunk(offset: float, chunk: np.ndarray) -> dict:
+    return engines.shift_segments(_worker_engine.transcribe(chunk), offset)
+
+
+def _ping() -> bool:
+    return _worker_engine is not None
+
+
+# --- 呼び出し側 ---
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """ワーカープロセスのプールを返します（初回に作成し、以後は使い回します）。"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            threads = max(1, available_cores() // CHUNK_WORKERS)
+            # torch を読み込んだプロセスを fork すると固まることがあるので spawn を使う
+            _pool = ProcessPoolExecutor(
+                max_workers=CHUNK_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    engines.WHISPER_ENGINE,
+                    model_loader.WHISPER_MODEL_NAME,
+                    model_loader.WHISPER_DEVICE,
+                    threads,
+                ),
+            )
+        return _pool
+
+
+_warm_up_state = {"state": "not_started"}
+
+
+def _warm_up() -> None:
+    try:
+        pool = get_pool()
+        for future in [pool.submit(_ping) for _ in range(CHUNK_WORKERS)]:
+            future.result()
+        _warm_up_state["state"] = "ready"
+    except Exception as e:
+        print(f"Whisperワーカーの起動に失敗しました。:{e}")
+        _warm_up_state.update(state="failed", error=str(e))
+
+
+def start_warm_up() -> None:
+    """バックグラウンドでワーカープロセスを起動し、モデルを読み込ませます。"""
+    if _warm_up_state["state"] != "not_started":
+        return
+    _warm_up_state["state"] = "loading"
+    threading.Thread(target=_warm_up, name="whisper-warm-up", daemon=True).start()
+
+
+def status() -> dict:
+    """ワーカーの起動状況を返します（/whisper/ready で使用）。"""
+    return {
+        **_warm_up_state,
+        "mode": "chunked",
+        "workers": CHUNK_WORKERS,
+        "engine": engines.WHISPER_ENGINE,
+        "model": model_loader.WHISPER_MODEL_NAME,
+        "device": model_loader.WHISPER_DEVICE or "auto",
+    }
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def submit_chunk(offset: float, chunk: np.ndarray) -> Future:
+    """1区間の文字起こしをワーカーに依頼します。結果は transcribe_audio の戻り値と同じ形です。"""
+    return get_pool().submit(_transcribe_chunk, offset, chunk)
+
+
+def transcribe_audio(
+    audio: np.ndarray,
+    checkpoint: Callable[[], None] = lambda: None,
+    on_segment: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    音声配列を区間に分けて並列に文字起こしし、元の順番につなげて返します。
+    戻り値は whisper の transcribe と同じく "text" と "segments" を持つ辞書です。
+    checkpoint は区間が1つ終わるごとに呼ばれ、例外を投げると残りを取り消して中断します。
+    on_segment を渡すと、先頭から順に揃った区間のセグメントを1つずつ渡します。
+    """
+    chunks = split_audio(audio, CHUNK_WORKERS)
+    pool = get_pool()
+    futures = {
+        pool.submit(_transcribe_chunk, offset, chunk): i
+        for i, (offset, chunk) in enumerate(chunks)
+    }
+    results: list[dict | None] = [None] * len(chunks)
+    emitted = 0  # on_segment に渡し終えた区間の数
+    try:
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            while on_segment and emitted < len(results) and results[emitted] is not None:
+                for seg in results[emitted]["segments"]:
+                    on_segment(seg)
+                emitted += 1
+            checkpoint()
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+    return {
+        "text": "".join(r["text"] for r in results),
+        "segments": [seg for r in results for seg in r["segments"]],
+    }
+
+
+def transcribe_file(
+    file_path: str, checkpoint: Callable[[], None] = lambda: None
+) -> dict:
+    """音声ファイルを読み込んで transcribe_audio で文字起こしします。"""
+    return transcribe_audio(load_audio(file_path), checkpoint)
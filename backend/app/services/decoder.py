@@ -0,0 +1,72 @@
+"""
+アップロードされた音声のデコード。
+
+アップロードを一時フォルダに保存して ffmpeg で読み直す代わりに、
+PyAV で受け取ったデータから直接 16kHz モノラルの float32 配列を作ります。
+アップロードはメモリ上に受け取り、一定の大きさを超えた分だけ一時ファイルに書き出します。
+コンテナの形式は中身から判別するので、拡張子（m4a / mp3 / wav / mp4 など）には依存しません。
+
+環境変数:
+    WHISPER_SPOOL_MAX_BYTES : メモリ上に保持するアップロードの上限（バイト, 既定は 32MB）
+"""
+
+import hashlib
+import os
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO
+
+import av
+import numpy as np
+
+SAMPLE_RATE = 16000  # Whisper の入力は 16kHz モノラル
+SPOOL_MAX_BYTES = int(os.getenv("WHISPER_SPOOL_MAX_BYTES", 32 * 1024 * 1024))
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class AudioDecodeError(Exception):
+    """音声として読み込めないデータだった。"""
+
+
+def spool(src: BinaryIO) -> tuple[SpooledTemporaryFile, str]:
+    """
+    アップロードの中身を受け取り、(先頭に戻したファイル, 中身の SHA-256) を返します。
+    SPOOL_MAX_BYTES まではメモリ上に置き、超えた場合は一時ファイルに書き出します。
+    ハッシュは受け取りながら計算するので、データを読み直すことはありません。
+    """
+    buffer = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    digest = hashlib.sha256()
+    try:
+        while chunk := src.read(COPY_BUFFER_SIZE):
+            digest.update(chunk)
+            buffer.write(chunk)
+        buffer.seek(0)
+    except BaseException:
+        buffer.close()
+        raise
+    return buffer, digest.hexdigest()
+
+
+def decode(source: BinaryIO | str) -> np.ndarray:
+    """
+    音声（ファイルオブジェクトまたはパス）を 16kHz モノラルの float32 配列に変換します。
+    音声トラックが無い、または壊れている場合は AudioDecodeError。
+    """
+    pieces = []
+    try:
+        with av.open(source, mode="r") as container:
+            if not container.streams.audio:
+                raise AudioDecodeError("音声トラックが見つかりません。")
+            stream = container.streams.audio[0]
+            resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+            for frame in container.decode(stream):
+                for resampled in resampler.resample(frame):
+                    pieces.append(resampled.to_ndarray().reshape(-1))
+            # リサンプラーに残っている分を取り出す
+            for resampled in resampler.resample(None):
+                pieces.append(resampled.to_ndarray().reshape(-1))
+    except av.FFmpegError as e:
+        raise AudioDecodeError(f"音声ファイルを読み込めませんでした。:{e}") from e
+
+    if not pieces:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(pieces)
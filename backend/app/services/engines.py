@@ -0,0 +1,165 @@
+"""
+文字起こしエンジン。
+
+どのエンジンも 16kHz モノラルの float32 配列を受け取り、
+{"text": 全文, "segments": [{"start", "end", "text"}, ...]} を返します。
+使うエンジンは環境変数 WHISPER_ENGINE で選びます。
+
+    openai-whisper : これまでの openai-whisper（PyTorch, CPU では fp32）
+    faster-whisper : CTranslate2 版の Whisper。CPU では int8 に量子化して動かすため、
+                     GPU の無いサーバーでも数倍速く、メモリも少なくて済みます
+                     （pip install "region-project[faster]" で追加）
+
+環境変数:
+    WHISPER_ENGINE       : エンジン名（既定は openai-whisper）
+    WHISPER_COMPUTE_TYPE : faster-whisper の計算精度（int8 / int8_float32 / float32 など。既定は int8）
+    WHISPER_BEAM_SIZE    : ビームサーチの幅（既定は 1 = 貪欲法。どのエンジンにも同じ値を使う）
+"""
+
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+import numpy as np
+
+WHISPER_ENGINE = os.getenv("WHISPER_ENGINE", "openai-whisper")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", 1))
+LANGUAGE = "ja"
+
+
+class Engine(ABC):
+    """文字起こしエンジンの共通の形。"""
+
+    name = ""
+
+    @abstractmethod
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        prompt: str | None = None,
+        on_segment: Callable[[dict], None] | None = None,
+    ) -> dict:
+        """
+        音声を文字起こしします。prompt には直前の文字起こしなどの手がかりを渡せます。
+        on_segment を渡すと、セグメント（start, end, text）を先頭から順に渡します。
+        戻り値は {"text", "segments": [{"start", "end", "text"}]} です。
+        """
+
+
+class OpenAIWhisperEngine(Engine):
+    name = "openai-whisper"
+
+    def __init__(
+        self,
+        model_name: str,
+        device: str | None = None,
+        threads: int = 0,
+        beam_size: int = WHISPER_BEAM_SIZE,
+    ):
+        # whisper（と torch）の import 自体が重いので、ここで初めて読み込む
+        import torch
+        import whisper
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = whisper.load_model(model_name, device=device)
+        self.beam_size = beam_size
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        prompt: str | None = None,
+        on_segment: Callable[[dict], None] | None = None,
+    ) -> dict:
+        #fp16は計算方法の設定（CPU では fp16 を使えない）
+        # beam_size=None が openai-whisper の貪欲法
+        result = self.model.transcribe(
+            audio,
+            verbose=False,
+            fp16=False,
+            language=LANGUAGE,
+            initial_prompt=prompt,
+            beam_size=self.beam_size if self.beam_size > 1 else None,
+        )
+        segments = [
+            {"start": round(seg["start"], 2), "end": round(seg["end"], 2), "text": seg["text"]}
+            for seg in result["segments"]
+        ]
+        # openai-whisper は途中でセグメントを受け取れないので、終わってからまとめて渡す
+        if on_segment is not None:
+            for seg in segments:
+                on_segment(seg)
+        return {"text": result["text"], "segments": segments}
+
+
+class FasterWhisperEngine(Engine):
+    name = "faster-whisper"
+
+    def __init__(
+        self,
+        model_name: str,
+        device: str | None = None,
+        threads: int = 0,
+        beam_size: int = WHISPER_BEAM_SIZE,
+        compute_type: str = WHISPER_COMPUTE_TYPE,
+    ):
+        from faster_whisper import WhisperModel
+
+        self.model = WhisperModel(
+            model_name,
+            device=device or "auto",
+            compute_type=compute_type,
+            cpu_threads=threads,
+        )
+        self.beam_size = beam_size
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        prompt: str | None = None,
+        on_segment: Callable[[dict], None] | None = None,
+    ) -> dict:
+        # generated はジェネレーターで、読み進めるにつれて文字起こしが進む
+        generated, _ = self.model.transcribe(
+            audio, language=LANGUAGE, initial_prompt=prompt, beam_size=self.beam_size
+        )
+        segments = []
+        for seg in generated:
+            segments.append(
+                {"start": round(seg.start, 2), "end": round(seg.end, 2), "text": seg.text}
+            )
+            if on_segment is not None:
+                on_segment(segments[-1])
+        return {"text": "".join(seg["text"] for seg in segments), "segments": segments}
+
+
+ENGINES = {
+    OpenAIWhisperEngine.name: OpenAIWhisperEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+}
+
+
+def load_engine(
+    name: str | None,
+    model_name: str,
+    device: str | None = None,
+    threads: int = 0,
+    beam_size: int = WHISPER_BEAM_SIZE,
+) -> Engine:
+    """名前で指定したエンジンを作り、モデルを読み込みます。"""
+    name = name or WHISPER_ENGINE
+    if name not in ENGINES:
+        raise ValueError(f"不明な文字起こしエンジンです: {name}（{' / '.join(ENGINES)}）")
+    return ENGINES[name](model_name, device, threads, beam_size)
+
+
+def shift_segments(result: dict, offset: float) -> dict:
+    """区切った音声の文字起こし結果のタイムスタンプに、区間の開始秒 offset を足します。"""
+    if not offset:
+        return result
+    segments = [
+        {**seg, "start": round(offset + seg["start"], 2), "end": round(offset + seg["end"], 2)}
+        for seg in result["segments"]
+    ]
+    return {"text": result["text"], "segments": segments}
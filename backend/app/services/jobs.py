@@ -0,0 +1,243 @@
+"""
+文字起こし・要約のジョブ管理。
+
+音声の処理には数分かかるため、リクエストではジョブを登録してIDをすぐに返し、
+上限付きのワーカースレッドで順番に処理します。
+クライアントはジョブIDで進捗を確認し、完了後に結果を取得します。
+処理中の途中経過（文字起こしのセグメントや要約のトークン）はジョブのイベントとして記録し、
+GET /whisper/jobs/{id}/events で順に受け取れます。
+要約のトークンは少しずつまとめてから記録し、ジョブが終わったら途中経過は捨てて結果だけを残します。
+
+環境変数:
+    WHISPER_MAX_WORKERS : 同時に処理するジョブ数（既定は 1）
+    WHISPER_MAX_PENDING : 受け付ける未完了ジョブの上限（既定は 8）
+    WHISPER_JOB_TTL     : 完了したジョブを保持する秒数（既定は 3600）
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO
+
+WHISPER_MAX_WORKERS = int(os.getenv("WHISPER_MAX_WORKERS", 1))
+WHISPER_MAX_PENDING = int(os.getenv("WHISPER_MAX_PENDING", 8))
+JOB_TTL_SECONDS = int(os.getenv("WHISPER_JOB_TTL", 3600))
+
+# 段階ごとのおおよその進捗（0.0～1.0）
+STAGE_PROGRESS = {
+    "queued": 0.0,
+    "decoding": 0.05,
+    "transcribing": 0.1,
+    "correcting": 0.6,
+    "summarizing": 0.8,
+    "done": 1.0,
+}
+
+FINISHED = ("done", "failed", "cancelled")
+
+# 要約のトークンは、この文字数かこの秒数までまとめて1つのイベントにする
+SUMMARY_MERGE_CHARS = 200
+SUMMARY_MERGE_SECONDS = 0.25
+# 1つのジョブで記録するイベントの上限（超えた分の要約の途中経過は記録しない。結果には全文が入る）
+MAX_JOB_EVENTS = 2000
+
+
+class JobCancelled(Exception):
+    """ジョブがキャンセルされた。"""
+
+
+class QueueFull(Exception):
+    """未完了のジョブが上限に達している。"""
+
+
+class Job:
+    def __init__(self, source: BinaryIO | None):
+        self.id = uuid.uuid4().hex
+        self.source: BinaryIO | None = source  # アップロードされた音声（処理が終わると閉じる）
+        self.status = "queued"  # queued / running / done / failed / cancelled
+        self.stage = "queued"
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.result: dict | None = None
+        self.error: Exception | None = None
+        self.cancel_requested = threading.Event()
+        self.future: Future | None = None
+        # 途中経過のイベント（追記のみ。読み手は読み終えた位置を覚えておく）
+        self.events: list[dict] = []
+        # 捨てたイベントの数（読み手の位置は捨てる前からの通し番号）
+        self.events_dropped = 0
+        self._events_lock = threading.Lock()
+        # まだ記録していない要約のトークン
+        self._summary: list[str] = []
+        self._summary_chars = 0
+        self._summary_since = 0.0
+
+    def set_stage(self, stage: str) -> None:
+        """処理の段階を進めます。キャンセルが要求されていれば JobCancelled。"""
+        if self.cancel_requested.is_set():
+            raise JobCancelled()
+        if stage != self.stage:
+            self.emit(
+                {"type": "stage", "stage": stage, "progress": STAGE_PROGRESS.get(stage, 0.0)}
+            )
+        self.stage = stage
+        self.updated_at = time.time()
+
+    def emit(self, event: dict) -> None:
+        """途中経過のイベントを記録します。"""
+        with self._events_lock:
+            if event.get("type") != "summary":
+                self._flush_summary()
+                self.events.append(event)
+                return
+            if not self._summary:
+                self._summary_since = time.monotonic()
+            self._summary.append(event["delta"])
+            self._summary_chars += len(event["delta"])
+            if (
+                self._summary_chars >= SUMMARY_MERGE_CHARS
+                or time.monotonic() - self._summary_since >= SUMMARY_MERGE_SECONDS
+            ):
+                self._flush_summary()
+
+    def _flush_summary(self) -> None:
+        if self._summary and len(self.events) < MAX_JOB_EVENTS:
+            self.events.append({"type": "summary", "delta": "".join(self._summary)})
+        self._summary = []
+        self._summary_chars = 0
+
+    def flush_events(self) -> None:
+        """まとめている途中の要約のトークンを記録します。"""
+        with self._events_lock:
+            self._flush_summary()
+
+    def drop_events(self) -> None:
+        """途中経過を捨てます（終了後は結果だけを返すため）。"""
+        with self._events_lock:
+            self._summary = []
+            self._summary_chars = 0
+            self.events_dropped += len(self.events)
+            self.events = []
+
+    def events_since(self, offset: int) -> tuple[list[dict], int]:
+        """offset 番目以降のイベントと、次に読む位置を返します（捨てたイベントは返しません）。"""
+        with self._events_lock:
+            start = max(offset - self.events_dropped, 0)
+            return self.events[start:], self.events_dropped + len(self.events)
+
+    def to_dict(self) -> dict:
+        info = {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": STAGE_PROGRESS.get(self.stage, 0.0),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+        if self.error is not None:
+            info["error"] = str(self.error)
+        return info
+
+
+class JobManager:
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="whisper-job"
+        )
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        source: BinaryIO,
+        runner: Callable[[BinaryIO, Callable[[str], None], Callable[[dict], None]], dict],
+    ) -> Job:
+        """
+        ジョブを登録します。runner(source, on_stage, on_event) がワーカースレッドで実行されます。
+        source はジョブの終了時に閉じます。
+        未完了のジョブが上限に達している場合は QueueFull（source は閉じません）。
+        """
+        with self._lock:
+            self._prune()
+            pending = sum(1 for job in self._jobs.values() if job.status not in FINISHED)
+            if pending >= self.max_pending:
+                raise QueueFull("処理待ちのジョブが多すぎます。しばらくしてから再度お試しください。")
+            job = Job(source)
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job, runner)
+        return job
+
+    def add_finished(self, result: dict) -> Job:
+        """処理済みの結果（キャッシュなど）を、完了したジョブとして登録します。"""
+        job = Job(None)
+        job.status = job.stage = "done"
+        job.result = result
+        job.future = Future()
+        job.future.set_result(None)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        return job
+
+    def _run(self, job: Job, runner) -> None:
+        try:
+            if job.cancel_requested.is_set():
+                raise JobCancelled()
+            job.status = "running"
+            job.updated_at = time.time()
+            job.result = runner(job.source, job.set_stage, job.emit)
+            job.flush_events()
+            job.stage = "done"
+            job.status = "done"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = e
+            job.status = "failed"
+        finally:
+            job.updated_at = time.time()
+            job.drop_events()
+            _release(job)
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        """
+        ジョブをキャンセルします。待機中ならすぐに取り消し、
+        実行中なら次の段階に進む前に中断します。
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        job.cancel_requested.set()
+        if job.future is not None and job.future.cancel():
+            job.status = "cancelled"
+            job.updated_at = time.time()
+            job.drop_events()
+            _release(job)
+        return job
+
+    def _prune(self) -> None:
+        # 完了してから一定時間たったジョブを削除する
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.status in FINISHED and now - job.updated_at > JOB_TTL_SECONDS:
+                del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _release(job: Job) -> None:
+    # アップロードの一時領域（メモリまたは一時ファイル）を解放する
+    if job.source is not None:
+        job.source.close()
+        job.source = None
+
+
+manager = JobManager(WHISPER_MAX_WORKERS, WHISPER_MAX_PENDING)
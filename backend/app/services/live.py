@@ -0,0 +1,244 @@
+"""
+録音しながらの文字起こし（ライブモード）。
+
+ブラウザで録音している間、フロントエンドが数秒ごとに音声（16kHz モノラルの 16bit PCM）を送り、
+サーバーは一定の長さ（既定は30秒）たまるごとに無音の位置で区切って文字起こしします。
+録音が終わった時点で文字起こしはほぼ終わっているので、残りは要約だけです。
+
+セッションの流れ:
+    POST   /whisper/live                 セッションを作る
+    POST   /whisper/live/{id}/chunks     音声を追加する（seq で順番を付け、再送は無視する）
+    GET    /whisper/live/{id}            ここまでの文字起こしを取得する
+    POST   /whisper/live/{id}/finish     録音を終了し、要約のジョブを登録する
+    DELETE /whisper/live/{id}            破棄する
+
+環境変数:
+    WHISPER_LIVE_WINDOW_SECONDS : 1回に文字起こしする長さ（秒, 既定は 30）
+    WHISPER_LIVE_MAX_SESSIONS   : 同時に受け付けるセッション数（既定は 4）
+    WHISPER_LIVE_TTL            : 更新の無いセッションを破棄するまでの秒数（既定は 3600）
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from app.services import chunked, decoder, pipeline, summarizer
+
+LIVE_WINDOW_SECONDS = float(os.getenv("WHISPER_LIVE_WINDOW_SECONDS", 30))
+MAX_LIVE_SESSIONS = int(os.getenv("WHISPER_LIVE_MAX_SESSIONS", 4))
+LIVE_SESSION_TTL = int(os.getenv("WHISPER_LIVE_TTL", 3600))
+
+# 1回に送れる音声の上限（16bit PCM で60秒分）
+MAX_CHUNK_BYTES = decoder.SAMPLE_RATE * 2 * 60
+
+# single モードでは区間を1つずつ順番に文字起こしする（直前の区間の文字起こしを手がかりに使うため）
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper-live")
+
+
+class LiveSessionClosed(Exception):
+    """録音が終了したセッションに音声が送られた。"""
+
+
+class TooManySessions(Exception):
+    """同時に受け付けるセッション数の上限に達している。"""
+
+
+class LiveSession:
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.finished = False
+        self.last_seq = -1
+        self.received_samples = 0
+        # まだ文字起こしに回していない音声と、その開始秒
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pending_offset = 0.0
+        # 文字起こしに回した区間（順番通り）と、先頭から揃った分の結果
+        self._windows: list[Future] = []
+        self._collected = 0
+        self.segments: list[dict] = []
+        self.texts: list[str] = []
+        self.error: Exception | None = None
+        # 録音の終了時に登録した要約のジョブ（finish_and_submit を参照）
+        self.summary_job = None
+        # 終わっている Future に add_done_callback すると、その場で _collect が呼ばれるため再入可能にする
+        self._lock = threading.RLock()
+
+    def add_chunk(self, seq: int, pcm: bytes) -> bool:
+        """
+        音声（16kHz モノラルの 16bit PCM）を追加します。
+        seq が受け取り済みのもの以下なら再送とみなして無視し、False を返します。
+        """
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+        with self._lock:
+            if self.finished:
+                raise LiveSessionClosed("録音はすでに終了しています。")
+            if seq <= self.last_seq:
+                return False
+            self.last_seq = seq
+            self.received_samples += len(samples)
+            self.updated_at = time.time()
+            self._pending = np.concatenate([self._pending, samples])
+            # 十分な長さがたまったら、目標の長さ付近の無音の位置で区切って文字起こしに回す
+            while True:
+                points = chunked.find_split_points(self._pending, LIVE_WINDOW_SECONDS)
+                if not points:
+                    break
+                self._submit(points[0])
+        return True
+
+    def _submit(self, end: int) -> None:
+        window = self._pending[:end]
+        offset = self._pending_offset
+        self._pending = self._pending[end:]
+        self._pending_offset += end / decoder.SAMPLE_RATE
+        if chunked.TRANSCRIBE_MODE == "chunked":
+            future = chunked.submit_chunk(offset, window)
+        else:
+            future = _executor.submit(self._transcribe, offset, window)
+        self._windows.append(future)
+        future.add_done_callback(lambda _: self._collect())
+
+    def _transcribe(self, offset: float, window: np.ndarray) -> dict:
+        # 同じスレッドで順番に処理されるので、直前の区間の結果はここではもう揃っている
+        return pipeline.transcribe_window(window, offset, self.texts[-1] if self.texts else None)
+
+    def _collect(self) -> None:
+        # 先頭から順に終わった区間の結果を取り込む
+        with self._lock:
+            while self._collected < len(self._windows) and self._windows[self._collected].done():
+                future = self._windows[self._collected]
+                self._collected += 1
+                if future.cancelled():
+                    continue
+                if future.exception() is not None:
+                    self.error = future.exception()
+                    continue
+                result = future.result()
+                self.segments.extend(result["segments"])
+                self.texts.append(result["text"])
+            self.updated_at = time.time()
+
+    def finish(self) -> None:
+        """録音を終了します。残っている音声も文字起こしに回します。"""
+        with self._lock:
+            if self.finished:
+                return
+            self.finished = True
+            if len(self._pending):
+                self._submit(len(self._pending))
+
+    def finish_and_submit(self, submit: Callable[[], object]):
+        """
+        録音を終了し、submit() で要約のジョブを登録して返します。
+        再送や二度押しで何度呼ばれても、登録するのは最初の1回だけです（2回目以降は同じジョブを返します）。
+        """
+        with self._lock:
+            self.finish()
+            if self.summary_job is None:
+                self.summary_job = submit()
+            return self.summary_job
+
+    def wait(self, checkpoint: Callable[[], None] = lambda: None, interval: float = 1.0) -> str:
+        """すべての区間の文字起こしが終わるまで待ち、全文を返します。"""
+        while True:
+            with self._lock:
+                windows = list(self._windows)
+            done, not_done = wait(windows, timeout=interval)
+            checkpoint()
+            if not not_done:
+                break
+        self._collect()
+        if self.error is not None:
+            raise self.error
+        return "".join(self.texts)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.finished = True
+            for future in self._windows:
+                future.cancel()
+
+    def to_dict(self, offset: int = 0) -> dict:
+        return {
+            "session_id": self.id,
+            "finished": self.finished,
+            "received_seconds": round(self.received_samples / decoder.SAMPLE_RATE, 2),
+            "transcribed_seconds": self.segments[-1]["end"] if self.segments else 0.0,
+            "pending_windows": len(self._windows) - self._collected,
+            "segments": self.segments[offset:],
+            "next_offset": len(self.segments),
+            "error": str(self.error) if self.error is not None else None,
+        }
+
+
+def run_summary(session: LiveSession, on_stage, on_event=None) -> dict:
+    """
+    録音の終わったセッションの残りの文字起こしを待ってから、校正・要約します。
+    ジョブのワーカースレッドで pipeline.run の代わりに実行します。
+    """
+    on_stage("transcribing")
+    if on_event:
+        for seg in session.segments:
+            on_event({"type": "segment", **seg})
+    sent = len(session.segments)
+
+    def checkpoint():
+        nonlocal sent
+        on_stage("transcribing")
+        if on_event:
+            for seg in session.segments[sent:]:
+                on_event({"type": "segment", **seg})
+        sent = len(session.segments)
+
+    text = session.wait(checkpoint)
+    checkpoint()
+    if not text:
+        raise pipeline.EmptyTranscriptError("音声からテキストを抽出出来ませんでした。")
+    return summarizer.correct_and_summarize(text, on_stage, on_event)
+
+
+_sessions: dict[str, LiveSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def create() -> LiveSession:
+    """セッションを作ります。上限に達している場合は TooManySessions。"""
+    with _sessions_lock:
+        _prune()
+        active = sum(1 for session in _sessions.values() if not session.finished)
+        if active >= MAX_LIVE_SESSIONS:
+            raise TooManySessions("録音中のセッションが多すぎます。しばらくしてから再度お試しください。")
+        session = LiveSession()
+        _sessions[session.id] = session
+    return session
+
+
+def get(session_id: str) -> LiveSession | None:
+    return _sessions.get(session_id)
+
+
+def discard(session_id: str) -> None:
+    with _sessions_lock:
+        session = _sessions.pop(session_id, None)
+    if session is not None:
+        session.cancel()
+
+
+def _prune() -> None:
+    # しばらく更新の無いセッション（録音を止めずに閉じたブラウザなど）を破棄する
+    now = time.time()
+    for session_id, session in list(_sessions.items()):
+        if now - session.updated_at > LIVE_SESSION_TTL:
+            del _sessions[session_id]
+            session.cancel()
+
+
+def shutdown() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
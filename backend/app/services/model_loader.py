@@ -0,0 +1,97 @@
+"""
+Whisper モデルの遅延ロード。
+
+モデルの読み込みには数十秒と数GBのメモリがかかるため、import 時には読み込まず、
+起動時にバックグラウンドのスレッドで読み込みを始めます。
+音声処理のリクエストは読み込みが終わるまで待ちます。
+
+読み込むエンジン（openai-whisper / faster-whisper）は app/services/engines.py を参照。
+
+環境変数:
+    WHISPER_MODEL   : モデル名（tiny / base / small / medium / large など。既定は medium）
+    WHISPER_DEVICE  : 実行デバイス（cpu / cuda など。未指定なら自動選択）
+    WHISPER_PRELOAD : 0 にすると起動時には読み込まず、最初のリクエストで読み込む
+"""
+
+import os
+import threading
+import time
+
+from app.services import engines
+
+WHISPER_MODEL_NAME = os.getenv("WHISPER_MODEL", "medium")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE") or None
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "1") != "0"
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_thread: threading.Thread | None = None
+_model = None
+_error: Exception | None = None
+_started_at: float | None = None
+_loaded_at: float | None = None
+
+
+class ModelNotReady(Exception):
+    """モデルの読み込みが終わっていない、または失敗した。"""
+
+
+def _load() -> None:
+    global _model, _error, _loaded_at
+    try:
+        _model = engines.load_engine(engines.WHISPER_ENGINE, WHISPER_MODEL_NAME, WHISPER_DEVICE)
+        print(f"Whisperモデル（{engines.WHISPER_ENGINE}: {WHISPER_MODEL_NAME}）をロードしました。")
+    except Exception as e:  # エラー発生時にエラーの内容をe変数に格納
+        print(f"Whispermodelのロードに失敗しました。:{e}")
+        _error = e
+    finally:
+        _loaded_at = time.time()
+        _ready.set()
+
+
+def start_loading() -> None:
+    """バックグラウンドでモデルの読み込みを開始します（2回目以降は何もしません）。"""
+    global _thread, _started_at
+    with _lock:
+        if _thread is not None:
+            return
+        _started_at = time.time()
+        _thread = threading.Thread(target=_load, name="whisper-loader", daemon=True)
+        _thread.start()
+
+
+def get_model(timeout: float | None = None) -> engines.Engine:
+    """
+    読み込み済みのエンジンを返します。読み込み中の場合は終わるまで待ちます。
+    timeout 秒待っても終わらない場合や、読み込みに失敗していた場合は ModelNotReady。
+    """
+    start_loading()
+    if not _ready.wait(timeout):
+        raise ModelNotReady("Whisperモデルを読み込み中です。しばらくしてから再度お試しください。")
+    if _model is None:
+        raise ModelNotReady(f"Whisperモデルのロードに失敗しました。:{_error}")
+    return _model
+
+
+def status() -> dict:
+    """読み込み状況を返します（/whisper/ready で使用）。"""
+    if _thread is None:
+        state = "not_started"
+    elif not _ready.is_set():
+        state = "loading"
+    elif _model is not None:
+        state = "ready"
+    else:
+        state = "failed"
+    info = {
+        "state": state,
+        "engine": engines.WHISPER_ENGINE,
+        "model": WHISPER_MODEL_NAME,
+        "device": WHISPER_DEVICE or "auto",
+    }
+    if _started_at is not None:
+        end = _loaded_at or time.time()
+        info["elapsed_seconds"] = round(end - _started_at, 1)
+    if _error is not None:
+        info["error"] = str(_error)
+    return info
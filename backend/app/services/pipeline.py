@@ -0,0 +1,112 @@
+"""
+音声ファイルから議事録（校正済みの全文と要約）を作る処理。
+
+Whisper で文字起こしした後、GPT-4o で文章を校正し、箇条書きで要約します
+（長い文字起こしは区間に分けて同時に処理します。app/services/summarizer.py）。
+処理はブロッキングなので、ジョブのワーカースレッド（app/services/jobs.py）から呼び出します。
+"""
+
+import os
+from collections.abc import Callable
+from typing import BinaryIO
+import numpy as np
+from app.services import chunked, decoder, engines, model_loader, summarizer
+
+# 音声処理はモデルの読み込みが終わるまで最大この秒数待つ
+MODEL_WAIT_TIMEOUT = float(os.getenv("WHISPER_LOAD_TIMEOUT", 600))
+# 途中経過を知らせる場合に、この秒数くらいずつ区切って文字起こしする（既定の 0 は区切らない）
+# 区切ると最初のセグメントは早く届くが、前後の文脈が短くなるので結果が変わることがある
+STREAM_WINDOW_SECONDS = float(os.getenv("WHISPER_STREAM_WINDOW_SECONDS", 0))
+# 区切った区間の文字起こしに、直前の区間の末尾をこの文字数だけ手がかりとして渡す
+PROMPT_CHARS = 200
+
+
+class EmptyTranscriptError(Exception):
+    """音声からテキストを抽出できなかった。"""
+
+
+def transcribe_window(audio: np.ndarray, offset: float, prompt: str | None = None) -> dict:
+    """
+    区切った音声の1区間を文字起こしします。
+    セグメントの時刻には区間の開始秒 offset を足し、prompt には直前の区間の文字起こしを渡します。
+    """
+    engine = model_loader.get_model(MODEL_WAIT_TIMEOUT)
+    result = engine.transcribe(audio, prompt[-PROMPT_CHARS:] if prompt else None)
+    return engines.shift_segments(result, offset)
+
+
+def transcribe(
+    audio: np.ndarray,
+    checkpoint: Callable[[], None] = lambda: None,
+    on_segment: Callable[[dict], None] | None = None,
+) -> str:
+    """
+    音声（16kHz モノラルの float32 配列）を文字起こしします。
+    WHISPER_TRANSCRIBE_MODE=chunked の場合は区間に分けて並列に処理します。
+    on_segment を渡すと、文字起こしできたセグメント（start, end, text）から順に渡します。
+    """
+    if chunked.TRANSCRIBE_MODE == "chunked":
+        return chunked.transcribe_audio(audio, checkpoint, on_segment)["text"]
+
+    if on_segment is None or STREAM_WINDOW_SECONDS <= 0:
+        #音声を文字列に変換（エンジンは WHISPER_ENGINE で選ぶ）
+        # 途中経過は音声全体を1回で処理しながら、セグメントができるたびに渡す
+        def emit(seg: dict) -> None:
+            on_segment(seg)
+            checkpoint()
+
+        engine = model_loader.get_model(MODEL_WAIT_TIMEOUT)
+        return engine.transcribe(audio, on_segment=emit if on_segment else None)["text"]
+
+    # WHISPER_STREAM_WINDOW_SECONDS を指定した場合は、無音の位置で区切って先頭から順に
+    # 文字起こしし、区間が終わるごとにセグメントを渡す
+    texts = []
+    for offset, window in chunked.split_at_silence(audio, STREAM_WINDOW_SECONDS):
+        result = transcribe_window(window, offset, texts[-1] if texts else None)
+        for seg in result["segments"]:
+            on_segment(seg)
+        texts.append(result["text"])
+        checkpoint()
+    return "".join(texts)
+
+
+def settings_key() -> str:
+    """結果に影響する設定（モデル・プロンプト）をまとめた文字列。結果のキャッシュのキーに使います。"""
+    return (
+        f"engine={engines.WHISPER_ENGINE};compute={engines.WHISPER_COMPUTE_TYPE};"
+        f"beam={engines.WHISPER_BEAM_SIZE};"
+        f"whisper={model_loader.WHISPER_MODEL_NAME};mode={chunked.TRANSCRIBE_MODE};"
+        f"window={STREAM_WINDOW_SECONDS:g};"
+        f"chat={summarizer.CHAT_MODEL};prompt={summarizer.PROMPT_VERSION}"
+    )
+
+
+def run(
+    source: BinaryIO | str,
+    on_stage: Callable[[str], None] = lambda stage: None,
+    on_event: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    デコード → 文字起こし → 校正 → 要約 を順に実行します。
+    source はアップロードされた音声のファイルオブジェクト（またはファイルのパス）です。
+    各段階の開始時に on_stage(段階名) を呼びます（キャンセルの確認にも使います）。
+    on_event を渡すと途中経過を次のイベントで知らせます。
+        {"type": "segment", "start", "end", "text"} : 文字起こしのセグメント
+        {"type": "corrected", "text"}               : 校正済みの全文
+        {"type": "summary", "delta"}                : 要約の続き（トークン単位）
+    """
+    if not summarizer.is_configured():
+        raise RuntimeError("サーバーのAIモデルが正しく設定されていません。")
+
+    on_stage("decoding")
+    audio = decoder.decode(source)
+    if audio.size == 0:
+        raise EmptyTranscriptError("音声からテキストを抽出出来ませんでした。")
+
+    on_stage("transcribing")
+    on_segment = (lambda seg: on_event({"type": "segment", **seg})) if on_event else None
+    original_text = transcribe(audio, lambda: on_stage("transcribing"), on_segment)
+    if not original_text:
+        raise EmptyTranscriptError("音声からテキストを抽出出来ませんでした。")
+
+    return summarizer.correct_and_summarize(original_text, on_stage, on_event)
@@ -0,0 +1,100 @@
+"""
+文字起こし・要約結果のキャッシュ。
+
+同じ録音が再アップロードされた場合や「要約を生成」を押し直した場合に、
+Whisper と GPT-4o を再び呼ばずに前回の結果を返します。
+キーは音声データの SHA-256 と、モデル・プロンプトの設定をまとめたものです。
+結果は1件1ファイルの JSON としてディスクに保存し、合計サイズが上限を超えたら
+最後に使われた日時（ファイルの更新日時）が古いものから削除します。
+
+環境変数:
+    WHISPER_CACHE_DIR       : 保存先のフォルダ（既定は backend/app/cache）
+    WHISPER_CACHE_MAX_BYTES : 保存する合計サイズの上限（バイト, 既定は 64MB。0 で無効）
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+CACHE_DIR = Path(os.getenv("WHISPER_CACHE_DIR") or Path(__file__).resolve().parents[1] / "cache")
+CACHE_MAX_BYTES = int(os.getenv("WHISPER_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return CACHE_MAX_BYTES > 0
+
+
+def make_key(audio_digest: str, settings: str) -> str:
+    """音声の SHA-256（16進）と設定の文字列からキャッシュのキーを作ります。"""
+    return hashlib.sha256(f"{settings}\0{audio_digest}".encode("utf-8")).hexdigest()
+
+
+def _path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.json"
+
+
+def get(key: str) -> dict | None:
+    """キャッシュされた結果を返します。無ければ None。"""
+    if not enabled():
+        return None
+    path = _path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    try:
+        # 使われた日時を更新する（削除の順番に使う）
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+    return result
+
+
+def put(key: str, result: dict) -> dict:
+    """結果を保存し、上限を超えていれば古いものを削除します。保存した結果をそのまま返します。"""
+    if not enabled():
+        return result
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, _path(key))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _evict()
+    return result
+
+
+def _evict() -> None:
+    with _lock:
+        entries = []
+        total = 0
+        for path in CACHE_DIR.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= CACHE_MAX_BYTES:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def clear() -> None:
+    """キャッシュをすべて削除します。"""
+    with _lock:
+        for path in CACHE_DIR.glob("*.json"):
+            path.unlink(missing_ok=True)
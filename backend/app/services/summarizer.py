@@ -0,0 +1,219 @@
+"""
+文字起こしの校正と要約（map-reduce）。
+
+長い会議の文字起こしは1回のリクエストではモデルのコンテキストに収まらず、
+校正と要約を順番に行うと待ち時間も2倍になります。そこで、
+    1. 文字起こしをトークン数の上限以内の区間に分け（文の区切りを優先）、
+    2. 区間ごとの「校正 → 要約」を同時に実行し（同時実行数は上限付き）、
+    3. 区間ごとの要約をまとめて最終的な箇条書きにします。
+区間が1つの場合は、以前と同じく校正と要約を1回ずつ行うだけです。
+
+OpenAI 互換のサーバーであれば接続先を変えられるので、
+benchmarks/fake_openai.py の疑似サーバーを使って API キー無しで試せます。
+
+環境変数:
+    OPENAI_API_KEY           : API キー
+    OPENAI_BASE_URL          : 接続先（未指定なら OpenAI。openai ライブラリが読み込みます）
+    SUMMARY_MAX_CONCURRENCY  : 同時に送るリクエスト数の上限（既定は 4）
+    SUMMARY_CHUNK_TOKENS     : 1区間のトークン数の上限（既定は 3000）
+"""
+
+import asyncio
+import os
+import re
+from collections.abc import Callable
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+load_dotenv()
+
+CHAT_MODEL = "gpt-4o"
+# 校正・要約のプロンプトを変えたら上げる（結果のキャッシュを無効にするため）
+PROMPT_VERSION = 2
+
+MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", 4))
+CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", 3000))
+
+CORRECT_SYSTEM = "あなたは文章の専門家です。"
+CORRECT_PROMPT = "以下の文章で日本語としておかしい部分を修正し、自然で読みやすい文章にしてください。:\n\n{text}"
+SUMMARIZE_SYSTEM = "あなたは文章要約の専門家です。"
+SUMMARIZE_PROMPT = "以下の文章を日本語で簡潔に箇条書きで要約してください:\n\n{text}"
+REDUCE_PROMPT = (
+    "以下は1つの会議を前から順に区切って要約したものです。"
+    "重複をまとめ、全体を日本語で簡潔に箇条書きで要約してください:\n\n{text}"
+)
+
+# 文の区切り（区切り文字は前の文に含める）
+_SENTENCE_END = re.compile(r"(?<=[。．！？!?\n ])")
+
+_encoding = None
+
+
+def is_configured() -> bool:
+    return bool(os.getenv("OPENAI_API_KEY"))
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            # tiktoken は openai-whisper の依存として入っている
+            import tiktoken
+
+            _encoding = tiktoken.encoding_for_model(CHAT_MODEL)
+        except Exception as e:  # 語彙ファイルを取得できない環境など
+            print(f"tiktoken を使えないため文字数でトークン数を見積もります。:{e}")
+            _encoding = False
+    return _encoding or None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        # 日本語はおおよそ1文字1トークン
+        return len(text)
+    return len(encoding.encode(text))
+
+
+def _pieces(text: str, max_tokens: int):
+    """文ごとに (文, トークン数) を返します。上限を超える文は文字数で分けます。"""
+    for sentence in _SENTENCE_END.split(text):
+        if not sentence:
+            continue
+        tokens = count_tokens(sentence)
+        if tokens <= max_tokens:
+            yield sentence, tokens
+            continue
+        # 句点の無い長い文（Whisper の日本語出力に多い）はトークン数に比例した文字数で切る
+        step = max(1, len(sentence) * max_tokens // tokens)
+        for i in range(0, len(sentence), step):
+            piece = sentence[i : i + step]
+            yield piece, count_tokens(piece)
+
+
+def split_text(text: str, max_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """文章を、それぞれ max_tokens トークン以内の区間に分けます。"""
+    chunks = []
+    current: list[str] = []
+    current_tokens = 0
+    for piece, tokens in _pieces(text, max_tokens):
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+class _Session:
+    """1回の要約処理。接続と同時実行数の制限を共有します。"""
+
+    def __init__(self, client: AsyncOpenAI, on_progress: Callable[[str], None]):
+        self.client = client
+        self.on_progress = on_progress
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def chat(
+        self,
+        system: str,
+        prompt: str,
+        temperature: float,
+        on_delta: Callable[[str], None] | None = None,
+    ) -> str:
+        """1回のチャットを実行します。on_delta を渡すと応答をストリーミングで受け取り、少しずつ渡します。"""
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt},
+        ]
+        async with self.semaphore:
+            if on_delta is None:
+                response = await self.client.chat.completions.create(
+                    model=CHAT_MODEL, messages=messages, temperature=temperature
+                )
+                return response.choices[0].message.content
+
+            stream = await self.client.chat.completions.create(
+                model=CHAT_MODEL, messages=messages, temperature=temperature, stream=True
+            )
+            parts = []
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    on_delta(parts[-1])
+        return "".join(parts)
+
+    async def correct(self, chunk: str) -> str:
+        corrected = await self.chat(CORRECT_SYSTEM, CORRECT_PROMPT.format(text=chunk), 0.2)
+        self.on_progress("correcting")
+        return corrected
+
+    async def summarize(self, text: str, on_delta: Callable[[str], None] | None = None) -> str:
+        return await self.chat(SUMMARIZE_SYSTEM, SUMMARIZE_PROMPT.format(text=text), 0.0, on_delta)
+
+    async def map_chunk(self, chunk: str) -> tuple[str, str]:
+        """1区間を校正してから要約します。(校正後の文章, 要約) を返します。"""
+        corrected = await self.correct(chunk)
+        summary = await self.summarize(corrected)
+        self.on_progress("correcting")
+        return corrected, summary
+
+    async def reduce(
+        self, summaries: list[str], on_delta: Callable[[str], None] | None = None
+    ) -> str:
+        """区間ごとの要約を1つの箇条書きにまとめます。長すぎる場合は段階的にまとめます。"""
+        joined = "\n\n".join(summaries)
+        if count_tokens(joined) > CHUNK_TOKENS:
+            groups = split_text(joined, CHUNK_TOKENS)
+            if 1 < len(groups) < len(summaries):
+                partials = await asyncio.gather(*(self._reduce_one(group) for group in groups))
+                return await self.reduce(list(partials), on_delta)
+        return await self._reduce_one(joined, on_delta)
+
+    async def _reduce_one(self, text: str, on_delta: Callable[[str], None] | None = None) -> str:
+        summary = await self.chat(SUMMARIZE_SYSTEM, REDUCE_PROMPT.format(text=text), 0.0, on_delta)
+        self.on_progress("summarizing")
+        return summary
+
+
+async def correct_and_summarize_async(
+    text: str,
+    on_progress: Callable[[str], None] = lambda stage: None,
+    on_event: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    文字起こしを校正・要約し、{"full_text", "summary"} を返します。
+    on_event を渡すと、校正済みの全文ができた時点で {"type": "corrected", "text"}、
+    最終的な要約を {"type": "summary", "delta"} で少しずつ渡します。
+    """
+    on_delta = (lambda delta: on_event({"type": "summary", "delta": delta})) if on_event else None
+    chunks = split_text(text)
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) as client:
+        session = _Session(client, on_progress)
+        on_progress("correcting")
+        if len(chunks) == 1:
+            corrected_chunks = [await session.correct(chunks[0])]
+        else:
+            results = await asyncio.gather(*(session.map_chunk(chunk) for chunk in chunks))
+            corrected_chunks = [corrected for corrected, _ in results]
+        full_text = "\n".join(corrected_chunks)
+        if on_event:
+            on_event({"type": "corrected", "text": full_text})
+
+        on_progress("summarizing")
+        if len(chunks) == 1:
+            summary = await session.summarize(full_text, on_delta)
+        else:
+            summary = await session.reduce([summary for _, summary in results], on_delta)
+    return {"full_text": full_text, "summary": summary}
+
+
+def correct_and_summarize(
+    text: str,
+    on_progress: Callable[[str], None] = lambda stage: None,
+    on_event: Callable[[dict], None] | None = None,
+) -> dict:
+    """correct_and_summarize_async をワーカースレッドから呼ぶための同期版。"""
+    return asyncio.run(correct_and_summarize_async(text, on_progress, on_event))
@@ -0,0 +1,28 @@
+"""
+バックエンドからコレクションのデータにアクセスするための入口。
+
+データの読み書き（キャッシュ・ロック・保存形式の切り替え）はフロントエンドと共通の
+region_project.storage パッケージ（src/region_project/storage）にまとまっているので、それを使います。
+"""
+
+from pathlib import Path
+
+from region_project.storage import bulk_io, event_index, func
+
+DB_DIR = Path(__file__).resolve().parent / "db"
+KAIRANBAN_FILE = DB_DIR / "kairanban.json"
+EVENT_FILE = DB_DIR / "event.json"
+STOCK_FILE = DB_DIR / "stock_data.json"
+MINUTES_FILE = DB_DIR / "minutes.json"
+FINANCES_FILE = DB_DIR / "finances.json"
+
+__all__ = [
+    "func",
+    "bulk_io",
+    "event_index",
+    "KAIRANBAN_FILE",
+    "EVENT_FILE",
+    "STOCK_FILE",
+    "MINUTES_FILE",
+    "FINANCES_FILE",
+]
@@ -0,0 +1,152 @@
+"""
+ベンチマーク用の日本語の音声（長さ違い）を作ります。
+
+元になる音声は次の順で選びます。
+    1. --sample で指定した日本語の録音（実際の会議の録音など。一番実際に近い結果になります）
+    2. espeak-ng があれば、SAMPLE_SENTENCES を日本語で読み上げた音声
+    3. どちらも無ければ、話し声に似せた合成音（声の高さの変わる母音と息継ぎの無音）
+元の音声を指定の長さまで繰り返し、スマートフォンの録音と同じ AAC（m4a）にして
+fixtures フォルダに保存します。同じ元音声・同じ長さのファイルがあれば作り直しません。
+
+使い方（プロジェクトのルートで実行）:
+    python benchmarks/audio_fixtures.py --lengths 60 300 900 [--sample meeting.m4a]
+"""
+
+import argparse
+import hashlib
+import shutil
+import subprocess
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import av
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.services import decoder  # noqa: E402
+from summarize_bench import SAMPLE_SENTENCES  # noqa: E402
+
+SAMPLE_RATE = decoder.SAMPLE_RATE
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+DEFAULT_LENGTHS = [60, 300, 900]
+# 元の音声を繰り返すときに間に入れる無音（秒）
+GAP_SECONDS = 0.8
+# 保存する形式（iPhone のボイスメモと同じ 48kHz の AAC）
+FILE_RATE = 48000
+BIT_RATE = 64000
+
+
+def _speak(text: str) -> np.ndarray:
+    # espeak-ng の日本語音声で読み上げた WAV をデコードする
+    wav = subprocess.run(
+        ["espeak-ng", "-v", "ja", "-s", "160", "--stdout", text],
+        check=True,
+        capture_output=True,
+    ).stdout
+    return decoder.decode(BytesIO(wav))
+
+
+def _synthesize(seconds: float = 30.0, seed: int = 0) -> np.ndarray:
+    """話し声に似せた合成音（母音ごとに声の高さが変わり、文の間に無音がある）。"""
+    rng = np.random.default_rng(seed)
+    pieces = []
+    total = 0
+    while total < seconds * SAMPLE_RATE:
+        for _ in range(rng.integers(8, 20)):
+            length = int(rng.uniform(0.08, 0.2) * SAMPLE_RATE)
+            t = np.arange(length) / SAMPLE_RATE
+            f0 = rng.uniform(110, 220)
+            # 基本周波数と倍音を重ね、母音ごとにフェードイン・アウトする
+            tone = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+            pieces.append((tone * np.hanning(length) * 0.2).astype(np.float32))
+            pieces.append(np.zeros(int(rng.uniform(0.01, 0.05) * SAMPLE_RATE), np.float32))
+        pieces.append(np.zeros(int(rng.uniform(0.3, 0.8) * SAMPLE_RATE), np.float32))
+        total = sum(len(p) for p in pieces)
+    return np.concatenate(pieces)
+
+
+def source_kind(sample: Path | None = None) -> str:
+    """元音声の種類（sample-<ハッシュ> / espeak / synthetic）。保存するファイル名に使います。"""
+    if sample is not None:
+        return f"sample-{hashlib.sha256(sample.read_bytes()).hexdigest()[:8]}"
+    if shutil.which("espeak-ng"):
+        return "espeak"
+    return "synthetic"
+
+
+def base_audio(kind: str, sample: Path | None = None) -> np.ndarray:
+    """元音声を 16kHz モノラルの float32 配列で返します。"""
+    if kind.startswith("sample-"):
+        return decoder.decode(str(sample))
+    if kind == "espeak":
+        gap = np.zeros(int(GAP_SECONDS * SAMPLE_RATE), np.float32)
+        return np.concatenate(
+            [piece for sentence in SAMPLE_SENTENCES for piece in (_speak(sentence), gap)]
+        )
+    return _synthesize()
+
+
+def repeat_to(audio: np.ndarray, seconds: float) -> np.ndarray:
+    """audio を無音を挟んで繰り返し、ちょうど seconds 秒にします。"""
+    gap = np.zeros(int(GAP_SECONDS * SAMPLE_RATE), np.float32)
+    unit = np.concatenate([audio, gap])
+    target = int(seconds * SAMPLE_RATE)
+    return np.tile(unit, target // len(unit) + 1)[:target]
+
+
+def encode_m4a(audio: np.ndarray, path: Path) -> None:
+    """16kHz モノラルの float32 配列を AAC（m4a）で保存します。"""
+    with av.open(str(path), mode="w", format="ipod") as container:
+        stream = container.add_stream("aac", rate=FILE_RATE, layout="mono")
+        stream.bit_rate = BIT_RATE
+        # 48kHz への変換はエンコーダーが行う
+        for start in range(0, len(audio), SAMPLE_RATE):
+            frame = av.AudioFrame.from_ndarray(
+                audio[None, start : start + SAMPLE_RATE], format="flt", layout="mono"
+            )
+            frame.sample_rate = SAMPLE_RATE
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+def build(
+    lengths: list[int] = DEFAULT_LENGTHS,
+    sample: Path | None = None,
+    directory: Path = FIXTURES_DIR,
+) -> list[dict]:
+    """長さごとの音声ファイルを用意し、[{"file", "kind", "seconds", "bytes"}] を返します。"""
+    directory.mkdir(parents=True, exist_ok=True)
+    kind = source_kind(sample)
+    audio = None
+    fixtures = []
+    for seconds in lengths:
+        path = directory / f"{kind}-{seconds}s.m4a"
+        if not path.exists():
+            if audio is None:
+                audio = base_audio(kind, sample)
+            tmp = path.with_suffix(".tmp.m4a")
+            encode_m4a(repeat_to(audio, seconds), tmp)
+            tmp.replace(path)
+        fixtures.append(
+            {"file": str(path), "kind": kind, "seconds": seconds, "bytes": path.stat().st_size}
+        )
+    return fixtures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="ベンチマーク用の音声を作る")
+    parser.add_argument("--lengths", type=int, nargs="+", default=DEFAULT_LENGTHS, help="秒")
+    parser.add_argument("--sample", type=Path, help="元にする日本語の録音")
+    parser.add_argument("--dir", type=Path, default=FIXTURES_DIR)
+    args = parser.parse_args(argv)
+    for fixture in build(args.lengths, args.sample, args.dir):
+        print(fixture)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+文字起こしエンジンの速度と精度の比較。
+
+同じ音声をエンジンごとに文字起こしし、モデルの読み込み時間・処理時間・RTF（処理時間 / 音声の長さ）と、
+正解の文字起こし（--reference）に対する文字誤り率（CER）を JSON で出力します。
+正解が無い場合は、最初のエンジンの結果に対する差（CER）を出力します。
+デコードの設定（ビームサーチの幅 --beam-size）はすべてのエンジンで同じ値を使い、結果にも出力します。
+
+使い方（プロジェクトのルートで実行）:
+    python benchmarks/compare_engines.py meeting.m4a --reference meeting.txt
+    python benchmarks/compare_engines.py meeting.m4a --engines openai-whisper faster-whisper --model small
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from app.services import decoder, engines  # noqa: E402
+
+# 句読点や空白は比較の対象にしない（エンジンによって付け方が違うため）
+_IGNORED = re.compile(r"[\s、。，．,.!?！？「」『』（）()・…ー-]")
+
+
+def normalize(text: str) -> str:
+    return _IGNORED.sub("", text)
+
+
+def edit_distance(a: str, b: str) -> int:
+    """2つの文字列のレーベンシュタイン距離。"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            )
+        previous = current
+    return previous[-1]
+
+
+def cer(reference: str, hypothesis: str) -> float:
+    """文字誤り率（正規化した正解の文字数に対する編集距離）。"""
+    reference, hypothesis = normalize(reference), normalize(hypothesis)
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    return edit_distance(reference, hypothesis) / len(reference)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="文字起こしエンジンの比較")
+    parser.add_argument("audio", type=Path, help="音声ファイル")
+    parser.add_argument("--reference", type=Path, help="正解の文字起こし（テキストファイル）")
+    parser.add_argument("--engines", nargs="+", default=list(engines.ENGINES))
+    parser.add_argument("--model", default="medium", help="モデル名（既定は medium）")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--threads", type=int, default=0, help="CPU スレッド数（0 で自動）")
+    parser.add_argument(
+        "--beam-size",
+        type=int,
+        default=engines.WHISPER_BEAM_SIZE,
+        help="ビームサーチの幅（既定は WHISPER_BEAM_SIZE, 1 は貪欲法）",
+    )
+    parser.add_argument("--output", type=Path, help="結果の JSON を保存するファイル")
+    args = parser.parse_args(argv)
+
+    audio = decoder.decode(str(args.audio))
+    duration = len(audio) / decoder.SAMPLE_RATE
+    reference = args.reference.read_text(encoding="utf-8") if args.reference else None
+
+    results = []
+    for name in args.engines:
+        started = time.perf_counter()
+        engine = engines.load_engine(
+            name, args.model, args.device, args.threads, args.beam_size
+        )
+        load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = engine.transcribe(audio)
+        elapsed = time.perf_counter() - started
+        del engine
+
+        row = {
+            "engine": name,
+            "model": args.model,
+            "beam_size": args.beam_size,
+            "compute_type": engines.WHISPER_COMPUTE_TYPE if name == "faster-whisper" else None,
+            "duration": round(duration, 2),
+            "load_seconds": round(load_seconds, 2),
+            "seconds": round(elapsed, 2),
+            "rtf": round(elapsed / duration, 3),
+            "segments": len(result["segments"]),
+            "chars": len(normalize(result["text"])),
+        }
+        if reference is not None:
+            row["cer"] = round(cer(reference, result["text"]), 4)
+        elif results:
+            row[f"cer_vs_{results[0]['engine']}"] = round(cer(results[0]["text"], result["text"]), 4)
+        row["text"] = result["text"]
+        results.append(row)
+        print(json.dumps({k: v for k, v in row.items() if k != "text"}, ensure_ascii=False), file=sys.stderr)
+
+    report = json.dumps(results, ensure_ascii=False, indent=4)
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
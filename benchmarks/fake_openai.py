@@ -0,0 +1,161 @@
+"""
+OpenAI 互換の疑似サーバー（/v1/chat/completions のみ）。
+
+API キーや通信費をかけずに、校正・要約の処理（同時実行や区間分割）を試すためのものです。
+応答までの待ち時間を指定でき、stream=true の場合は1文字ずつ SSE で返します。
+
+    校正のプロンプト : 本文をそのまま返す
+    要約のプロンプト : 本文の各段落の先頭を「- 」付きの箇条書きにして返す
+
+使い方（プロジェクトのルートで実行）:
+    python benchmarks/fake_openai.py --port 8100 --latency 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=dummy rye run uvicorn ...
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+app = FastAPI()
+app.state.latency = 0.0  # 1回の応答にかかる秒数
+app.state.token_interval = 0.0  # stream=true で1文字ごとに待つ秒数
+app.state.requests = 0
+app.state.max_active = 0
+_active = 0
+_counter_lock = threading.Lock()
+
+
+def reply_for(messages: list[dict]) -> str:
+    prompt = messages[-1]["content"] if messages else ""
+    instruction, _, body = prompt.partition("\n\n")
+    if "修正" in instruction:
+        return body
+    bullets = []
+    for paragraph in body.split("\n"):
+        paragraph = paragraph.strip().lstrip("- ")
+        if paragraph:
+            bullets.append(f"- {paragraph[:40]}")
+    return "\n".join(bullets[:20])
+
+
+def _completion(content: str, model: str) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content), "total_tokens": len(content)},
+    }
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason: str | None = None) -> str:
+    data = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    global _active
+    payload = await request.json()
+    model = payload.get("model", "fake")
+    content = reply_for(payload.get("messages", []))
+    with _counter_lock:
+        app.state.requests += 1
+        _active += 1
+        app.state.max_active = max(app.state.max_active, _active)
+    try:
+        await asyncio.sleep(app.state.latency)
+    finally:
+        with _counter_lock:
+            _active -= 1
+
+    if not payload.get("stream"):
+        return _completion(content, model)
+
+    async def events():
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+        for char in content:
+            if app.state.token_interval:
+                await asyncio.sleep(app.state.token_interval)
+            yield _chunk(completion_id, model, {"content": char})
+        yield _chunk(completion_id, model, {}, "stop")
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/stats")
+async def stats():
+    return {"requests": app.state.requests, "max_active": app.state.max_active}
+
+
+class FakeOpenAIServer:
+    """ベンチマークから使うための、別スレッドで動く疑似サーバー。"""
+
+    def __init__(self, port: int = 8100, latency: float = 0.0, token_interval: float = 0.0):
+        app.state.latency = latency
+        app.state.token_interval = token_interval
+        self.port = port
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def reset_stats(self) -> None:
+        app.state.requests = 0
+        app.state.max_active = 0
+
+    def stats(self) -> dict:
+        return {"requests": app.state.requests, "max_active": app.state.max_active}
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI 互換の疑似サーバー")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.5, help="1回の応答にかかる秒数")
+    parser.add_argument(
+        "--token-interval", type=float, default=0.0, help="stream=true で1文字ごとに待つ秒数"
+    )
+    args = parser.parse_args()
+    app.state.latency = args.latency
+    app.state.token_interval = args.token_interval
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+議事録作成（/whisper/process-audio/）全体のベンチマーク。
+
+長さの違う日本語の音声（audio_fixtures.py）を使い、OpenAI の代わりに疑似サーバー（fake_openai.py）を
+起動して、次を JSON で出力します。結果は --output で保存し、変更の前後で比べられます。
+
+    stages      : 音声ごとの段階別の時間（アップロードの受け取り・デコード・文字起こし・校正・要約）、
+                  RTF（処理時間 / 音声の長さ）とメモリ使用量のピーク
+    concurrency : N 件を同時にアップロードしたときの所要時間・1件ごとの待ち時間・処理量・メモリのピーク
+
+モデルの読み込みは測定に含めません。結果のキャッシュは無効にして測ります。
+文字起こしのエンジンやモードなどは通常の起動と同じく環境変数で指定します。
+
+使い方（プロジェクトのルートで実行）:
+    python benchmarks/pipeline_bench.py --lengths 60 300 --concurrency 1 4 --latency 0.5
+    python benchmarks/pipeline_bench.py --sample meeting.m4a --output before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+import uvicorn
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import audio_fixtures  # noqa: E402
+from fake_openai import FakeOpenAIServer  # noqa: E402
+
+# メモリ使用量を調べる間隔（秒）
+RSS_INTERVAL = 0.05
+STAGES = ["upload", "decoding", "transcribing", "correcting", "summarizing"]
+
+
+def _rss(pid: int | str = "self") -> int:
+    """プロセスの使用中のメモリ（バイト）。/proc の無い環境では 0。"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _children() -> list[int]:
+    # 文字起こしのワーカープロセス（chunked モード）も合わせて数える
+    try:
+        with open(f"/proc/self/task/{os.getpid()}/children") as f:
+            return [int(pid) for pid in f.read().split()]
+    except OSError:
+        return []
+
+
+class PeakRSS:
+    """with の間のメモリ使用量（自分と子プロセスの合計）のピークを測ります。"""
+
+    def __init__(self):
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> None:
+        self.peak = max(self.peak, _rss() + sum(_rss(pid) for pid in _children()))
+
+    def _run(self) -> None:
+        while not self._stop.wait(RSS_INTERVAL):
+            self._sample()
+
+    def __enter__(self):
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    @property
+    def mb(self) -> float:
+        if not self.peak:
+            # /proc が無い場合はプロセス全体のピーク（Linux は KB, macOS はバイト）
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak = maxrss if sys.platform == "darwin" else maxrss * 1024
+        return round(self.peak / 1024 / 1024, 1)
+
+
+class StageTimer:
+    """on_stage として渡し、段階ごとにかかった時間を合計します。"""
+
+    def __init__(self):
+        self.seconds: dict[str, float] = {}
+        self._stage: str | None = None
+        self._started = 0.0
+
+    def __call__(self, stage: str) -> None:
+        if stage != self._stage:
+            self._close()
+            self._stage = stage
+            self._started = time.perf_counter()
+
+    def _close(self) -> None:
+        if self._stage is not None:
+            elapsed = time.perf_counter() - self._started
+            self.seconds[self._stage] = self.seconds.get(self._stage, 0.0) + elapsed
+            self._stage = None
+
+    def stop(self) -> dict[str, float]:
+        self._close()
+        return {stage: round(seconds, 3) for stage, seconds in self.seconds.items()}
+
+
+def measure_stages(fixture: dict) -> dict:
+    """1つの音声を、アップロードの受け取りから要約までジョブのワーカーと同じ順に処理します。"""
+    from app.services import decoder, pipeline
+
+    events = []
+    timer = StageTimer()
+    with PeakRSS() as rss:
+        started = time.perf_counter()
+        timer("upload")
+        with open(fixture["file"], "rb") as f:
+            source, _ = decoder.spool(f)
+        with source:
+            # サーバーと同じく途中経過を受け取る（文字起こしは区間ごとに進む）
+            result = pipeline.run(source, timer, events.append)
+        seconds = timer.stop()
+        total = time.perf_counter() - started
+
+    duration = fixture["seconds"]
+    return {
+        "file": Path(fixture["file"]).name,
+        "duration": duration,
+        "bytes": fixture["bytes"],
+        "seconds": round(total, 2),
+        "rtf": round(total / duration, 3),
+        "transcribe_rtf": round(seconds.get("transcribing", 0.0) / duration, 3),
+        "stages": {stage: seconds.get(stage, 0.0) for stage in STAGES},
+        "segments": sum(1 for event in events if event["type"] == "segment"),
+        "full_text_chars": len(result["full_text"]),
+        "peak_rss_mb": rss.mb,
+    }
+
+
+class APIServer:
+    """バックエンド（app.main）を別スレッドで起動します。"""
+
+    def __init__(self, port: int):
+        from app.main import app
+
+        self.port = port
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        # モデルの読み込み（chunked モードではワーカーの起動）が終わるまで待つ
+        while True:
+            response = requests.get(f"{self.url}/whisper/ready", timeout=10)
+            if response.status_code == 200:
+                break
+            if response.json().get("state") == "failed":
+                raise RuntimeError(f"Whisperモデルを読み込めませんでした: {response.json()}")
+            time.sleep(0.5)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def _upload(url: str, path: str) -> dict:
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        response = requests.post(
+            f"{url}/whisper/process-audio/",
+            files={"audio_file": (Path(path).name, f, "audio/mp4")},
+            timeout=3600,
+        )
+    return {"status": response.status_code, "seconds": time.perf_counter() - started}
+
+
+def measure_concurrency(url: str, fixture: dict, concurrency: int) -> dict:
+    """同じ音声を concurrency 件同時にアップロードし、すべて終わるまでの時間を測ります。"""
+    with PeakRSS() as rss, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        responses = list(pool.map(lambda _: _upload(url, fixture["file"]), range(concurrency)))
+        wall = time.perf_counter() - started
+
+    latencies = sorted(r["seconds"] for r in responses)
+    ok = sum(1 for r in responses if r["status"] == 200)
+    return {
+        "concurrency": concurrency,
+        "file": Path(fixture["file"]).name,
+        "duration": fixture["seconds"],
+        "seconds": round(wall, 2),
+        "ok": ok,
+        "errors": sorted({r["status"] for r in responses if r["status"] != 200}),
+        "latency_mean": round(sum(latencies) / len(latencies), 2),
+        "latency_max": round(latencies[-1], 2),
+        "jobs_per_minute": round(ok / wall * 60, 2),
+        # 1秒あたりに処理できた音声の秒数（1 を超えれば実時間より速い）
+        "audio_seconds_per_second": round(ok * fixture["seconds"] / wall, 3),
+        "peak_rss_mb": rss.mb,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    from app.services import chunked, engines, jobs, model_loader, summarizer
+
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "engine": engines.WHISPER_ENGINE,
+        "compute_type": engines.WHISPER_COMPUTE_TYPE,
+        "beam_size": engines.WHISPER_BEAM_SIZE,
+        "model": model_loader.WHISPER_MODEL_NAME,
+        "transcribe_mode": chunked.TRANSCRIBE_MODE,
+        "chunk_workers": chunked.CHUNK_WORKERS,
+        "job_workers": jobs.WHISPER_MAX_WORKERS,
+        "summary_concurrency": summarizer.MAX_CONCURRENCY,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="議事録作成全体のベンチマーク")
+    parser.add_argument(
+        "--lengths", type=int, nargs="+", default=audio_fixtures.DEFAULT_LENGTHS, help="音声の長さ（秒）"
+    )
+    parser.add_argument("--sample", type=Path, help="音声の元にする日本語の録音")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4], help="同時にアップロードする件数"
+    )
+    parser.add_argument(
+        "--concurrency-length", type=int, help="同時アップロードに使う音声の長さ（既定は一番短いもの）"
+    )
+    parser.add_argument("--latency", type=float, default=0.5, help="疑似サーバーの応答時間（秒）")
+    parser.add_argument(
+        "--token-interval", type=float, default=0.0, help="疑似サーバーが1文字ごとに待つ秒数"
+    )
+    parser.add_argument("--openai-port", type=int, default=8100)
+    parser.add_argument("--api-port", type=int, default=8200)
+    parser.add_argument("--output", type=Path, help="結果の JSON を保存するファイル")
+    args = parser.parse_args(argv)
+
+    # app を import する前に設定する（設定は import 時に読み込まれる）
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.openai_port}/v1"
+    os.environ["OPENAI_API_KEY"] = "dummy"
+    os.environ["WHISPER_CACHE_MAX_BYTES"] = "0"
+    pending = int(os.getenv("WHISPER_MAX_PENDING", 8))
+    os.environ["WHISPER_MAX_PENDING"] = str(max(pending, *args.concurrency))
+    from app.services import chunked, model_loader
+
+    fixtures = audio_fixtures.build(args.lengths, args.sample)
+    report = {"environment": environment(), "latency": args.latency, "stages": [], "concurrency": []}
+
+    with FakeOpenAIServer(args.openai_port, args.latency, args.token_interval):
+        # モデルの読み込みは測定に含めない
+        started = time.perf_counter()
+        if chunked.TRANSCRIBE_MODE == "chunked":
+            chunked.start_warm_up()
+            while chunked.status()["state"] == "loading":
+                time.sleep(0.5)
+        else:
+            model_loader.get_model()
+        report["environment"]["load_seconds"] = round(time.perf_counter() - started, 2)
+
+        for fixture in fixtures:
+            row = measure_stages(fixture)
+            report["stages"].append(row)
+            print(json.dumps(row, ensure_ascii=False), file=sys.stderr)
+
+        length = args.concurrency_length or min(args.lengths)
+        fixture = audio_fixtures.build([length], args.sample)[0]
+        with APIServer(args.api_port) as server:
+            for concurrency in args.concurrency:
+                row = measure_concurrency(server.url, fixture, concurrency)
+                report["concurrency"].append(row)
+                print(json.dumps(row, ensure_ascii=False), file=sys.stderr)
+
+    output = json.dumps(report, ensure_ascii=False, indent=4)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+備蓄一覧（frontend/modules/stock_table.py）の表を作る速さのベンチマーク。
+
+ランダムな備蓄品を --rows 件作り、次の時間を JSON で出力します（それぞれ --repeat 回の最小値）。
+
+    legacy : 以前の処理（1件ずつ strptime してリストを作り、Styler.apply(axis=1) で1行ずつ色付け）
+    build  : build_frame（pd.to_datetime と配列の引き算で残り日数を計算）
+    sort   : sort_frame（消費期限が近い順）
+    style  : style_frame（全件の色付けをまとめて計算）
+    filter : func.find_items で保管場所と消費期限を絞り込む（REGION_STORAGE_MODE のストレージで）
+
+色付けの時間は Styler が各セルの CSS を計算し終えるまでです（HTML などへの変換は含みません）。
+
+使い方（プロジェクトのルートで実行）:
+    python benchmarks/stock_bench.py --rows 100000
+    REGION_STORAGE_MODE=sqlite python benchmarks/stock_bench.py --output after.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "frontend"))
+
+LOCATIONS = [
+    "第一備蓄倉庫 棚A-1",
+    "第一備蓄倉庫 棚B-2",
+    "第二備蓄倉庫",
+    "防災センター 地下1階",
+    "公民館 倉庫",
+    "小学校 体育館倉庫",
+]
+NAMES = ["保存水 2L", "アルファ米", "乾パン", "毛布", "簡易トイレ", "乾電池 単3", "救急セット"]
+
+
+def make_items(rows: int, today: date, seed: int = 0) -> list[dict]:
+    """期限切れ・期限間近・消費期限なしを含む備蓄品を作ります。"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(1, rows + 1):
+        item = {
+            "id": i,
+            "品名": rng.choice(NAMES),
+            "格納場所": rng.choice(LOCATIONS),
+            "数量": rng.randint(1, 1000),
+            "単位": "個",
+            "保管日": (today - timedelta(days=rng.randint(0, 1000))).isoformat(),
+        }
+        # 5% は消費期限なし（毛布など）
+        if rng.random() >= 0.05:
+            item["消費期限"] = (today + timedelta(days=rng.randint(-365, 365 * 5))).isoformat()
+        items.append(item)
+    return items
+
+
+def legacy_styled(items: list[dict], today: date):
+    """以前の stock_list.show() と同じ処理。"""
+    data_for_df = []
+    for item in items:
+        exp_date_str = item.get("消費期限")
+        if exp_date_str:
+            exp_date_obj = datetime.strptime(exp_date_str, "%Y-%m-%d").date()
+            remaining_days = abs((exp_date_obj - today).days)
+        else:
+            remaining_days = -1
+        data_for_df.append(
+            {
+                "物品名": item.get("品名"),
+                "数量": item.get("数量"),
+                "消費期限": exp_date_str,
+                "残り消費期限（日）": remaining_days,
+                "保管場所": item.get("格納場所"),
+            }
+        )
+    df = pd.DataFrame(data_for_df)
+
+    def highlight_expired(row):
+        return ["color: red" if row["残り消費期限（日）"] <= 30 else "" for _ in row]
+
+    return df.style.apply(highlight_expired, axis=1)
+
+
+def _compute(styler) -> None:
+    # 描画の前に行われる CSS の計算だけを実行する
+    styler._compute()
+
+
+def best_of(repeat: int, function) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return round(min(times), 4)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="備蓄一覧の表を作る速さのベンチマーク")
+    parser.add_argument("--rows", type=int, default=100_000, help="備蓄品の件数")
+    parser.add_argument("--repeat", type=int, default=3, help="測定の回数（最小値を使う）")
+    parser.add_argument("--skip-legacy", action="store_true", help="以前の処理を測らない")
+    parser.add_argument("--output", type=Path, help="結果の JSON を保存するファイル")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # func の設定は import 時に読み込まれるので、先にデータベースの場所を決める
+        os.environ.setdefault("REGION_SQLITE_PATH", str(Path(tmp) / "bench.sqlite3"))
+        from modules import stock_table
+        from region_project.storage import func
+
+        today = date.today()
+        items = make_items(args.rows, today)
+        file_path = Path(tmp) / "stock_data.json"
+        func.save_data(file_path, items)
+        items = func.load_data(file_path)
+
+        report = {
+            "rows": args.rows,
+            "storage_mode": func.STORAGE_MODE,
+            "pandas": pd.__version__,
+            "seconds": {},
+        }
+        seconds = report["seconds"]
+        if not args.skip_legacy:
+            seconds["legacy"] = best_of(args.repeat, lambda: _compute(legacy_styled(items, today)))
+
+        frame = stock_table.build_frame(items, today)
+        seconds["build"] = best_of(args.repeat, lambda: stock_table.build_frame(items, today))
+        seconds["sort"] = best_of(args.repeat, lambda: stock_table.sort_frame(frame, "expiry"))
+        seconds["style"] = best_of(args.repeat, lambda: _compute(stock_table.style_frame(frame)))
+        seconds["total"] = round(seconds["build"] + seconds["sort"] + seconds["style"], 4)
+        if "legacy" in seconds:
+            report["speedup"] = round(seconds["legacy"] / seconds["total"], 1)
+
+        location = LOCATIONS[0]
+        high = (today + timedelta(days=stock_table.WARN_DAYS)).isoformat()
+        seconds["filter"] = best_of(
+            args.repeat,
+            lambda: func.find_items(file_path, {"格納場所": location}, {"消費期限": (None, high)}),
+        )
+        report["counts"] = {
+            "expired": int((frame[stock_table.REMAINING] < 0).sum()),
+            "within_warn_days": int((frame[stock_table.REMAINING] <= stock_table.WARN_DAYS).sum()),
+            "no_expiry": int(frame[stock_table.REMAINING].isna().sum()),
+        }
+
+    output = json.dumps(report, ensure_ascii=False, indent=4)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+校正・要約（map-reduce）の速度比較。
+
+疑似の OpenAI サーバー（fake_openai.py）を起動し、長い文字起こしを
+同時実行数を変えて処理したときの時間とリクエスト数を JSON で出力します。
+
+使い方（プロジェクトのルートで実行）:
+    python benchmarks/summarize_bench.py --chars 60000 --latency 0.5 --concurrency 1 4 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from fake_openai import FakeOpenAIServer  # noqa: E402
+
+SAMPLE_SENTENCES = [
+    "えーと今日は夏祭りの準備について話し合いたいと思います",
+    "テントの数は去年と同じで十張りあれば足りると思います",
+    "ゴミの分別ルールを回覧板で周知しておきましょう",
+    "防災倉庫の水は来月で期限が切れるので入れ替えが必要です",
+    "会計報告は次回の役員会までにまとめておきます",
+]
+
+
+def make_transcript(chars: int) -> str:
+    """Whisper の日本語出力に近い、句点の少ない長い文字起こしを作ります。"""
+    parts = []
+    total = 0
+    i = 0
+    while total < chars:
+        sentence = SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]
+        parts.append(sentence + ("。" if i % 3 == 0 else " "))
+        total += len(parts[-1])
+        i += 1
+    return "".join(parts)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="校正・要約の速度比較")
+    parser.add_argument("--chars", type=int, default=60000, help="文字起こしの文字数")
+    parser.add_argument("--latency", type=float, default=0.5, help="疑似サーバーの応答時間（秒）")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--output", type=Path, help="結果の JSON を保存するファイル")
+    args = parser.parse_args(argv)
+
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.port}/v1"
+    os.environ["OPENAI_API_KEY"] = "dummy"
+    from app.services import summarizer
+
+    text = make_transcript(args.chars)
+    chunks = summarizer.split_text(text)
+    results = []
+    with FakeOpenAIServer(args.port, args.latency) as server:
+        for concurrency in args.concurrency:
+            summarizer.MAX_CONCURRENCY = concurrency
+            server.reset_stats()
+            started = time.perf_counter()
+            result = summarizer.correct_and_summarize(text)
+            elapsed = time.perf_counter() - started
+            row = {
+                "concurrency": concurrency,
+                "chars": len(text),
+                "chunks": len(chunks),
+                "seconds": round(elapsed, 2),
+                **server.stats(),
+                "full_text_chars": len(result["full_text"]),
+                "summary_lines": len(result["summary"].splitlines()),
+            }
+            results.append(row)
+            print(json.dumps(row, ensure_ascii=False), file=sys.stderr)
+
+    report = json.dumps(results, ensure_ascii=False, indent=4)
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+文字起こしの速度比較（1回で処理 / 区間に分けて並列処理）。
+
+音声ファイルごとに、音声の長さ・処理時間・RTF（処理時間 / 音声の長さ）と
+並列処理による速度向上を JSON で出力します。
+
+使い方（プロジェクトのルートで実行）:
+    python benchmarks/transcribe_rtf.py recording.m4a [other.wav ...] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="文字起こしの速度比較")
+    parser.add_argument("files", nargs="+", type=Path, help="音声ファイル")
+    parser.add_argument("--workers", type=int, help="並列処理のワーカー数")
+    parser.add_argument(
+        "--skip-single", action="store_true", help="1回で処理する方を測らない"
+    )
+    parser.add_argument("--output", type=Path, help="結果の JSON を保存するファイル")
+    args = parser.parse_args(argv)
+
+    if args.workers:
+        os.environ["WHISPER_CHUNK_WORKERS"] = str(args.workers)
+    from app.services import chunked, model_loader
+
+    results = []
+    try:
+        # モデルの読み込み時間は測定に含めない。ワーカーの読み込みと1回で処理する方の測定が
+        # 重ならないよう、どちらのモデルも読み込み終わってから測り始める
+        if not args.skip_single:
+            model = model_loader.get_model()
+        chunked.start_warm_up()
+        while chunked.status()["state"] == "loading":
+            time.sleep(0.5)
+
+        for path in args.files:
+            audio = chunked.load_audio(str(path))
+            duration = len(audio) / chunked.SAMPLE_RATE
+            row = {"file": str(path), "duration": round(duration, 2)}
+
+            if not args.skip_single:
+                started = time.perf_counter()
+                model.transcribe(audio)
+                elapsed = time.perf_counter() - started
+                row["single"] = {"seconds": round(elapsed, 2), "rtf": round(elapsed / duration, 3)}
+
+            started = time.perf_counter()
+            chunks = len(chunked.split_audio(audio, chunked.CHUNK_WORKERS))
+            chunked.transcribe_audio(audio)
+            elapsed = time.perf_counter() - started
+            row["chunked"] = {
+                "seconds": round(elapsed, 2),
+                "rtf": round(elapsed / duration, 3),
+                "workers": chunked.CHUNK_WORKERS,
+                "chunks": chunks,
+            }
+            if "single" in row:
+                row["speedup"] = round(row["single"]["seconds"] / elapsed, 2)
+            results.append(row)
+            print(json.dumps(row, ensure_ascii=False), file=sys.stderr)
+    finally:
+        chunked.shutdown()
+
+    report = json.dumps(results, ensure_ascii=False, indent=4)
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,8 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, date, time
 from pathlib import Path
-from . import func
+from region_project.storage import func
+from . import page_cache
 
 # --- ファイルパス定義 ---
 Path(__file__).resolve().parent.parent  # admin_page.pyがpages/にある場合など
@@ -15,13 +15,14 @@ FINANCES_FILE = BASE_DIR / "backend/app/db/finances.json"
 
 
 # --- 共通ヘルパー関数 ---
-def display_table(data):
+def display_table(file_path):
     """データがない場合はメッセージを表示し、ある場合はテーブルを表示"""
-    if not data:
+    # DataFrame はデータが変わるまで使い回す（ウィジェットの操作のたびに作り直さない）
+    df = page_cache.collection_frame(file_path)
+    if df.empty:
         st.info("データがありません。")
     else:
         # ID を含めて表示（編集/削除時に参照しやすくするため）
-        df = pd.DataFrame(data)
         st.dataframe(df)  # st.table より st.dataframe の方が見やすい場合がある
 
 
@@ -80,7 +81,7 @@ def show():
     with st.expander("📋 回覧板管理", expanded=False):
         boards_data = func.load_data(KAIRANBAN_FILE)
         st.subheader("回覧板一覧")
-        display_table(boards_data)
+        display_table(KAIRANBAN_FILE)
 
         st.subheader("新規作成")
         with st.form("create_board", clear_on_submit=True):
@@ -157,7 +158,7 @@ def show():
     with st.expander("🗓️ イベントカレンダー管理", expanded=False):
         events_data = func.load_data(EVENT_FILE)
         st.subheader("イベント一覧")
-        display_table(events_data)
+        display_table(EVENT_FILE)
 
         st.subheader("新規追加")
         with st.form("create_event", clear_on_submit=True):
@@ -249,7 +250,7 @@ def show():
     with st.expander("📦 備蓄在庫管理", expanded=False):
         stocks_data = func.load_data(STOCK_FILE)
         st.subheader("在庫一覧")
-        display_table(stocks_data)
+        display_table(STOCK_FILE)
 
         st.subheader("新規登録")
         with st.form("create_stock", clear_on_submit=True):
@@ -345,7 +346,7 @@ def show():
     with st.expander("📝 議事録管理", expanded=False):
         minutes_data = func.load_data(MINUTES_FILE)
         st.subheader("議事録一覧")
-        display_table(minutes_data)
+        display_table(MINUTES_FILE)
 
         st.subheader("新規作成")
         with st.form("create_minutes", clear_on_submit=True):
@@ -402,7 +403,7 @@ def show():
     with st.expander("💰 会計情報管理", expanded=False):
         finances_data = func.load_data(FINANCES_FILE)
         st.subheader("会計情報一覧")
-        display_table(finances_data)
+        display_table(FINANCES_FILE)
 
         st.subheader("新規登録")
         with st.form("create_finance", clear_on_submit=True):
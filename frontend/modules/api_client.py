@@ -0,0 +1,186 @@
+"""
+バックエンド（FastAPI）への接続をまとめたクライアント。
+
+Streamlit は操作のたびにページを再実行するため、毎回 requests.get などで接続し直すと
+そのたびに TCP の接続からやり直しになります。ここではプロセス全体で1つの
+requests.Session（keep-alive の接続プール）を使い回し、タイムアウトを必ず付けます。
+
+    - GET / PUT / DELETE（何度送っても結果が同じもの）は、接続エラーや 502/503/504 のときに
+      待ち時間を2倍ずつ延ばしながら再試行します（POST は再試行しません）
+    - get_json の結果は CACHE_SECONDS 秒だけ覚えておき、同じ GET を繰り返しません
+      （GET 以外のリクエストを送ると、覚えている結果はすべて確認し直します。このプロセスから
+      func で直接書き込んだ場合は、そのコレクションの結果を捨てます）
+    - それより古い結果も ETag と一緒に残しておき、If-None-Match 付きで問い合わせます。
+      データが変わっていなければ 304（本文なし）が返るので、残しておいた結果を使います
+
+環境変数:
+    REGION_BACKEND_URL           : バックエンドの URL（既定は http://127.0.0.1:8000）
+    REGION_BACKEND_TIMEOUT       : 応答を待つ秒数（既定は 30）
+    REGION_BACKEND_RETRIES       : 再試行の回数（既定は 3）
+    REGION_BACKEND_CACHE_SECONDS : GET の結果を覚えておく秒数（既定は 10, 0 で無効）
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from region_project.storage import func
+
+BACKEND_URL = os.getenv("REGION_BACKEND_URL", "http://127.0.0.1:8000").rstrip("/")
+# 接続の確立を待つ秒数と、応答を待つ秒数
+CONNECT_TIMEOUT = 3
+READ_TIMEOUT = float(os.getenv("REGION_BACKEND_TIMEOUT", 30))
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+MAX_RETRIES = int(os.getenv("REGION_BACKEND_RETRIES", 3))
+# 再試行の最初の待ち時間（秒, 再試行ごとに2倍）
+RETRY_BACKOFF = 0.5
+CACHE_SECONDS = float(os.getenv("REGION_BACKEND_CACHE_SECONDS", 10))
+# キャッシュしておく GET の数（古いものから消す）
+CACHE_MAX_ENTRIES = 128
+# 接続プールの大きさ（Streamlit のセッションごとのスレッドから同時に使われる）
+POOL_SIZE = 16
+# コレクションのファイル名（拡張子を除く） -> バックエンドのパス
+COLLECTION_PATHS = {
+    "kairanban": "/kairanban",
+    "event": "/events",
+    "stock_data": "/stock",
+    "minutes": "/minutes",
+    "finances": "/finances",
+}
+
+# 再試行するか -> Session
+_sessions: dict[bool, requests.Session] = {}
+_session_lock = threading.Lock()
+# (パス, パラメーター) -> (期限, ETag, JSON)
+_cache: OrderedDict[tuple, tuple[float, str | None, object]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def url(path: str) -> str:
+    """バックエンドのパス（/events など）を URL にします。"""
+    return f"{BACKEND_URL}/{path.lstrip('/')}"
+
+
+def get_session(retry: bool = True) -> requests.Session:
+    """
+    プロセス全体で共有する Session を返します（最初の呼び出しで作ります）。
+    retry=False の Session は失敗してもすぐに例外にします（代わりの処理がある呼び出し向け）。
+    """
+    with _session_lock:
+        if retry not in _sessions:
+            retries = Retry(
+                total=MAX_RETRIES if retry else 0,
+                backoff_factor=RETRY_BACKOFF,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}),
+                # 再試行しても失敗した場合は、例外ではなく最後の応答を返す
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retries
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[retry] = session
+        return _sessions[retry]
+
+
+def request(method: str, path: str, retry: bool = True, **kwargs) -> requests.Response:
+    """
+    バックエンドにリクエストを送ります。timeout を省略すると DEFAULT_TIMEOUT を使います。
+    接続できない場合などは requests.exceptions.RequestException（retry=False なら再試行しません）。
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    if method.upper() != "GET":
+        # 変更を送ったら、古い内容を返さないように次回は必ず確認させる
+        _expire_cache()
+    return get_session(retry).request(method, url(path), **kwargs)
+
+
+def get(path: str, **kwargs) -> requests.Response:
+    return request("GET", path, **kwargs)
+
+
+def post(path: str, **kwargs) -> requests.Response:
+    return request("POST", path, **kwargs)
+
+
+def delete(path: str, **kwargs) -> requests.Response:
+    return request("DELETE", path, **kwargs)
+
+
+def get_json(
+    path: str,
+    params: dict | None = None,
+    cache_seconds: float = CACHE_SECONDS,
+    retry: bool = True,
+):
+    """
+    GET の結果（JSON）を返します。エラーの応答は requests.exceptions.HTTPError。
+    cache_seconds 秒以内に同じパス・パラメーターで取得していれば、問い合わせずにその結果を返します。
+    それより前に取得した結果は ETag で変わっていないか確認し、変わっていなければ再利用します。
+    """
+    key = (path, tuple(sorted((params or {}).items())))
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+    if entry is not None and cache_seconds > 0 and entry[0] > now:
+        # 呼び出し側が書き換えてもキャッシュに影響しないようにコピーを返す
+        return copy.deepcopy(entry[2])
+
+    headers = {}
+    if entry is not None and entry[1]:
+        headers["If-None-Match"] = entry[1]
+    response = get(path, params=params, headers=headers, retry=retry)
+    if response.status_code == 304 and entry is not None:
+        etag, data = entry[1], entry[2]
+    else:
+        response.raise_for_status()
+        etag, data = response.headers.get("ETag"), response.json()
+    if cache_seconds > 0 or etag:
+        with _cache_lock:
+            _cache[key] = (now + cache_seconds, etag, data)
+            _cache.move_to_end(key)
+            while len(_cache) > CACHE_MAX_ENTRIES:
+                _cache.popitem(last=False)
+        return copy.deepcopy(data)
+    return data
+
+
+def _expire_cache() -> None:
+    with _cache_lock:
+        for key, (_, etag, data) in _cache.items():
+            _cache[key] = (0.0, etag, data)
+
+
+def clear_cache(path: str | None = None) -> None:
+    """覚えている GET の結果を捨てます。path を指定すると、そのパスとその下のものだけを捨てます。"""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+            return
+        path = "/" + path.strip("/")
+        for key in list(_cache):
+            cached = "/" + key[0].strip("/")
+            if cached == path or cached.startswith(path + "/"):
+                del _cache[key]
+
+
+def _on_write(file_path: Path) -> None:
+    # 同じプロセスからの書き込みは API を通らないので、そのコレクションの結果をここで捨てる
+    path = COLLECTION_PATHS.get(Path(file_path).stem)
+    if path is not None:
+        clear_cache(path)
+
+
+func.add_write_listener(_on_write)
@@ -1,13 +1,45 @@
 import streamlit as st
+import requests
 from streamlit_calendar import calendar
-from .func import load_data
+from . import api_client
+from region_project.storage.event_index import get_index
 from pathlib import Path
-from datetime import datetime
+from datetime import date, timedelta
 
 # ファイルパス
 BASE_DIR = Path(__file__).resolve().parents[2]  # プロジェクトのルートを指す
 file_path = BASE_DIR / "backend/app/db/event.json"
 
+# --- バックエンドのパス（接続先は api_client.BACKEND_URL） ---
+EVENTS_PATH = "/events"
+
+# 表示中の週の前後に先読みしておく日数
+PREFETCH_DAYS = 7
+WEEK = timedelta(days=7)
+
+
+def _current_week(today: date) -> tuple[date, date]:
+    """timeGridWeek の初期表示（日曜始まりの今週）の期間を返します。"""
+    start = today - timedelta(days=(today.weekday() + 1) % 7)
+    return start, start + WEEK
+
+
+def fetch_events(start: date, end: date) -> list[dict]:
+    """
+    start 以上 end 未満の期間にかかるイベントだけを取得します。
+    バックエンドに接続できない場合はローカルのインデックスから探します
+    （代わりがあるので再試行で待たずにすぐ切り替えます）。
+    """
+    try:
+        return api_client.get_json(
+            EVENTS_PATH,
+            params={"start": start.isoformat(), "end": end.isoformat()},
+            retry=False,
+        )
+    except requests.exceptions.RequestException:
+        index = get_index(file_path)
+        return [ev for ev, _, _ in index.between(start, end - timedelta(days=1))]
+
 
 def show():
     st.title("📅 カレンダー")
@@ -15,36 +47,56 @@ def show():
 
     st.markdown("---")
 
-    # JSONからイベント情報を読み込む
-    events = load_data(file_path)
+    # 表示する週（streamlit-calendar は表示中の期間を返さないので、週の移動はこちらのボタンで行う）
+    if "calendar_visible" not in st.session_state:
+        st.session_state.calendar_visible = _current_week(date.today())
+
+    col_prev, col_today, col_next = st.columns([1, 1, 1])
+    if col_prev.button("◀ 前の週", use_container_width=True):
+        start, end = st.session_state.calendar_visible
+        st.session_state.calendar_visible = (start - WEEK, end - WEEK)
+    if col_today.button("今週", use_container_width=True):
+        st.session_state.calendar_visible = _current_week(date.today())
+    if col_next.button("次の週 ▶", use_container_width=True):
+        start, end = st.session_state.calendar_visible
+        st.session_state.calendar_visible = (start + WEEK, end + WEEK)
+    visible_start, visible_end = st.session_state.calendar_visible
+
+    # 表示中の期間＋先読み分のイベントだけを読み込む
+    window = (
+        visible_start - timedelta(days=PREFETCH_DAYS),
+        visible_end + timedelta(days=PREFETCH_DAYS),
+    )
+    events = fetch_events(*window)
 
     # カレンダー表示設定
     calendar_options = {
         "initialView": "timeGridWeek",
+        "initialDate": visible_start.isoformat(),
         "slotMinTime": "07:00:00",  # 朝7時から表示
         "slotMaxTime": "19:00:00",  # 夜7時まで表示
         "allDaySlot": False,  # all-dayスロットを表示しない
         "editable": False,
-        "headerToolbar": {"left": "prev", "center": "today", "right": "next"},
+        # 週の移動は上のボタンで行う（カレンダー内で移動すると読み込んだ範囲から外れるため）
+        "headerToolbar": {"left": "", "center": "title", "right": ""},
         "locale": "en",
         "height": 600,
     }
 
-    # カレンダーを描画
-    calendar(events=events, options=calendar_options)
+    # カレンダーを描画（週ごとに key を変え、initialDate の週で描き直させる）
+    calendar(
+        events=events,
+        options=calendar_options,
+        key=f"event_calendar_{visible_start.isoformat()}",
+    )
 
     st.markdown("---")
 
     # 日付選択UI
     selected_date = st.date_input("確認したいイベントの日付を選んでください")
 
-    # 該当日付のイベントを抽出
-    matched = []
-    for ev in events:
-        start_dt = datetime.fromisoformat(ev["start"])
-        end_dt = datetime.fromisoformat(ev["end"])
-        if start_dt.date() <= selected_date <= end_dt.date():
-            matched.append((ev, start_dt, end_dt))
+    # 該当日付のイベントを抽出（パース済みの区間インデックスから検索）
+    matched = get_index(file_path).on_date(selected_date)
 
     st.subheader(f"{selected_date} のイベント")
 
@@ -5,13 +5,13 @@ from datetime import date
 import random
 
 
-def show():
-    st.title("📊 収支報告")
-    st.write("町内会費の収支状況を確認できます。")
-
+# 集計結果は日付が変わるまで使い回す（月を選び直すたびに作り直さない）
+@st.cache_data(max_entries=2, show_spinner=False)
+def build_report(today: date) -> tuple[pd.DataFrame, dict[str, pd.DataFrame]]:
+    """(月別収支の表, 月 -> 支出内訳の表) を返します。"""
     # ダミーデータ生成：過去12ヶ月の月別収支
     months = (
-        pd.date_range(end=date.today(), periods=12, freq="M").strftime("%Y-%m").tolist()
+        pd.date_range(end=today, periods=12, freq="M").strftime("%Y-%m").tolist()
     )
     incomes = [random.randint(50_000, 150_000) for _ in months]  # 収入
     expenses = [random.randint(30_000, 120_000) for _ in months]  # 支出
@@ -28,6 +28,30 @@ def show():
         }
     )
 
+    # —— 支出内訳の生成 —— #
+    categories = ["備品購入", "交通費", "会場費", "通信費", "その他"]
+    breakdowns = {}
+    for month, exp in zip(months, expenses):
+        weights = np.random.rand(len(categories))
+        values = (weights / weights.sum() * exp).round().astype(int)
+        # 選択月の支出内訳をDataFrame化
+        breakdowns[month] = (
+            pd.DataFrame.from_dict(
+                dict(zip(categories, values)), orient="index", columns=["支出（円）"]
+            )
+            .rename_axis("カテゴリ")
+            .reset_index()
+        )
+    return df, breakdowns
+
+
+def show():
+    st.title("📊 収支報告")
+    st.write("町内会費の収支状況を確認できます。")
+
+    df, breakdowns = build_report(date.today())
+    months = df["月"].tolist()
+
     # テーブル表示
     st.subheader("月別収支一覧")
     st.dataframe(df)
@@ -40,25 +64,9 @@ def show():
     st.subheader("残高推移")
     st.line_chart(df.set_index("月")["残高（円）"])
 
-    # —— 支出内訳の生成 —— #
-    categories = ["備品購入", "交通費", "会場費", "通信費", "その他"]
-    breakdown_data = {}
-    for month, exp in zip(months, expenses):
-        weights = np.random.rand(len(categories))
-        values = (weights / weights.sum() * exp).round().astype(int)
-        breakdown_data[month] = dict(zip(categories, values))
-
     # ユーザーに表示する月を選択させる
     selected_month = st.selectbox("▶ 支出内訳を表示する月を選択", months)
-
-    # 選択月の支出内訳をDataFrame化
-    breakdown_df = (
-        pd.DataFrame.from_dict(
-            breakdown_data[selected_month], orient="index", columns=["支出（円）"]
-        )
-        .rename_axis("カテゴリ")
-        .reset_index()
-    )
+    breakdown_df = breakdowns[selected_month]
 
     # 支出内訳表示
     st.subheader(f"{selected_month} の支出内訳")
@@ -1,6 +1,6 @@
 import streamlit as st
 from pathlib import Path
-from .func import load_data, update_item
+from region_project.storage.func import load_data, update_item
 
 # ファイルパス
 BASE_DIR = Path(__file__).resolve().parents[2]  # プロジェクトのルートを指す
@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from . import api_client
 
 
 def show(id):
@@ -10,10 +10,8 @@ def show(id):
         return
 
     try:
-        res = requests.get(f"http://localhost:8000/kairanban/{id}")
-        res.raise_for_status()
-        data = res.json()
+        data = api_client.get_json(f"/kairanban/{id}")
         st.markdown(f"### タイトル: {data['title']}")
-        st.write(f"内容: {data['body']}")
+        st.write(f"内容: {data['detail']}")
     except Exception as e:
         st.error(f"データ取得に失敗しました: {e}")
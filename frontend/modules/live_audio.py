@@ -0,0 +1,151 @@
+"""
+録音しながらの文字起こし（ライブモード）のクライアント。
+
+WebRTC から届く音声フレームを 16kHz モノラルの 16bit PCM に変換してためておき、
+バックグラウンドのスレッドで数秒ごとにバックエンド（/whisper/live）へ送ります。
+送れなかった分は次の送信（CHUNK_SECONDS 秒後）で順番通りに再送します（サーバーは seq で重複を無視します）。
+バックエンドに長くつながらない場合は、送信待ちが MAX_BACKLOG_SECONDS 秒分を超えた時点で
+古いものから捨て、捨てた秒数を dropped_seconds に記録します（メモリを使い続けないように）。
+"""
+
+import threading
+import time
+from collections import deque
+
+import av
+import requests
+
+from . import api_client
+
+LIVE_PATH = "/whisper/live"
+# 音声を送る間隔（秒）
+CHUNK_SECONDS = 5
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+# 送信待ちにためておく音声の上限（秒, 約 19MB）
+MAX_BACKLOG_SECONDS = 600
+# 録音の終了時に残りを送る回数と、その間の待ち時間（秒）
+FINISH_ATTEMPTS = 3
+FINISH_RETRY_SECONDS = 1.0
+
+
+class LiveUploader:
+    def __init__(self, base_url: str | None = None, chunk_seconds: float = CHUNK_SECONDS):
+        self.base_url = base_url or api_client.url(LIVE_PATH)
+        self.chunk_seconds = chunk_seconds
+        self.session_id: str | None = None
+        self.error: str | None = None
+        self.sent_bytes = 0
+        # 送信できずに捨てた音声の秒数
+        self.dropped_seconds = 0.0
+        self._buffer = bytearray()
+        self._unsent: deque[tuple[int, bytes]] = deque()
+        self._unsent_bytes = 0
+        self._next_seq = 0
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+        # 接続はバックエンドへの他のリクエストと共有する（api_client の接続プール）
+        self._session = api_client.get_session()
+
+    def start(self) -> None:
+        """録音セッションを作り、送信用のスレッドを開始します。"""
+        response = self._session.post(self.base_url, timeout=10)
+        response.raise_for_status()
+        self.session_id = response.json()["session_id"]
+        self._thread = threading.Thread(target=self._run, name="live-uploader", daemon=True)
+        self._thread.start()
+
+    def add_frame(self, frame: av.AudioFrame) -> av.AudioFrame:
+        """WebRTC の audio_frame_callback から呼ばれます（WebRTC のスレッドで実行されます）。"""
+        pcm = b"".join(
+            resampled.to_ndarray().tobytes() for resampled in self._resampler.resample(frame)
+        )
+        with self._lock:
+            self._buffer.extend(pcm)
+        return frame
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.chunk_seconds):
+            self._flush()
+
+    def _flush(self) -> None:
+        # ためた音声に番号を付けて送信待ちに並べ、古いものから順に送る
+        with self._lock:
+            if self._buffer:
+                self._unsent.append((self._next_seq, bytes(self._buffer)))
+                self._unsent_bytes += len(self._buffer)
+                self._next_seq += 1
+                self._buffer.clear()
+        with self._send_lock:
+            # 上限を超えた分は古いものから捨てる（最新の1区間は残す）
+            limit = MAX_BACKLOG_SECONDS * BYTES_PER_SECOND
+            while len(self._unsent) > 1 and self._unsent_bytes > limit:
+                _, pcm = self._unsent.popleft()
+                self._unsent_bytes -= len(pcm)
+                self.dropped_seconds += len(pcm) / BYTES_PER_SECOND
+            while self._unsent:
+                seq, pcm = self._unsent[0]
+                if not self._post_chunk(seq, pcm):
+                    return
+                self._unsent.popleft()
+                self._unsent_bytes -= len(pcm)
+                self.sent_bytes += len(pcm)
+
+    def _post_chunk(self, seq: int, pcm: bytes) -> bool:
+        # 失敗しても待たずに戻り、次の送信でもう一度送る
+        try:
+            response = self._session.post(
+                f"{self.base_url}/{self.session_id}/chunks",
+                params={"seq": seq},
+                data=pcm,
+                headers={"Content-Type": "application/octet-stream"},
+                timeout=10,
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            self.error = str(e)
+            return False
+        self.error = None
+        return True
+
+    def transcript(self, offset: int = 0) -> dict:
+        """ここまでの文字起こし（offset 番目以降のセグメント）を取得します。"""
+        response = self._session.get(
+            f"{self.base_url}/{self.session_id}", params={"offset": offset}, timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def finish(self) -> dict:
+        """
+        送信用のスレッドを止めて残りの音声を送り、録音を終了します。
+        要約のジョブ（/whisper/jobs の形式）を返します。
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for attempt in range(FINISH_ATTEMPTS):
+            if attempt:
+                time.sleep(FINISH_RETRY_SECONDS)
+            self._flush()
+            if not self._unsent:
+                break
+        if self._unsent:
+            raise requests.exceptions.ConnectionError(
+                f"音声の一部を送信できませんでした: {self.error}"
+            )
+        response = self._session.post(f"{self.base_url}/{self.session_id}/finish", timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def discard(self) -> None:
+        """送信を止め、サーバー側のセッションも破棄します。"""
+        self._stop.set()
+        if self.session_id is not None:
+            try:
+                self._session.delete(f"{self.base_url}/{self.session_id}", timeout=10)
+            except requests.exceptions.RequestException:
+                pass
@@ -1,18 +1,32 @@
 import streamlit as st
 import requests
-from io import BytesIO
+import json
 from streamlit_webrtc import webrtc_streamer, WebRtcMode
-import av
-import threading
-import queue
+import time
+from . import api_client
+from .live_audio import LiveUploader
+from .recording import FILE_NAME, RecordingBuffer, compress_audio
 
-# --- バックエンドのURL ---
+# --- バックエンドのパス（接続先は api_client.BACKEND_URL） ---
 # main.pyで /whisper に変更したのを反映
-BACKEND_URL = "http://127.0.0.1:8000/whisper/process-audio/"
+# 音声を登録してジョブIDを受け取り、途中経過を受け取るためのパス
+JOBS_PATH = "/whisper/jobs"
+# 音声の送信を待つ秒数
+UPLOAD_TIMEOUT = 120
+# 途中経過の受信のタイムアウト（接続, 受信の間隔）。サーバーは15秒ごとに ping を送る
+EVENTS_TIMEOUT = (5, 60)
+# ライブモードで録音中の文字起こしを取得し直す間隔（秒）
+LIVE_REFRESH_SECONDS = 3
 
-# --- 音声フレームを安全に受け渡すための箱 ---
-# この箱（キュー）を使うのが、すれ違いを防ぐための大事なポイントだよ！
-frames_queue = queue.Queue()
+# バックエンドの処理段階の表示名
+STAGE_LABELS = {
+    "queued": "順番待ち中…",
+    "decoding": "音声を読み込み中…",
+    "transcribing": "文字起こし中…",
+    "correcting": "文章を校正中…",
+    "summarizing": "要約を作成中…",
+    "done": "完了しました",
+}
 
 
 def show():
@@ -97,25 +111,40 @@ def show():
     st.subheader("🎤 音声から議事録を自動生成")
 
     # セッション状態の初期化
+    # audio_buffer は録音し終えたデータ、recorder は次の録音を受け取るバッファ（どちらもセッションごと）
     if "audio_buffer" not in st.session_state:
         st.session_state.audio_buffer = None
+    if "recorder" not in st.session_state:
+        st.session_state.recorder = RecordingBuffer()
     if "uploaded_file_info" not in st.session_state:
         st.session_state.uploaded_file_info = None
+    recorder = st.session_state.recorder
+
+    # ライブモードでは録音中に音声を少しずつ送り、その場で文字起こしする
+    live_mode = st.toggle("録音しながら文字起こしする（ライブ）", key="live_mode")
+    if live_mode and "live_uploader" not in st.session_state:
+        st.session_state.live_uploader = LiveUploader()
+    uploader = st.session_state.get("live_uploader")
 
     # WebRTCコンポーネントの配置
     webrtc_ctx = webrtc_streamer(
         key="audio-recorder",
         mode=WebRtcMode.SENDONLY,
-        audio_frame_callback=lambda frame: frames_queue.put(frame),
+        audio_frame_callback=(
+            uploader.add_frame if live_mode else recorder.add_frame
+        ),
         media_stream_constraints={"audio": True, "video": False},
     )
 
-    # 録音停止時の処理
-    if not webrtc_ctx.state.playing and not frames_queue.empty():
-        audio_frames = []
-        while not frames_queue.empty():
-            audio_frames.append(frames_queue.get())
-        st.session_state.audio_buffer = audio_frames
+    if live_mode:
+        show_live(webrtc_ctx, uploader)
+
+    # 録音停止時の処理（録音済みのバッファを確定し、次の録音用に新しいバッファを用意する）
+    if not webrtc_ctx.state.playing and recorder.seconds > 0:
+        recorder.finish()
+        _discard_recording()
+        st.session_state.audio_buffer = recorder
+        st.session_state.recorder = RecordingBuffer()
         st.session_state.uploaded_file_info = None
         st.rerun()
 
@@ -142,7 +171,7 @@ def show():
                 "data": uploaded_file.read()
             }
             # 競合しないように録音データはクリア
-            st.session_state.audio_buffer = None
+            _discard_recording()
             # ★★★ 問題の原因だった st.rerun() を削除しました ★★★
             # これにより、1回の実行で状態の保存とUIの更新が完結します。
 
@@ -162,7 +191,11 @@ def show():
     # 次に、録音データを確認
     elif st.session_state.audio_buffer:
         audio_data_source = "record"
-        st.success("録音データが準備完了しました。")
+        recorded = st.session_state.audio_buffer
+        st.success(
+            f"録音データ（{_format_time(recorded.seconds)}, "
+            f"{recorded.size / 1024:,.0f} KB）が準備完了しました。"
+        )
     
     # データソースの有無によってボタンの有効/無効を決定
     is_disabled = not bool(audio_data_source)
@@ -172,32 +205,28 @@ def show():
     # 「要約を生成」ボタン
     if st.button("要約を生成", disabled=is_disabled):
         audio_data = None
+        file_name = FILE_NAME
+        # 送信サイズの表示は今回のジョブのものだけにする（録音を送る場合は表示しない）
+        st.session_state.upload_report = None
         if audio_data_source == "upload":
-            audio_data = st.session_state.uploaded_file_info['data']
+            audio_data, file_name = prepare_upload(st.session_state.uploaded_file_info)
         elif audio_data_source == "record":
-            with st.spinner("録音データを変換中..."):
-                audio_frames = st.session_state.audio_buffer
-                output_bytesio = BytesIO()
-                with av.open(output_bytesio, mode="w", format="mp4") as container:
-                    stream = container.add_stream("aac", rate=48000)
-                    for frame in audio_frames:
-                        for packet in stream.encode(frame):
-                            container.mux(packet)
-                    for packet in stream.encode(None):
-                        container.mux(packet)
-                output_bytesio.seek(0)
-                audio_data = output_bytesio.read()
+            # 録音中に 16kHz モノラルの Opus に変換済みなので、そのまま送る
+            audio_data = st.session_state.audio_buffer.read()
         
         if audio_data:
-            with st.spinner("AIが議事録を作成中…"):
+            with st.spinner("音声を送信中…"):
                 try:
-                    files = {"audio_file": ("uploaded_file", audio_data)}
-                    response = requests.post(BACKEND_URL, files=files, timeout=600)
-                    if response.status_code == 200:
-                        result = response.json()
-                        st.session_state.full_text = result.get("full_text")
-                        st.session_state.summary = result.get("summary")
-                        st.session_state.audio_buffer = None 
+                    files = {"audio_file": (file_name, audio_data)}
+                    # ジョブIDがすぐに返ってくるので、結果は下で問い合わせる
+                    response = api_client.post(
+                        JOBS_PATH,
+                        files=files,
+                        timeout=(api_client.CONNECT_TIMEOUT, UPLOAD_TIMEOUT),
+                    )
+                    if response.status_code == 202:
+                        st.session_state.job_id = response.json()["job_id"]
+                        _discard_recording()
                         st.session_state.uploaded_file_info = None
                         st.rerun()
                     else:
@@ -205,9 +234,173 @@ def show():
                 except requests.exceptions.RequestException as e:
                     st.error(f"バックエンドへの接続に失敗しました: {e}")
 
+    # --- 処理中のジョブの途中経過の表示 ---
+    if st.session_state.get("job_id"):
+        if st.session_state.get("upload_report"):
+            st.caption(st.session_state.upload_report)
+        stream_job(st.session_state.job_id)
+
     # --- 結果の表示 ---
     if "full_text" in st.session_state:
         st.subheader("📝 要約結果")
         st.text_area("要約", height=200, key="summary")
         st.subheader("📖 校正済み全文")
-        st.text_area("全文", height=400, key="full_text")
\ No newline at end of file
+        st.text_area("全文", height=400, key="full_text")
+
+
+def prepare_upload(file_info):
+    """
+    アップロードされたファイルから音声だけを取り出して 16kHz モノラルの Opus に圧縮します。
+    (送信するデータ, ファイル名) を返し、削減できたサイズを upload_report に記録します。
+    圧縮できない場合や小さくならない場合は元のファイルをそのまま送ります。
+    """
+    original = file_info["data"]
+    with st.spinner("音声を圧縮中…"):
+        try:
+            compressed = compress_audio(original)
+        except ValueError as e:
+            st.warning(f"圧縮できなかったため、元のファイルを送信します: {e}")
+            return original, file_info["name"]
+    if len(compressed) >= len(original):
+        return original, file_info["name"]
+    saved = len(original) - len(compressed)
+    st.session_state.upload_report = (
+        f"送信サイズ: {len(original) / 1024:,.0f} KB → {len(compressed) / 1024:,.0f} KB"
+        f"（{saved / 1024:,.0f} KB, {saved / len(original):.0%} 削減）"
+    )
+    return compressed, FILE_NAME
+
+
+def _discard_recording():
+    """録音済みのデータを破棄します（一時ファイルに書き出していた場合はそれも削除されます）。"""
+    if st.session_state.get("audio_buffer") is not None:
+        st.session_state.audio_buffer.close()
+    st.session_state.audio_buffer = None
+
+
+def show_live(webrtc_ctx, uploader):
+    """
+    ライブモードの録音中は文字起こしを表示し続け、録音が止まったら要約のジョブを登録します。
+    """
+    if webrtc_ctx.state.playing:
+        if uploader.session_id is None:
+            try:
+                uploader.start()
+            except requests.exceptions.RequestException as e:
+                st.error(f"バックエンドへの接続に失敗しました: {e}")
+                return
+        status_line = st.empty()
+        dropped_line = st.empty()
+        text_area = st.empty()
+        transcript = []
+        offset = 0
+        # STOP が押されると再実行されるので、それまで文字起こしを取得し続ける
+        while webrtc_ctx.state.playing:
+            try:
+                info = uploader.transcript(offset)
+            except requests.exceptions.RequestException as e:
+                status_line.warning(f"文字起こしを取得できませんでした: {e}")
+            else:
+                transcript.extend(
+                    f"[{_format_time(seg['start'])}] {seg['text']}" for seg in info["segments"]
+                )
+                offset = info["next_offset"]
+                status_line.caption(
+                    f"録音 {_format_time(info['received_seconds'])} / "
+                    f"文字起こし済み {_format_time(info['transcribed_seconds'])}"
+                )
+                text_area.text("\n".join(transcript))
+            if uploader.error:
+                status_line.warning(f"音声の送信を再試行しています: {uploader.error}")
+            if uploader.dropped_seconds:
+                dropped_line.warning(
+                    f"バックエンドに接続できない間の音声 {_format_time(uploader.dropped_seconds)} 分を"
+                    "送信できずに破棄しました（その部分は文字起こしされません）。"
+                )
+            time.sleep(LIVE_REFRESH_SECONDS)
+        return
+
+    if uploader.session_id is not None:
+        # 録音が止まったら残りを送り、要約のジョブに切り替える
+        try:
+            with st.spinner("残りの音声を送信中…"):
+                job = uploader.finish()
+            st.session_state.job_id = job["job_id"]
+        except requests.exceptions.RequestException as e:
+            st.error(f"バックエンドへの接続に失敗しました: {e}")
+            uploader.discard()
+        del st.session_state.live_uploader
+        st.rerun()
+
+
+def stream_job(job_id):
+    """
+    ジョブの途中経過を受け取りながら表示します。
+    文字起こしはセグメントごと、要約はトークンごとに画面に追加されます。
+    完了したら結果をセッション状態に保存して再描画します。
+    """
+    # キャンセルボタンを押すと再実行され、ここでキャンセルを送る
+    if st.button("処理をキャンセル"):
+        try:
+            api_client.delete(f"{JOBS_PATH}/{job_id}")
+        except requests.exceptions.RequestException as e:
+            st.error(f"バックエンドへの接続に失敗しました: {e}")
+        st.session_state.job_id = None
+        st.warning("処理をキャンセルしました。")
+        return
+
+    progress_bar = st.progress(0.0, text="AIが議事録を作成中…")
+    st.subheader("📝 要約結果")
+    summary_area = st.empty()
+    st.subheader("📖 全文")
+    text_area = st.empty()
+    transcript = []
+    summary = []
+
+    try:
+        # 接続の確立は EVENTS_TIMEOUT[0] 秒、イベントの間隔は EVENTS_TIMEOUT[1] 秒まで待つ
+        with api_client.get(
+            f"{JOBS_PATH}/{job_id}/events", stream=True, timeout=EVENTS_TIMEOUT
+        ) as response:
+            if response.status_code == 404:
+                st.session_state.job_id = None
+                st.error("ジョブが見つかりません。もう一度お試しください。")
+                return
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                event = json.loads(line)
+                kind = event["type"]
+                if kind == "stage":
+                    progress_bar.progress(
+                        event["progress"],
+                        text=STAGE_LABELS.get(event["stage"], event["stage"]),
+                    )
+                elif kind == "segment":
+                    transcript.append(f"[{_format_time(event['start'])}] {event['text']}")
+                    text_area.text("\n".join(transcript))
+                elif kind == "corrected":
+                    text_area.text(event["text"])
+                elif kind == "summary":
+                    summary.append(event["delta"])
+                    summary_area.markdown("".join(summary))
+                elif kind == "done":
+                    st.session_state.full_text = event.get("full_text")
+                    st.session_state.summary = event.get("summary")
+                    st.session_state.job_id = None
+                    st.rerun()
+                elif kind in ("failed", "cancelled"):
+                    st.session_state.job_id = None
+                    if kind == "failed":
+                        st.error(f"エラーが発生しました: {event.get('error')}")
+                    else:
+                        st.warning("処理はキャンセルされました。")
+                    return
+    except requests.exceptions.RequestException as e:
+        st.error(f"バックエンドへの接続に失敗しました: {e}")
+
+
+def _format_time(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,68 @@
+"""
+ページで表示するデータ（DataFrame や Styler）のキャッシュ。
+
+Streamlit はウィジェットを操作するたびにページ全体を再実行するため、そのたびに
+DataFrame やスタイルを作り直すとデータが大きいほど操作が重くなります。
+ここでは st.cache_data / st.cache_resource の引数にコレクションのバージョン（func.data_version）を
+含めて、データが変わっていない間は前回作ったものを使います。
+
+    - バックエンドの API など別のプロセスから書き込まれた場合も、バージョンが変わるので作り直します
+    - このプロセスで書き込んだ場合は、func の書き込み通知で invalidate_on_write() に登録した
+      キャッシュをすぐに破棄します（古いバージョンの分がメモリに残らないように）
+
+    @st.cache_resource(max_entries=4, show_spinner=False)
+    def _styled(path: str, version: str):
+        ...
+
+    page_cache.invalidate_on_write(STOCK_FILE, _styled)
+    styled = _styled(str(STOCK_FILE), page_cache.version(STOCK_FILE))
+"""
+
+import threading
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from region_project.storage import func
+
+# ファイルのパス -> 書き込まれたら破棄するキャッシュ関数
+_registry: dict[Path, list] = {}
+_registry_lock = threading.Lock()
+
+
+def version(file_path: Path) -> str:
+    """コレクションのバージョン（キャッシュ関数の引数に使う文字列）。"""
+    return repr(func.data_version(file_path))
+
+
+def invalidate_on_write(file_path: Path, *cached_functions) -> None:
+    """file_path に書き込まれたら cached_functions のキャッシュを破棄します。"""
+    file_path = Path(file_path).resolve()
+    with _registry_lock:
+        registered = _registry.setdefault(file_path, [])
+        for cached in cached_functions:
+            if cached not in registered:
+                registered.append(cached)
+
+
+def _on_write(file_path: Path) -> None:
+    for cached in _registry.get(Path(file_path).resolve(), []):
+        cached.clear()
+
+
+func.add_write_listener(_on_write)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _collection_frame(path: str, version: str) -> pd.DataFrame:
+    return pd.DataFrame(func.load_data(Path(path)))
+
+
+def collection_frame(file_path: Path) -> pd.DataFrame:
+    """
+    コレクション全体の DataFrame を返します（呼び出しごとにコピーなので書き換えても構いません）。
+    """
+    file_path = Path(file_path).resolve()
+    invalidate_on_write(file_path, _collection_frame)
+    return _collection_frame(str(file_path), version(file_path))
@@ -0,0 +1,95 @@
+"""
+送信前の音声の圧縮と、WebRTC の録音をためるバッファ（セッションごとに1つ）。
+
+Whisper が使うのは 16kHz モノラルの音声だけなので、送信する前に
+音声トラックだけを取り出して 16kHz モノラルの Opus（Ogg）に変換します。
+録音は届いた音声フレームをそのまま溜めずに、その場で同じ形式に変換し、
+小さいうちはメモリ上、SPOOL_MAX_BYTES を超えたら一時ファイルに書き出します。
+録音の長さに関係なくメモリ使用量は一定で、セッション同士の音声が混ざることもありません。
+"""
+
+import threading
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+
+import av
+
+SAMPLE_RATE = 16000  # Whisper の入力は 16kHz モノラル
+BIT_RATE = 24000  # 話し声なら 24kbps の Opus で十分
+FILE_NAME = "audio.ogg"
+# メモリ上に保持する上限（バイト）。24kbps でおよそ20分
+SPOOL_MAX_BYTES = 4 * 1024 * 1024
+
+
+def _open_encoder(file):
+    """file に 16kHz モノラルの Opus（Ogg）を書き出す (コンテナ, ストリーム) を返します。"""
+    container = av.open(file, mode="w", format="ogg")
+    stream = container.add_stream("libopus", rate=SAMPLE_RATE, layout="mono")
+    stream.bit_rate = BIT_RATE
+    return container, stream
+
+
+def compress_audio(data: bytes) -> bytes:
+    """
+    音声・動画ファイルから音声トラックだけを取り出し、16kHz モノラルの Opus（Ogg）に変換します。
+    読み込めないファイルや音声トラックの無いファイルは ValueError。
+    """
+    output = BytesIO()
+    try:
+        with av.open(BytesIO(data), mode="r") as source:
+            if not source.streams.audio:
+                raise ValueError("音声トラックが見つかりません。")
+            container, stream = _open_encoder(output)
+            with container:
+                # 16kHz モノラルへの変換はエンコーダーが行う
+                for frame in source.decode(source.streams.audio[0]):
+                    for packet in stream.encode(frame):
+                        container.mux(packet)
+                for packet in stream.encode(None):
+                    container.mux(packet)
+    except av.FFmpegError as e:
+        raise ValueError(f"音声を変換できませんでした: {e}") from e
+    return output.getvalue()
+
+
+class RecordingBuffer:
+    def __init__(self, spool_max_bytes: int = SPOOL_MAX_BYTES):
+        self._file = SpooledTemporaryFile(max_size=spool_max_bytes)
+        self._container, self._stream = _open_encoder(self._file)
+        self._lock = threading.Lock()
+        self.seconds = 0.0  # 録音した長さ
+        self.size = 0  # 圧縮後のバイト数
+        self.finished = False
+
+    def add_frame(self, frame: av.AudioFrame) -> av.AudioFrame:
+        """WebRTC の audio_frame_callback から呼ばれます（WebRTC のスレッドで実行されます）。"""
+        with self._lock:
+            if self.finished:
+                return frame
+            # 16kHz モノラルへの変換はエンコーダーが行う
+            for packet in self._stream.encode(frame):
+                self._container.mux(packet)
+            self.seconds += frame.samples / frame.sample_rate
+            self.size = self._file.tell()
+        return frame
+
+    def finish(self) -> None:
+        """録音を終了し、エンコーダーに残っている分を書き出します。"""
+        with self._lock:
+            if self.finished:
+                return
+            self.finished = True
+            for packet in self._stream.encode(None):
+                self._container.mux(packet)
+            self._container.close()
+            self.size = self._file.tell()
+
+    def read(self) -> bytes:
+        """圧縮済みの音声（Opus / Ogg）を返します。"""
+        self.finish()
+        self._file.seek(0)
+        return self._file.read()
+
+    def close(self) -> None:
+        self.finish()
+        self._file.close()
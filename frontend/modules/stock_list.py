@@ -1,48 +1,81 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime
+from datetime import date, timedelta
 from pathlib import Path
-from .func import load_data # Assuming load_data is in func.py at the same level
+from . import page_cache, stock_table
+from region_project.storage.func import find_items, load_data
 
 # Define BASE_DIR and file_path
 BASE_DIR = Path(__file__).resolve().parents[2] # Should go up two levels from modules to regional-symb
 file_path = BASE_DIR / "backend/app/db/stock_data.json"
 
+# 1ページに表示する件数（色付けはページごとに行う）
+PAGE_ROWS = 500
+ALL_LOCATIONS = "すべて"
+# 期限の絞り込み -> 今日から数えた消費期限の上限（日）
+EXPIRY_FILTERS = {
+    "すべて": None,
+    "期限切れのみ": -1,
+    f"{stock_table.WARN_DAYS}日以内（期限切れを含む）": stock_table.WARN_DAYS,
+}
+SORT_LABELS = {
+    "消費期限が近い順": "expiry",
+    "消費期限が遠い順": "expiry_desc",
+    "保管場所順": "location",
+    "ID順": "id",
+}
+
+
+# 一覧はデータ（と日付・条件）が変わるまで使い回す
+@st.cache_data(max_entries=8, show_spinner=False)
+def _stock_frame(
+    path: str, version: str, today: date, location: str | None, within: int | None, order: str
+):
+    # 絞り込みは読み込みの段階で行う（sqlite モードではインデックスを使う）
+    equals = {"格納場所": location} if location is not None else {}
+    ranges = {}
+    if within is not None:
+        ranges["消費期限"] = (None, (today + timedelta(days=within)).isoformat())
+    items = find_items(Path(path), equals, ranges)
+    return stock_table.sort_frame(stock_table.build_frame(items, today), order)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _locations(path: str, version: str) -> list[str]:
+    return sorted({item["格納場所"] for item in load_data(Path(path)) if item.get("格納場所")})
+
+
+page_cache.invalidate_on_write(file_path, _stock_frame, _locations)
+
+
 def show():
     st.title("📦 備蓄一覧")
     st.write("災害用備蓄品の在庫を確認できます。")
 
-    raw_data = load_data(file_path)
-    data_for_df = []
-    today = datetime.today().date()
-
-    if raw_data:
-        for item in raw_data:
-            exp_date_str = item.get("消費期限")
-            if exp_date_str:
-                exp_date_obj = datetime.strptime(exp_date_str, "%Y-%m-%d").date()
-                remaining_days = abs((exp_date_obj - today).days)
-            else:
-                # Handle cases where 消費期限 might be missing or null
-                exp_date_obj = None # Or some default date, or skip the item
-                remaining_days = -1 # Or some other indicator
-
-            data_for_df.append(
-                {
-                    "物品名": item.get("品名"),
-                    "数量": item.get("数量"),
-                    "消費期限": exp_date_str,
-                    "残り消費期限（日）": remaining_days,
-                    "保管場所": item.get("格納場所"),
-                }
-            )
-
-    df = pd.DataFrame(data_for_df)
-
-    # 残り消費期限が30日以下の行全体を赤字にするスタイリング
-    def highlight_expired(row):
-        return ["color: red" if row["残り消費期限（日）"] <= 30 else "" for _ in row]
-
-    styled = df.style.apply(highlight_expired, axis=1)
-
-    st.dataframe(styled)
+    version = page_cache.version(file_path)
+    col1, col2, col3 = st.columns(3)
+    location = col1.selectbox(
+        "保管場所", [ALL_LOCATIONS] + _locations(str(file_path), version)
+    )
+    expiry = col2.selectbox("消費期限", list(EXPIRY_FILTERS))
+    order = col3.selectbox("並び順", list(SORT_LABELS))
+
+    df = _stock_frame(
+        str(file_path),
+        version,
+        date.today(),
+        None if location == ALL_LOCATIONS else location,
+        EXPIRY_FILTERS[expiry],
+        SORT_LABELS[order],
+    )
+    if df.empty:
+        st.info("条件に一致する備蓄品はありません。")
+        return
+
+    pages = (len(df) - 1) // PAGE_ROWS + 1
+    page = 1
+    if pages > 1:
+        page = st.number_input("ページ", min_value=1, max_value=pages, value=1)
+    start = (page - 1) * PAGE_ROWS
+    st.caption(f"{len(df)} 件中 {start + 1}〜{min(start + PAGE_ROWS, len(df))} 件目")
+
+    st.dataframe(stock_table.style_frame(df.iloc[start : start + PAGE_ROWS]), hide_index=True)
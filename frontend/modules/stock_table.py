@@ -0,0 +1,79 @@
+"""
+備蓄一覧（stock_list.py）の表を作る処理。
+
+備蓄品が数万件になっても操作のたびに待たされないよう、1件ずつのループは使わずに
+列ごとにまとめて計算します（消費期限は pd.to_datetime で一括変換し、残り日数は配列の引き算）。
+Streamlit に依存しないので、ベンチマーク（benchmarks/stock_bench.py）からも使えます。
+
+    items = func.find_items(STOCK_FILE, {"格納場所": "防災センター 地下1階"})
+    frame = sort_frame(build_frame(items, date.today()), "expiry")
+    st.dataframe(style_frame(frame))
+
+残り日数は符号付きです（期限切れは負の数）。消費期限の無い項目は空欄（<NA>）になります。
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+REMAINING = "残り消費期限（日）"
+# 保存データのフィールド -> 表の列名（この順に並べる）
+COLUMNS = {
+    "id": "ID",
+    "品名": "物品名",
+    "数量": "数量",
+    "消費期限": "消費期限",
+    "残り日数": REMAINING,
+    "格納場所": "保管場所",
+}
+# 残り日数がこれ以下の行を強調する
+WARN_DAYS = 30
+WARNING_STYLE = "color: red"
+EXPIRED_STYLE = "color: red; background-color: #fde2e2"
+# 並び順 -> (並べる列, 昇順か)
+SORT_ORDERS = {
+    "expiry": ([REMAINING], [True]),
+    "expiry_desc": ([REMAINING], [False]),
+    "location": (["保管場所", REMAINING], [True, True]),
+    "id": (["ID"], [True]),
+}
+
+
+def build_frame(items: list[dict], today: date) -> pd.DataFrame:
+    """
+    備蓄品の一覧を表示用の DataFrame にします。
+    id の無い項目や重複した id もあり得るので、id はインデックスにせず ID 列として表示します。
+    """
+    raw = pd.DataFrame.from_records(items, columns=["id", "品名", "数量", "消費期限", "格納場所"])
+    expires = pd.to_datetime(raw["消費期限"], format="%Y-%m-%d", errors="coerce")
+    remaining = (expires - pd.Timestamp(today)).dt.days.astype("Int64")
+    return raw.assign(残り日数=remaining)[list(COLUMNS)].rename(columns=COLUMNS)
+
+
+def sort_frame(frame: pd.DataFrame, order: str = "expiry") -> pd.DataFrame:
+    """
+    order（SORT_ORDERS のキー）の順に並べます。消費期限や ID の無い項目は最後にします。
+    同じ値の項目は ID の順（ID も同じなら元の順）のままにします。
+    """
+    columns, ascending = SORT_ORDERS[order]
+    frame = frame.sort_values("ID", kind="stable", na_position="last")
+    return frame.sort_values(columns, ascending=ascending, kind="stable", na_position="last")
+
+
+def row_styles(frame: pd.DataFrame) -> pd.DataFrame:
+    """期限切れ・期限間近の行に付ける CSS（frame と同じ形）。"""
+    remaining = frame[REMAINING]
+    expired = (remaining < 0).to_numpy(dtype=bool, na_value=False)
+    soon = (remaining <= WARN_DAYS).to_numpy(dtype=bool, na_value=False)
+    styles = np.where(expired, EXPIRED_STYLE, np.where(soon, WARNING_STYLE, ""))
+    return pd.DataFrame(
+        np.repeat(styles[:, np.newaxis], frame.shape[1], axis=1),
+        index=frame.index,
+        columns=frame.columns,
+    )
+
+
+def style_frame(frame: pd.DataFrame):
+    """期限切れ・期限間近の行を赤字にした Styler を返します。"""
+    return frame.style.apply(row_styles, axis=None)
@@ -0,0 +1,11 @@
+"""
+コレクション（回覧板・イベント・備蓄品・議事録・会計）のデータの読み書き。
+
+フロントエンド（Streamlit）とバックエンド（FastAPI）の両方から使うため、どちらにも属さない
+このパッケージにまとめています（rye sync でプロジェクトと一緒にインストールされます）。
+
+    func         : 読み込みのキャッシュ・ロック・保存形式（json / journal / sqlite）の切り替え
+    sqlite_store : sqlite モードの保存先
+    bulk_io      : CSV / JSONL の一括取り込み・書き出しと、項目の検証
+    event_index  : イベントの期間検索用インデックス
+"""
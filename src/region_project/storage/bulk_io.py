@@ -0,0 +1,310 @@
+"""
+町内会データの一括インポート/エクスポート用コマンドラインツール。
+
+CSV / JSONL を1行ずつ読み書きするので、入力ファイルの大きさに関係なくメモリ使用量は一定です。
+取り込みは func.add_items を使い、IDをまとめて付与して1回の書き込みで保存します。
+
+使い方:
+    python -m region_project.storage.bulk_io import stock_data stock.csv
+    python -m region_project.storage.bulk_io import event events.jsonl --strict
+    python -m region_project.storage.bulk_io export kairanban kairanban.csv
+    python -m region_project.storage.bulk_io export finances -            # 標準出力へ JSONL
+    python -m region_project.storage.bulk_io repair-seq stock_data
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from contextlib import nullcontext
+from datetime import date, datetime
+from pathlib import Path
+
+from . import func
+
+BASE_DIR = Path(__file__).resolve().parents[3]  # プロジェクトのルートを指す
+DB_DIR = BASE_DIR / "backend/app/db"
+COLLECTIONS = {
+    "kairanban": "kairanban.json",
+    "event": "event.json",
+    "stock_data": "stock_data.json",
+    "minutes": "minutes.json",
+    "finances": "finances.json",
+}
+
+# コレクションごとの項目定義（フィールド名 -> 型）と必須フィールド
+SCHEMAS = {
+    "kairanban": {
+        "fields": {
+            "title": "str",
+            "date": "datetime",
+            "detail": "str",
+            "editor": "str",
+            "checked": "bool",
+        },
+        "required": ["title", "date", "detail"],
+        "defaults": {"editor": "管理者", "checked": False},
+    },
+    "event": {
+        "fields": {
+            "title": "str",
+            "start": "datetime",
+            "end": "datetime",
+            "details": "str",
+            "added": "date",
+        },
+        "required": ["title", "start", "end"],
+        "defaults": {"details": ""},
+    },
+    "stock_data": {
+        "fields": {
+            "品名": "str",
+            "格納場所": "str",
+            "数量": "int",
+            "単位": "str",
+            "保管日": "date",
+            "消費期限": "date",
+        },
+        "required": ["品名", "数量", "消費期限"],
+        "defaults": {"格納場所": "", "単位": ""},
+    },
+    "minutes": {
+        "fields": {"タイトル": "str", "内容": "str", "作成日": "str"},
+        "required": ["タイトル"],
+        "defaults": {"内容": ""},
+    },
+    "finances": {
+        "fields": {"日付": "date", "種別": "str", "金額": "int", "説明": "str"},
+        "required": ["日付", "種別", "金額"],
+        "defaults": {"説明": ""},
+        "choices": {"種別": ["収入", "支出"]},
+    },
+}
+
+TRUE_VALUES = {"true", "1", "yes", "y", "はい", "済"}
+FALSE_VALUES = {"false", "0", "no", "n", "いいえ", "未", ""}
+
+
+class RowError(ValueError):
+    """入力行の検証エラー。"""
+
+
+def _convert(value, kind: str):
+    """値を型定義に合わせて変換します。変換できない場合は ValueError。"""
+    if kind == "str":
+        return str(value)
+    if kind == "int":
+        if isinstance(value, bool):
+            raise ValueError("整数ではありません")
+        if isinstance(value, int):
+            return value
+        return int(str(value).replace(",", "").strip())
+    if kind == "bool":
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError("真偽値ではありません")
+    if kind == "date":
+        return date.fromisoformat(str(value).strip()[:10]).isoformat()
+    if kind == "datetime":
+        return datetime.fromisoformat(str(value).strip()).isoformat()
+    raise ValueError(f"未知の型です: {kind}")
+
+
+def validate_row(collection: str, row: dict, partial: bool = False) -> dict:
+    """
+    1行分のデータを検証して保存用の項目に変換します。
+    スキーマに無い列はそのまま文字列として残し、id 列は無視します（取り込み時に振り直すため）。
+    partial の場合は一部のフィールドの更新として扱い、必須項目と既定値を補いません。
+    """
+    schema = SCHEMAS[collection]
+    item = {}
+    for key, value in row.items():
+        if key is None or key == "id":
+            continue
+        # CSV の空欄は未入力として扱う
+        if value is None or (isinstance(value, str) and value == ""):
+            continue
+        kind = schema["fields"].get(key)
+        if kind is None:
+            item[key] = value
+            continue
+        try:
+            item[key] = _convert(value, kind)
+        except ValueError as e:
+            raise RowError(f"{key}={value!r}: {e}") from None
+
+    missing = [key for key in schema["required"] if key not in item]
+    if missing and not partial:
+        raise RowError(f"必須項目がありません: {', '.join(missing)}")
+    for key, choices in schema.get("choices", {}).items():
+        if key in item and item[key] not in choices:
+            raise RowError(f"{key} は {' / '.join(choices)} のいずれかです")
+    if not partial:
+        for key, default in schema.get("defaults", {}).items():
+            item.setdefault(key, default)
+    return item
+
+
+def _detect_format(path: str, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    if path != "-" and Path(path).suffix.lower() == ".csv":
+        return "csv"
+    return "jsonl"
+
+
+def _open(path: str, mode: str):
+    if path == "-":
+        # 標準入出力は閉じないようにする
+        return nullcontext(sys.stdin if "r" in mode else sys.stdout)
+    # utf-8-sig: Excel で保存した BOM 付き CSV も読めるようにする
+    encoding = "utf-8-sig" if "r" in mode else "utf-8"
+    return open(path, mode, encoding=encoding, newline="")
+
+
+def read_rows(f, fmt: str):
+    """(行番号, 行データ) を1行ずつ返します。"""
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, RowError(f"JSON として読めません: {e}")
+                continue
+            if not isinstance(row, dict):
+                yield line_no, RowError("オブジェクトではありません")
+                continue
+            yield line_no, row
+
+
+def import_rows(
+    collection: str,
+    file_path: Path,
+    f,
+    fmt: str,
+    strict: bool = False,
+    dry_run: bool = False,
+) -> tuple[int, int]:
+    """
+    入力を検証しながらコレクションに取り込みます。
+    (取り込んだ件数, エラー件数) を返します。strict の場合は最初のエラーで中断し、何も保存しません。
+    """
+    errors = 0
+
+    def valid_items():
+        nonlocal errors
+        for line_no, row in read_rows(f, fmt):
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                yield validate_row(collection, row)
+            except RowError as e:
+                errors += 1
+                print(f"{line_no} 行目: {e}", file=sys.stderr)
+                if strict:
+                    raise
+
+    if dry_run:
+        return sum(1 for _ in valid_items()), errors
+    return func.add_items(file_path, valid_items()), errors
+
+
+def export_rows(file_path: Path, f, fmt: str) -> int:
+    """コレクションを1件ずつ書き出します。書き出した件数を返します。"""
+    data = func.load_data(file_path)
+    if fmt == "csv":
+        # 全項目のキーを出現順にまとめて列にする
+        fieldnames = list(dict.fromkeys(key for item in data for key in item))
+        if "id" in fieldnames:
+            fieldnames.insert(0, fieldnames.pop(fieldnames.index("id")))
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for item in data:
+            writer.writerow(item)
+    else:
+        for item in data:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+    return len(data)
+
+
+def _report(action: str, count: int, elapsed: float) -> None:
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"{count} 件を{action}（{elapsed:.2f} 秒, {rate:,.0f} 件/秒）",
+        file=sys.stderr,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="町内会データの一括インポート/エクスポート"
+    )
+    parser.add_argument(
+        "--data-dir", type=Path, default=DB_DIR, help="データファイルのフォルダ"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="CSV / JSONL を取り込む")
+    p_import.add_argument("collection", choices=COLLECTIONS)
+    p_import.add_argument("path", help="入力ファイル（- で標準入力）")
+    p_import.add_argument("--format", choices=["csv", "jsonl"])
+    p_import.add_argument(
+        "--strict", action="store_true", help="エラーがあれば何も保存せずに中断する"
+    )
+    p_import.add_argument(
+        "--dry-run", action="store_true", help="検証だけ行い保存しない"
+    )
+
+    p_export = sub.add_parser("export", help="CSV / JSONL に書き出す")
+    p_export.add_argument("collection", choices=COLLECTIONS)
+    p_export.add_argument("path", nargs="?", default="-", help="出力ファイル（- で標準出力）")
+    p_export.add_argument("--format", choices=["csv", "jsonl"])
+
+    p_repair = sub.add_parser("repair-seq", help="IDシーケンスを既存データから設定し直す")
+    p_repair.add_argument("collection", choices=COLLECTIONS)
+
+    args = parser.parse_args(argv)
+    file_path = args.data_dir / COLLECTIONS[args.collection]
+
+    if args.command == "repair-seq":
+        next_id = func.repair_sequence(file_path)
+        print(f"{args.collection}: 次のIDを {next_id} に設定しました。", file=sys.stderr)
+        return 0
+
+    fmt = _detect_format(args.path, args.format)
+    started = time.perf_counter()
+    if args.command == "import":
+        with _open(args.path, "r") as f:
+            try:
+                count, errors = import_rows(
+                    args.collection, file_path, f, fmt, args.strict, args.dry_run
+                )
+            except RowError:
+                print("エラーがあったため取り込みを中断しました。", file=sys.stderr)
+                return 1
+        action = "検証しました" if args.dry_run else "取り込みました"
+        _report(action, count, time.perf_counter() - started)
+        if errors:
+            print(f"{errors} 件の行をスキップしました。", file=sys.stderr)
+        return 1 if errors else 0
+
+    with _open(args.path, "w") as f:
+        count = export_rows(file_path, f, fmt)
+    _report("書き出しました", count, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
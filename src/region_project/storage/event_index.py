@@ -0,0 +1,110 @@
+"""
+イベントの期間検索用インデックス。
+
+開始・終了日時をあらかじめパースして開始日時順に並べ、
+終了日時の最大値を持つセグメント木で「指定した期間と重なるイベント」を対数時間で探します。
+インデックスは event.json のバージョン（func.data_version）ごとにキャッシュします。
+"""
+
+import threading
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+from . import func
+
+
+class EventIndex:
+    """イベントの期間（start～end）に対する区間インデックス。"""
+
+    def __init__(self, events: list[dict]):
+        entries = []
+        for ev in events:
+            try:
+                start_dt = datetime.fromisoformat(ev["start"])
+                end_dt = datetime.fromisoformat(ev["end"])
+            except (KeyError, TypeError, ValueError):
+                print(f"Warning: Skipping event with invalid start/end: {ev.get('id')}")
+                continue
+            entries.append((start_dt, end_dt, ev))
+        entries.sort(key=lambda entry: entry[0])
+
+        self._entries = entries
+        self._starts = [start_dt for start_dt, _, _ in entries]
+        # 葉に各イベントの終了日時、内部ノードに子の最大値を持つセグメント木
+        size = 1
+        while size < len(entries):
+            size *= 2
+        self._size = size
+        tree = [datetime.min] * (2 * size)
+        for i, (_, end_dt, _) in enumerate(entries):
+            tree[size + i] = end_dt
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._max_end = tree
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def overlapping(
+        self, range_start: datetime, range_end: datetime
+    ) -> list[tuple[dict, datetime, datetime]]:
+        """
+        [range_start, range_end] と重なるイベントを (イベント, 開始, 終了) のリストで返します。
+        結果は開始日時順です。
+        """
+        # 開始が range_end 以前のイベントだけが候補（先頭から limit 件）
+        limit = bisect_right(self._starts, range_end)
+        if limit == 0:
+            return []
+
+        found = []
+        # (ノード, ノードが表す範囲の左端, 右端) を深さ優先でたどる
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= limit or self._max_end[node] < range_start:
+                continue
+            if hi - lo == 1:
+                found.append(lo)
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return [
+            (self._entries[i][2], self._entries[i][0], self._entries[i][1])
+            for i in found
+        ]
+
+    def between(self, first_day: date, last_day: date) -> list[tuple[dict, datetime, datetime]]:
+        """first_day～last_day（両端を含む）のいずれかの日にかかるイベントを返します。"""
+        return self.overlapping(
+            datetime.combine(first_day, time.min),
+            datetime.combine(last_day + timedelta(days=1), time.min)
+            - timedelta(microseconds=1),
+        )
+
+    def on_date(self, day: date) -> list[tuple[dict, datetime, datetime]]:
+        """day にかかるイベントを返します。"""
+        return self.between(day, day)
+
+
+_indexes: dict[Path, tuple[tuple | None, EventIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(file_path: Path) -> EventIndex:
+    """
+    イベントファイルのインデックスを返します。
+    ファイルが変更されていなければ前回作ったものを使い回します。
+    """
+    file_path = Path(file_path).resolve()
+    version = func.data_version(file_path)
+    cached = _indexes.get(file_path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    index = EventIndex(func.load_data(file_path))
+    with _indexes_lock:
+        _indexes[file_path] = (version, index)
+    return index
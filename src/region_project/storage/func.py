@@ -0,0 +1,799 @@
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from itertools import chain
+from pathlib import Path
+from datetime import datetime
+
+from . import sqlite_store
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# --- 読み込みキャッシュ ---
+# Streamlit は操作のたびにページ全体を再実行するため、毎回 JSON をパースすると重い。
+# パスごとにパース結果を保持し、(mtime, size, inode) と書き込みバージョンが
+# 変わっていなければ stat() だけで結果を返す。
+_cache: dict[Path, tuple[tuple, list[dict]]] = {}
+_cache_lock = threading.Lock()
+# save_data で加算されるプロセス内の書き込みバージョン
+# （mtime の分解能より短い間隔で書き込まれた場合でも確実に無効化するため）
+_write_versions: dict[Path, int] = {}
+
+# --- ストレージモード ---
+# "json"    : 変更のたびにJSONファイル全体を書き直す（従来の動作）
+# "journal" : 変更をJSONLのジャーナルに追記し、一定サイズを超えたらスナップショットへ畳み込む
+# "sqlite"  : コレクションごとに SQLite のテーブルへ保存する（sqlite_store.py を参照）
+STORAGE_MODE = os.getenv("REGION_STORAGE_MODE", "json")
+# sqlite モードのデータベースファイル（未指定の場合は JSON ファイルと同じフォルダ）
+SQLITE_PATH = os.getenv("REGION_SQLITE_PATH")
+# ジャーナルがこのバイト数を超えたらコンパクションする
+JOURNAL_COMPACT_BYTES = int(os.getenv("REGION_JOURNAL_COMPACT_BYTES", 256 * 1024))
+JOURNAL_SUFFIX = ".journal"
+# 次に払い出すIDなどコレクションのメタデータを保存するファイルの拡張子
+META_SUFFIX = ".meta"
+# add_items で sqlite にまとめて挿入する件数
+BULK_BATCH_SIZE = 1000
+
+# ジャーナルを反映した結果のキャッシュ
+# パス -> (スナップショットのキー, ジャーナルのinode, 反映済みのバイト位置, 項目)
+_journal_cache: dict[Path, tuple[tuple | None, int | None, int, list[dict]]] = {}
+# sqlite モードの読み込みキャッシュ  パス -> (コレクションのバージョン, 項目)
+_sqlite_cache: dict[Path, tuple[int | None, list[dict]]] = {}
+# プロセス内での書き込みを直列化するためのパスごとのロック
+_write_locks: dict[Path, threading.RLock] = {}
+# ファイルロックの入れ子の深さ（ロックを保持しているスレッドだけが更新する）
+_lock_depths: dict[Path, int] = {}
+# スレッドごとの実行中トランザクション
+_local = threading.local()
+# 書き込みのたびに呼ばれる関数（ページのキャッシュの破棄などに使う）
+_write_listeners: list[Callable[[Path], None]] = []
+
+
+class _ReadOnlyDict(dict):
+    """
+    キャッシュ上の項目を共有するための読み取り専用の辞書。
+    dict のサブクラスなので pandas や json からはそのまま扱えます。
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(
+            "load_data が返す項目は読み取り専用です。dict(item) でコピーしてから変更してください。"
+        )
+
+    __setitem__ = __delitem__ = _readonly
+    update = pop = popitem = clear = setdefault = _readonly
+    __ior__ = _readonly
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __reduce__(self):
+        # pickle / deepcopy では通常の dict として復元する
+        return (dict, (dict(self),))
+
+
+def _cache_key(file_path: Path) -> tuple | None:
+    """キャッシュの有効性を判定するキー。ファイルが無い場合は None。"""
+    try:
+        st = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino, _write_versions.get(file_path, 0))
+
+
+def journal_path(file_path: Path) -> Path:
+    """スナップショットに対応するジャーナルファイルのパスを返します。"""
+    file_path = Path(file_path)
+    return file_path.with_name(file_path.name + JOURNAL_SUFFIX)
+
+
+def _journal_key(file_path: Path) -> tuple | None:
+    try:
+        st = journal_path(file_path).stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size)
+
+
+def _sqlite_location(file_path: Path) -> tuple[Path, str]:
+    """sqlite モードでのデータベースファイルとコレクション名（ファイル名の stem）。"""
+    db_path = Path(SQLITE_PATH) if SQLITE_PATH else file_path.parent / sqlite_store.DEFAULT_DB_NAME
+    return db_path, file_path.stem
+
+
+def _write_lock(file_path: Path) -> threading.RLock:
+    with _cache_lock:
+        return _write_locks.setdefault(file_path, threading.RLock())
+
+
+def _lock_file(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK は約10秒で諦めるので取れるまで繰り返す
+                continue
+
+
+def _unlock_file(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def _locked(file_path: Path):
+    """
+    コレクションへの書き込みを排他します。
+    プロセス内はスレッドロック、プロセス間は <ファイル名>.lock のファイルロックで守ります。
+    同じスレッドからの入れ子の呼び出しは外側のロックをそのまま使います。
+    """
+    with _write_lock(file_path):
+        if _lock_depths.get(file_path):
+            _lock_depths[file_path] += 1
+            try:
+                yield
+            finally:
+                _lock_depths[file_path] -= 1
+            return
+
+        lock_path = file_path.with_name(file_path.name + ".lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, "a+b") as f:
+            _lock_file(f)
+            _lock_depths[file_path] = 1
+            try:
+                yield
+            finally:
+                _lock_depths.pop(file_path, None)
+                _unlock_file(f)
+
+
+class _Transaction:
+    """transaction() の中で保留している変更。"""
+
+    def __init__(self, data: list[dict]):
+        self.data = data
+        self.records: list[dict] = []  # ジャーナルモードで追記するレコード
+        self.replaced = False  # save_data で内容全体が置き換えられたか
+        self.next_id: int | None = None  # 終了時に保存するIDシーケンス
+
+
+def _current_transaction(file_path: Path) -> _Transaction | None:
+    return getattr(_local, "transactions", {}).get(file_path)
+
+
+@contextmanager
+def transaction(file_path: Path):
+    """
+    複数の add_item / update_item / delete_item を1回の読み込みと1回の書き込みにまとめます。
+    ブロック内ではファイルロックを保持し続け、正常終了時にまとめて保存します。
+    例外が発生した場合は変更を破棄します。
+
+        with func.transaction(STOCK_FILE):
+            for row in rows:
+                func.add_item(STOCK_FILE, row)
+    """
+    file_path = Path(file_path).resolve()
+    if STORAGE_MODE == "sqlite":
+        with sqlite_store.transaction(_sqlite_location(file_path)[0]):
+            yield
+        return
+
+    with _locked(file_path):
+        if _current_transaction(file_path) is not None:
+            # 入れ子のトランザクションは外側に合流する
+            yield
+            return
+
+        txn = _Transaction(load_data(file_path))
+        if not hasattr(_local, "transactions"):
+            _local.transactions = {}
+        _local.transactions[file_path] = txn
+        try:
+            yield
+        finally:
+            del _local.transactions[file_path]
+        if txn.next_id is not None:
+            # 途中で落ちてもIDが再利用されないよう、データより先に保存する
+            _write_meta(file_path, {**_read_meta(file_path), "next_id": txn.next_id})
+        if txn.replaced or (STORAGE_MODE != "journal" and txn.records):
+            _write_snapshot(file_path, txn.data)
+            if STORAGE_MODE == "journal":
+                journal_path(file_path).unlink(missing_ok=True)
+        elif txn.records:
+            _append_journal(file_path, txn.records)
+
+
+def add_write_listener(listener: Callable[[Path], None]) -> None:
+    """
+    このプロセスでコレクションに書き込むたびに listener(ファイルのパス) を呼びます。
+    トランザクション中の変更は、終了して保存したときに1回だけ知らせます。
+    """
+    _write_listeners.append(listener)
+
+
+def _notify_write(file_path: Path) -> None:
+    for listener in list(_write_listeners):
+        listener(file_path)
+
+
+def data_version(file_path: Path) -> tuple | None:
+    """
+    コレクションの現在のバージョンを返します。
+    内容が変わると値も変わるため、派生データのキャッシュキーとして使えます。
+    """
+    file_path = Path(file_path).resolve()
+    if STORAGE_MODE == "journal":
+        return (_cache_key(file_path), _journal_key(file_path))
+    if STORAGE_MODE == "sqlite":
+        return ("sqlite", sqlite_store.version(*_sqlite_location(file_path)))
+    return _cache_key(file_path)
+
+
+def clear_cache(file_path: Path | None = None) -> None:
+    """読み込みキャッシュを破棄します（引数なしの場合はすべて）。"""
+    with _cache_lock:
+        if file_path is None:
+            _cache.clear()
+            _journal_cache.clear()
+            _sqlite_cache.clear()
+        else:
+            _cache.pop(Path(file_path).resolve(), None)
+            _journal_cache.pop(Path(file_path).resolve(), None)
+            _sqlite_cache.pop(Path(file_path).resolve(), None)
+
+
+def load_data(file_path: Path) -> list[dict]:
+    """
+    JSONファイルを読み込みます。
+    ファイルが存在しない/空の場合は空のリストを返します。
+    event.json の {"events": [...]} 形式に対応します。
+
+    結果はキャッシュされ、ファイルが変更されていなければ再パースしません。
+    返されるリストは呼び出しごとに新しいものですが、各項目は読み取り専用です。
+    ジャーナルモードではスナップショットにジャーナルを反映した結果を返します。
+    sqlite モードでは同名のテーブルから読み込みます。
+    """
+    file_path = Path(file_path).resolve()
+    txn = _current_transaction(file_path)
+    if txn is not None:
+        return list(txn.data)
+    if STORAGE_MODE == "journal":
+        return list(_load_journaled(file_path))
+    if STORAGE_MODE == "sqlite":
+        return list(_load_sqlite(file_path))
+    return list(_load_snapshot(file_path))
+
+
+def find_items(
+    file_path: Path,
+    equals: dict | None = None,
+    ranges: dict[str, tuple] | None = None,
+) -> list[dict]:
+    """
+    条件に一致する項目を返します。
+    equals : {"checked": False} のようなフィールドの一致条件
+    ranges : {"消費期限": ("2025-01-01", "2025-12-31")} のような範囲条件（None は制限なし）
+    sqlite モードではインデックスを使って検索し、それ以外では全件を走査します。
+    """
+    file_path = Path(file_path).resolve()
+    if STORAGE_MODE == "sqlite":
+        db_path, name = _sqlite_location(file_path)
+        return sqlite_store.find_items(db_path, name, equals, ranges)
+
+    def match(item: dict) -> bool:
+        for field, value in (equals or {}).items():
+            if item.get(field) != value:
+                return False
+        for field, (low, high) in (ranges or {}).items():
+            value = item.get(field)
+            if value is None:
+                return False
+            if low is not None and value < low:
+                return False
+            if high is not None and value > high:
+                return False
+        return True
+
+    return [item for item in load_data(file_path) if match(item)]
+
+
+def _load_sqlite(file_path: Path) -> list[dict]:
+    """sqlite のテーブルをキャッシュ経由で読み込みます。"""
+    db_path, name = _sqlite_location(file_path)
+    key = sqlite_store.version(db_path, name)
+    cached = _sqlite_cache.get(file_path)
+    if key is not None and cached is not None and cached[0] == key:
+        return cached[1]
+
+    items = [_ReadOnlyDict(item) for item in sqlite_store.load_items(db_path, name)]
+    with _cache_lock:
+        _sqlite_cache[file_path] = (key, items)
+    return items
+
+
+def _load_snapshot(file_path: Path) -> list[dict]:
+    """スナップショット（JSONファイル本体）をキャッシュ経由で読み込みます。"""
+    key = _cache_key(file_path)
+    if key is None:
+        return []
+    cached = _cache.get(file_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    items = [_ReadOnlyDict(item) for item in _parse_file(file_path)]
+    with _cache_lock:
+        _cache[file_path] = (key, items)
+    return items
+
+
+def _load_journaled(file_path: Path) -> list[dict]:
+    """
+    スナップショットにジャーナルを反映した結果を返します。
+    前回から追記された分だけを読み込んで反映します。
+    """
+    snapshot_key = _cache_key(file_path)
+    jkey = _journal_key(file_path)
+    j_ino, j_size = jkey if jkey else (None, 0)
+
+    base, offset = None, 0
+    cached = _journal_cache.get(file_path)
+    if cached is not None and cached[0] == snapshot_key and cached[1] == j_ino:
+        if cached[2] == j_size:
+            return cached[3]
+        if cached[2] < j_size:
+            base, offset = cached[3], cached[2]
+    if base is None:
+        base = _load_snapshot(file_path)
+
+    items = base
+    if j_ino is not None:
+        records, offset = _read_journal(journal_path(file_path), offset)
+        items = _replay(base, records)
+    with _cache_lock:
+        _journal_cache[file_path] = (snapshot_key, j_ino, offset, items)
+    return items
+
+
+def _read_journal(path: Path, offset: int) -> tuple[list[dict], int]:
+    """
+    ジャーナルの offset 以降を読み込みます。
+    書き込み途中の最終行は読み飛ばし、次回に持ち越します。
+    """
+    try:
+        with path.open("rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return [], 0
+    end = chunk.rfind(b"\n") + 1
+    records = []
+    for line in chunk[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            print(f"Warning: Skipping broken journal record in {path}.")
+    return records, offset + end
+
+
+def _replay(items: list[dict], records: list[dict]) -> list[dict]:
+    """
+    ジャーナルのレコードを項目リストに適用した新しいリストを返します。
+    同じレコードを二度適用しても結果が変わらないようにしています
+    （コンパクション途中で中断した場合に備えるため）。
+    """
+    if not records:
+        return items
+    items = list(items)
+    index = {item.get("id"): i for i, item in enumerate(items)}
+    for record in records:
+        op = record.get("op")
+        if op == "add":
+            item = _ReadOnlyDict(record["item"])
+            i = index.get(item.get("id"))
+            if i is None or items[i] is None:
+                index[item.get("id")] = len(items)
+                items.append(item)
+            else:
+                items[i] = item
+        elif op == "update":
+            i = index.get(record.get("id"))
+            if i is not None and items[i] is not None:
+                items[i] = _ReadOnlyDict({**items[i], **record.get("fields", {})})
+        elif op == "delete":
+            i = index.pop(record.get("id"), None)
+            if i is not None:
+                items[i] = None
+    return [item for item in items if item is not None]
+
+
+def _append_journal(file_path: Path, records: list[dict]) -> None:
+    """
+    ジャーナルにレコードを追記し、しきい値を超えていればコンパクションします。
+    """
+    lines = "".join(
+        json.dumps(record, ensure_ascii=False) + "\n" for record in records
+    ).encode("utf-8")
+    path = journal_path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # O_APPEND で1回の write にまとめ、レコードが途中で混ざらないようにする
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, lines)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    _notify_write(file_path)
+    if path.stat().st_size > JOURNAL_COMPACT_BYTES:
+        compact(file_path)
+
+
+def compact(file_path: Path) -> None:
+    """
+    ジャーナルをスナップショットに畳み込み、ジャーナルを削除します。
+    """
+    file_path = Path(file_path).resolve()
+    with _locked(file_path):
+        data = _load_journaled(file_path)
+        _write_snapshot(file_path, data)
+        journal_path(file_path).unlink(missing_ok=True)
+
+
+def _parse_file(file_path: Path) -> list[dict]:
+    """ファイルを読み込んでパースします（キャッシュなし）。"""
+    try:
+        with file_path.open("r", encoding="utf-8") as f:
+            content = f.read()
+            if not content.strip():
+                return []
+            data = json.loads(content)
+
+            # event.json の特殊構造に対応
+            if file_path.name == "event.json" and isinstance(data, dict):
+                return data.get("events", [])
+            # kairanban.json, stock.json などはリストを直接返す
+            elif isinstance(data, list):
+                return data
+            else:
+                print(
+                    f"Warning: Unexpected JSON structure in {file_path}. Returning empty list."
+                )
+                return []
+
+    except (json.JSONDecodeError, FileNotFoundError):
+        print(f"Warning: Could not load or parse {file_path}. Returning empty list.")
+        return []
+
+
+def save_data(file_path: Path, data: list[dict]) -> None:
+    """
+    リストをJSONファイルに保存します。
+    event.json の {"events": [...]} 形式に対応します。
+    ジャーナルモードでは内容全体を置き換えるため、ジャーナルも削除します。
+    """
+    file_path = Path(file_path).resolve()
+    if STORAGE_MODE == "sqlite":
+        sqlite_store.replace_items(*_sqlite_location(file_path), data)
+        _notify_write(file_path)
+        return
+    with _locked(file_path):
+        txn = _current_transaction(file_path)
+        if txn is not None:
+            txn.data = list(data)
+            txn.replaced = True
+            return
+        _write_snapshot(file_path, data)
+        if STORAGE_MODE == "journal":
+            journal_path(file_path).unlink(missing_ok=True)
+
+
+def _write_snapshot(
+    file_path: Path,
+    data: Iterable[dict],
+    before_replace: Callable[[], None] | None = None,
+) -> None:
+    """
+    JSONファイル全体を書き出します。
+    一時ファイルに書いてから置き換えるので、途中で落ちても元のファイルは壊れません。
+    data はイテレータでもよく、1件ずつ書き出すのでリストを作らずに保存できます。
+    """
+
+    def write(f) -> None:
+        # event.json の特殊構造に対応
+        if file_path.name == "event.json":
+            f.write('{\n    "events": ')
+            _dump_items(f, data, depth=1)
+            f.write("\n}")
+        else:
+            _dump_items(f, data, depth=0)
+
+    _atomic_write(file_path, write, before_replace)
+
+    # 書き込みバージョンを進めてキャッシュを無効化する
+    with _cache_lock:
+        _write_versions[file_path] = _write_versions.get(file_path, 0) + 1
+        _cache.pop(file_path, None)
+    _notify_write(file_path)
+
+
+def _dump_items(f, items: Iterable[dict], depth: int) -> None:
+    """json.dump(items, indent=4) と同じ形式で、項目を1件ずつ書き出します。"""
+    pad = "\n" + " " * (4 * (depth + 1))
+    first = True
+    f.write("[")
+    for item in items:
+        text = json.dumps(item, ensure_ascii=False, indent=4)
+        f.write(("" if first else ",") + pad + text.replace("\n", pad))
+        first = False
+    f.write("]" if first else "\n" + " " * (4 * depth) + "]")
+
+
+def _atomic_write(
+    path: Path, write: Callable, before_replace: Callable[[], None] | None = None
+) -> None:
+    """
+    write(f) で一時ファイルに書き出してから path を置き換えます。
+    before_replace は置き換えの直前に呼ばれます。
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        # mkstemp は 0600 で作るので、元のファイルと同じ権限に揃える
+        try:
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_name, 0o644)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        if before_replace is not None:
+            before_replace()
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _atomic_write_json(path: Path, content, **dump_kwargs) -> None:
+    """一時ファイルに JSON を書き出してから path を置き換えます。"""
+    _atomic_write(
+        path, lambda f: json.dump(content, f, ensure_ascii=False, **dump_kwargs)
+    )
+
+
+def get_next_id(data: list[dict]) -> int:
+    """
+    リスト内のデータから次のユニークなIDを生成します。
+    """
+    if not data:
+        return 1
+    # "id" が数値であることを確認し、存在しない場合は 0 として扱う
+    return (
+        max(
+            (int(item.get("id", 0)) for item in data if str(item.get("id", 0)).isdigit()),
+            default=0,
+        )
+        + 1
+    )
+
+
+def meta_path(file_path: Path) -> Path:
+    """コレクションのメタデータ（IDシーケンス）を保存するファイルのパスを返します。"""
+    file_path = Path(file_path)
+    return file_path.with_name(file_path.name + META_SUFFIX)
+
+
+def _read_meta(file_path: Path) -> dict:
+    try:
+        meta = json.loads(meta_path(file_path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        print(f"Warning: Could not parse {meta_path(file_path)}. Ignoring it.")
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def _write_meta(file_path: Path, meta: dict) -> None:
+    _atomic_write_json(meta_path(file_path), meta)
+
+
+def _allocate_ids(file_path: Path, count: int = 1) -> int:
+    """
+    コレクションのIDシーケンスから count 個のIDを払い出し、先頭のIDを返します。
+    払い出したIDは削除後も再利用しません。
+    呼び出し側でコレクションのロックを保持している必要があります。
+    """
+    txn = _current_transaction(file_path)
+    if txn is not None and txn.next_id is not None:
+        first = txn.next_id
+    else:
+        first = _read_meta(file_path).get("next_id")
+        if not isinstance(first, int):
+            # シーケンスが未作成の場合のみ既存データから初期化する
+            first = get_next_id(load_data(file_path))
+    if txn is not None:
+        txn.next_id = first + count
+    else:
+        _write_meta(file_path, {**_read_meta(file_path), "next_id": first + count})
+    return first
+
+
+def repair_sequence(file_path: Path) -> int:
+    """
+    IDシーケンスを既存データの最大ID + 1 に設定し直します。
+    メタデータが失われた・手作業でデータを編集した場合に使います。
+    設定した次のIDを返します。
+    """
+    file_path = Path(file_path).resolve()
+    if STORAGE_MODE == "sqlite":
+        return sqlite_store.repair_sequence(*_sqlite_location(file_path))
+    with _locked(file_path):
+        next_id = get_next_id(load_data(file_path))
+        txn = _current_transaction(file_path)
+        if txn is not None:
+            txn.next_id = next_id
+        else:
+            _write_meta(file_path, {**_read_meta(file_path), "next_id": next_id})
+        return next_id
+
+
+def _commit(file_path: Path, data: list[dict], record: dict) -> None:
+    """
+    1件の変更を保存します。トランザクション中の場合は終了時まで保留します。
+    data は変更後の全件、record はジャーナルに追記するレコードです。
+    """
+    txn = _current_transaction(file_path)
+    if txn is not None:
+        txn.data = data
+        txn.records.append(record)
+    elif STORAGE_MODE == "journal":
+        _append_journal(file_path, [record])
+    else:
+        _write_snapshot(file_path, data)
+
+
+def add_item(file_path: Path, new_item_data: dict) -> None:
+    """
+    新しい項目を追加し、JSONファイルに保存します。
+    自動的にIDを付与します。
+    """
+    file_path = Path(file_path).resolve()
+    if STORAGE_MODE == "sqlite":
+        db_path, name = _sqlite_location(file_path)
+        with sqlite_store.transaction(db_path):
+            new_item_data["id"] = sqlite_store.allocate_ids(db_path, name)
+            sqlite_store.insert_item(db_path, name, new_item_data)
+        _notify_write(file_path)
+        return
+    with _locked(file_path):
+        new_item_data["id"] = _allocate_ids(file_path)
+        data = load_data(file_path)
+        data.append(new_item_data)
+        _commit(file_path, data, {"op": "add", "item": new_item_data})
+
+
+def add_items(file_path: Path, items: Iterable[dict]) -> int:
+    """
+    複数の項目をまとめて追加し、1回の書き込みで保存します。
+    items はイテレータでもよく、1件ずつ読み進めながら書き出します。
+    各項目には自動的にIDを付与します。追加した件数を返します。
+    """
+    file_path = Path(file_path).resolve()
+    if STORAGE_MODE == "sqlite":
+        db_path, name = _sqlite_location(file_path)
+        count = 0
+        with sqlite_store.transaction(db_path):
+            batch = []
+            for item in items:
+                batch.append(item)
+                if len(batch) >= BULK_BATCH_SIZE:
+                    count += sqlite_store.insert_items(db_path, name, batch)
+                    batch = []
+            count += sqlite_store.insert_items(db_path, name, batch)
+        _notify_write(file_path)
+        return count
+
+    with _locked(file_path):
+        txn = _current_transaction(file_path)
+        if txn is not None:
+            count = 0
+            for item in items:
+                item["id"] = _allocate_ids(file_path)
+                txn.data.append(item)
+                txn.records.append({"op": "add", "item": item})
+                count += 1
+            return count
+
+        # 既存の項目に続けて新しい項目を流し込み、スナップショットを1回だけ書き直す
+        existing = load_data(file_path)
+        meta = _read_meta(file_path)
+        next_id = meta.get("next_id")
+        if not isinstance(next_id, int):
+            next_id = get_next_id(existing)
+        first_id = next_id
+
+        def numbered():
+            nonlocal next_id
+            for item in items:
+                item["id"] = next_id
+                next_id += 1
+                yield item
+
+        _write_snapshot(
+            file_path,
+            chain(existing, numbered()),
+            # 途中で落ちてもIDが再利用されないよう、データより先に保存する
+            before_replace=lambda: _write_meta(file_path, {**meta, "next_id": next_id}),
+        )
+        if STORAGE_MODE == "journal":
+            # load_data でジャーナル分も反映済みなので畳み込んだことになる
+            journal_path(file_path).unlink(missing_ok=True)
+        return next_id - first_id
+
+
+def update_item(file_path: Path, item_id: int, **fields) -> bool:
+    """
+    指定したIDの項目を更新し、JSONファイルに保存します。
+    """
+    file_path = Path(file_path).resolve()
+    if STORAGE_MODE == "sqlite":
+        updated = sqlite_store.update_item(*_sqlite_location(file_path), item_id, fields)
+        if updated:
+            _notify_write(file_path)
+        return updated
+    with _locked(file_path):
+        data = load_data(file_path)
+        updated = False
+        for i, item in enumerate(data):
+            # id を比較する際は型を合わせる（JSONからは文字列でくる可能性も考慮）
+            if item.get("id") == item_id:
+                # キャッシュ上の項目は読み取り専用なのでコピーしてから更新する
+                data[i] = {**item, **fields}
+                updated = True
+                break
+        if updated:
+            _commit(file_path, data, {"op": "update", "id": item_id, "fields": fields})
+        return updated
+
+
+def delete_item(file_path: Path, item_id: int) -> bool:
+    """
+    指定したIDの項目を削除し、JSONファイルに保存します。
+    """
+    file_path = Path(file_path).resolve()
+    if STORAGE_MODE == "sqlite":
+        deleted = sqlite_store.delete_item(*_sqlite_location(file_path), item_id)
+        if deleted:
+            _notify_write(file_path)
+        return deleted
+    with _locked(file_path):
+        data = load_data(file_path)
+        original_length = len(data)
+        # id を比較する際は型を合わせる
+        data = [item for item in data if item.get("id") != item_id]
+        if len(data) < original_length:
+            _commit(file_path, data, {"op": "delete", "id": item_id})
+            return True
+        return False
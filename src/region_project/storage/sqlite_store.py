@@ -0,0 +1,383 @@
+"""
+SQLite を使ったコレクションの保存先。
+
+func の load_data / save_data / add_item / update_item / delete_item から
+REGION_STORAGE_MODE=sqlite のときに呼び出されます。
+コレクション（kairanban, event, stock_data, minutes, finances）ごとに1テーブルを作り、
+各項目は JSON 文字列として保存します。検索に使う列には式インデックスを張ります。
+
+既存の JSON ファイルからの移行:
+    python -m region_project.storage.sqlite_store migrate
+"""
+
+import argparse
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[3]  # プロジェクトのルートを指す
+DB_DIR = BASE_DIR / "backend/app/db"
+DEFAULT_DB_NAME = "community.db"
+COLLECTION_FILES = [
+    "kairanban.json",
+    "event.json",
+    "stock_data.json",
+    "minutes.json",
+    "finances.json",
+]
+
+# コレクションごとにインデックスを張るフィールド（日付と確認状態）
+INDEXED_FIELDS = {
+    "kairanban": ["date", "checked"],
+    "event": ["start", "end"],
+    "stock_data": ["消費期限"],
+    "minutes": ["作成日"],
+    "finances": ["日付"],
+}
+
+_local = threading.local()
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """
+    スレッドごとに接続を使い回します（sqlite3 の接続はスレッド間で共有できないため）。
+    """
+    db_path = Path(db_path)
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS _collections (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                next_id INTEGER
+            )
+            """
+        )
+        # next_id 列が無い古いデータベースに列を追加する
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(_collections)")]
+        if "next_id" not in columns:
+            conn.execute("ALTER TABLE _collections ADD COLUMN next_id INTEGER")
+        connections[db_path] = conn
+    return conn
+
+
+def _table(name: str) -> str:
+    # テーブル名はファイル名由来なので、識別子として安全な形に引用する
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _field_expr(field: str) -> str:
+    return "json_extract(data, '$.\"" + field.replace("'", "''").replace('"', "") + "\"')"
+
+
+def ensure_collection(conn: sqlite3.Connection, name: str) -> None:
+    """テーブルとインデックスが無ければ作成します。"""
+    table = _table(name)
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER,
+            data TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {_table(name + '_id')} ON {table}(id)")
+    for field in INDEXED_FIELDS.get(name, []):
+        index = _table(f"{name}_{field}")
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {index} ON {table}({_field_expr(field)})"
+        )
+    conn.execute("INSERT OR IGNORE INTO _collections (name) VALUES (?)", (name,))
+
+
+def _bump_version(conn: sqlite3.Connection, name: str) -> None:
+    conn.execute(
+        "UPDATE _collections SET version = version + 1 WHERE name = ?", (name,)
+    )
+
+
+def _item_id(item: dict):
+    item_id = item.get("id")
+    return item_id if isinstance(item_id, int) else None
+
+
+def allocate_ids(db_path: Path, name: str, count: int = 1) -> int:
+    """
+    IDシーケンスから count 個のIDを払い出し、先頭のIDを返します。
+    払い出したIDは削除後も再利用しません。
+    """
+    conn = connect(db_path)
+    ensure_collection(conn, name)
+    with _transaction(conn):
+        (next_id,) = conn.execute(
+            "SELECT next_id FROM _collections WHERE name = ?", (name,)
+        ).fetchone()
+        if next_id is None:
+            # シーケンスが未作成の場合のみ既存データから初期化する
+            (next_id,) = conn.execute(
+                f"SELECT COALESCE(MAX(id), 0) + 1 FROM {_table(name)}"
+            ).fetchone()
+        conn.execute(
+            "UPDATE _collections SET next_id = ? WHERE name = ?",
+            (next_id + count, name),
+        )
+    return next_id
+
+
+def repair_sequence(db_path: Path, name: str) -> int:
+    """IDシーケンスを既存データの最大ID + 1 に設定し直し、その値を返します。"""
+    conn = connect(db_path)
+    ensure_collection(conn, name)
+    with _transaction(conn):
+        (next_id,) = conn.execute(
+            f"SELECT COALESCE(MAX(id), 0) + 1 FROM {_table(name)}"
+        ).fetchone()
+        conn.execute(
+            "UPDATE _collections SET next_id = ? WHERE name = ?", (next_id, name)
+        )
+    return next_id
+
+
+def version(db_path: Path, name: str) -> int | None:
+    """コレクションの書き込みバージョン。コレクションが無ければ None。"""
+    row = (
+        connect(db_path)
+        .execute("SELECT version FROM _collections WHERE name = ?", (name,))
+        .fetchone()
+    )
+    return row[0] if row else None
+
+
+def load_items(db_path: Path, name: str) -> list[dict]:
+    """コレクションの全項目を登録順に返します。"""
+    conn = connect(db_path)
+    ensure_collection(conn, name)
+    rows = conn.execute(f"SELECT data FROM {_table(name)} ORDER BY seq")
+    return [json.loads(data) for (data,) in rows]
+
+
+def find_items(
+    db_path: Path,
+    name: str,
+    equals: dict | None = None,
+    ranges: dict[str, tuple] | None = None,
+) -> list[dict]:
+    """
+    インデックスを使って項目を検索します。
+    equals  : {"checked": False} のようにフィールドの一致条件
+    ranges  : {"消費期限": ("2025-01-01", "2025-12-31")} のように範囲条件（None は上限/下限なし）
+    """
+    conn = connect(db_path)
+    ensure_collection(conn, name)
+    clauses, params = [], []
+    for field, value in (equals or {}).items():
+        if field == "id":
+            clauses.append("id = ?")
+        else:
+            clauses.append(f"{_field_expr(field)} = ?")
+        params.append(value)
+    for field, (low, high) in (ranges or {}).items():
+        if low is not None:
+            clauses.append(f"{_field_expr(field)} >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append(f"{_field_expr(field)} <= ?")
+            params.append(high)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(
+        f"SELECT data FROM {_table(name)}{where} ORDER BY seq", params
+    )
+    return [json.loads(data) for (data,) in rows]
+
+
+def replace_items(db_path: Path, name: str, data: list[dict]) -> None:
+    """コレクションの内容を data で置き換えます（save_data 相当）。"""
+    conn = connect(db_path)
+    ensure_collection(conn, name)
+    with _transaction(conn):
+        conn.execute(f"DELETE FROM {_table(name)}")
+        conn.executemany(
+            f"INSERT INTO {_table(name)} (id, data) VALUES (?, ?)",
+            (
+                (_item_id(item), json.dumps(item, ensure_ascii=False))
+                for item in data
+            ),
+        )
+        # 取り込んだIDより小さい値をシーケンスが払い出さないようにする
+        conn.execute(
+            f"""
+            UPDATE _collections
+            SET next_id = MAX(
+                COALESCE(next_id, 0),
+                (SELECT COALESCE(MAX(id), 0) + 1 FROM {_table(name)})
+            )
+            WHERE name = ?
+            """,
+            (name,),
+        )
+        _bump_version(conn, name)
+
+
+def insert_item(db_path: Path, name: str, item: dict) -> None:
+    """項目を1件追加します。"""
+    conn = connect(db_path)
+    ensure_collection(conn, name)
+    with _transaction(conn):
+        conn.execute(
+            f"INSERT INTO {_table(name)} (id, data) VALUES (?, ?)",
+            (_item_id(item), json.dumps(item, ensure_ascii=False)),
+        )
+        _bump_version(conn, name)
+
+
+def insert_items(db_path: Path, name: str, items: list[dict]) -> int:
+    """項目をまとめて追加し、IDシーケンスからIDを付与します。追加した件数を返します。"""
+    if not items:
+        return 0
+    conn = connect(db_path)
+    ensure_collection(conn, name)
+    with _transaction(conn):
+        first_id = allocate_ids(db_path, name, len(items))
+        for offset, item in enumerate(items):
+            item["id"] = first_id + offset
+        conn.executemany(
+            f"INSERT INTO {_table(name)} (id, data) VALUES (?, ?)",
+            ((item["id"], json.dumps(item, ensure_ascii=False)) for item in items),
+        )
+        _bump_version(conn, name)
+    return len(items)
+
+
+def update_item(db_path: Path, name: str, item_id: int, fields: dict) -> bool:
+    """指定したIDの項目を更新します。"""
+    conn = connect(db_path)
+    ensure_collection(conn, name)
+    with _transaction(conn):
+        row = conn.execute(
+            f"SELECT seq, data FROM {_table(name)} WHERE id = ?", (item_id,)
+        ).fetchone()
+        if row is None:
+            return False
+        seq, data = row
+        item = {**json.loads(data), **fields}
+        conn.execute(
+            f"UPDATE {_table(name)} SET id = ?, data = ? WHERE seq = ?",
+            (_item_id(item), json.dumps(item, ensure_ascii=False), seq),
+        )
+        _bump_version(conn, name)
+    return True
+
+
+def delete_item(db_path: Path, name: str, item_id: int) -> bool:
+    """指定したIDの項目を削除します。"""
+    conn = connect(db_path)
+    ensure_collection(conn, name)
+    with _transaction(conn):
+        cur = conn.execute(f"DELETE FROM {_table(name)} WHERE id = ?", (item_id,))
+        if cur.rowcount == 0:
+            return False
+        _bump_version(conn, name)
+    return True
+
+
+class _transaction:
+    """
+    BEGIN IMMEDIATE ～ COMMIT/ROLLBACK を行うコンテキストマネージャ。
+    すでにトランザクション中の場合は外側のトランザクションに合流します。
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.outermost = False
+
+    def __enter__(self):
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.outermost = True
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.outermost:
+            if exc_type is None:
+                self.conn.execute("COMMIT")
+            else:
+                self.conn.execute("ROLLBACK")
+        return False
+
+
+def transaction(db_path: Path) -> _transaction:
+    """複数の変更を1つのトランザクションにまとめます。"""
+    return _transaction(connect(db_path))
+
+
+def read_json_collection(file_path: Path) -> list[dict]:
+    """
+    移行元の JSON ファイルを読み込みます。
+    event.json の {"events": [...]} 形式にも対応します。
+    """
+    content = Path(file_path).read_text(encoding="utf-8")
+    if not content.strip():
+        return []
+    data = json.loads(content)
+    if isinstance(data, dict):
+        data = data.get("events", [])
+    if not isinstance(data, list):
+        raise ValueError(f"{file_path} はリスト形式ではありません。")
+    return data
+
+
+def migrate(json_files: list[Path], db_path: Path) -> dict[str, int]:
+    """
+    JSON ファイルを SQLite に取り込みます。
+    既存のテーブルの内容は JSON ファイルの内容で置き換えます。
+    戻り値はコレクション名と取り込んだ件数の辞書です。
+    """
+    counts = {}
+    for file_path in json_files:
+        file_path = Path(file_path)
+        if not file_path.exists():
+            print(f"Warning: {file_path} が見つからないためスキップします。")
+            continue
+        items = read_json_collection(file_path)
+        replace_items(db_path, file_path.stem, items)
+        counts[file_path.stem] = len(items)
+    return counts
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="町内会データの SQLite ストレージ管理")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_migrate = sub.add_parser("migrate", help="JSON ファイルを SQLite に取り込む")
+    p_migrate.add_argument(
+        "files",
+        nargs="*",
+        type=Path,
+        default=[DB_DIR / name for name in COLLECTION_FILES],
+        help="取り込む JSON ファイル（省略時は backend/app/db の全コレクション）",
+    )
+    p_migrate.add_argument(
+        "--db", type=Path, default=None, help="出力先のデータベースファイル"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        files = args.files
+        db_path = args.db or Path(files[0]).parent / DEFAULT_DB_NAME
+        counts = migrate(files, db_path)
+        for name, count in counts.items():
+            print(f"{name}: {count} 件を取り込みました。")
+        print(f"保存先: {db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "frontend"))
+
+from modules import stock_table  # noqa: E402
+
+TODAY = date(2026, 10, 18)
+
+
+def _item(**fields) -> dict:
+    return {"品名": "保存水 2L", "数量": 1, "格納場所": "第二備蓄倉庫", **fields}
+
+
+def _styles(items: list[dict], order: str = "expiry") -> list[str]:
+    frame = stock_table.sort_frame(stock_table.build_frame(items, TODAY), order)
+    styler = stock_table.style_frame(frame)
+    styler._compute()
+    return [styler.ctx[(row, 0)] for row in range(len(frame))]
+
+
+def test_items_without_id_can_be_styled():
+    items = [_item(消費期限="2026-10-10"), _item(消費期限="2027-10-10"), _item()]
+    styles = _styles(items)
+    assert styles[0] == [("color", "red"), ("background-color", "#fde2e2")]
+    assert styles[1] == []
+
+
+def test_duplicate_ids_can_be_styled():
+    items = [_item(id=1, 消費期限="2026-10-30"), _item(id=1, 消費期限="2028-01-01")]
+    for order in stock_table.SORT_ORDERS:
+        assert len(_styles(items, order)) == 2
+
+
+def test_remaining_days_are_signed():
+    items = [_item(id=1, 消費期限="2026-10-10"), _item(id=2, 消費期限="2026-10-30"), _item(id=3)]
+    frame = stock_table.build_frame(items, TODAY)
+    assert frame[stock_table.REMAINING].tolist()[:2] == [-8, 12]
+    assert frame[stock_table.REMAINING].isna().tolist()[2]